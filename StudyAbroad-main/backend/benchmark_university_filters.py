@@ -0,0 +1,111 @@
+"""
+Benchmark University Filters
+Compare the per-university filter with the bitmap/sorted-index query planner
+on synthetic catalogs of growing size
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from services.university_catalog import UniversityCatalog
+from services.university_service_simple import UniversityService
+
+
+COUNTRIES = ['US', 'United States', 'UK', 'United Kingdom', 'CA', 'AU', 'DE', 'Germany', 'IN', 'India',
+             'FR', 'NL', 'SG', 'JP', 'CN', 'NZ', 'IE', 'SE', 'CH', 'IT']
+FIELDS = ['Computer Science', 'Engineering', 'Business Administration', 'Medicine', 'Law', 'Arts',
+          'Data Science', 'Mathematics', 'Physics', 'Economics', 'Psychology', 'Architecture']
+
+QUERIES = {
+    'country': {'country': ['US']},
+    'country+field': {'country': ['UK', 'Germany'], 'field': ['Computer Science']},
+    'type+tuition': {'type': 'Public', 'max_tuition': 15000},
+    'scores': {'min_cgpa': 3.2, 'min_gre': 310, 'min_ielts': 6.5},
+    'selective range': {'max_ranking': 20, 'country': ['US', 'CA']},
+    'everything': {'country': ['US', 'UK', 'AU'], 'field': ['Engineering', 'Data Science'], 'type': 'Private',
+                   'min_tuition': 10000, 'max_tuition': 50000, 'max_ranking': 300, 'min_toefl': 100,
+                   'max_acceptance_rate': 0.5}
+}
+
+
+def synthetic_universities(count: int, rng: np.random.Generator) -> list:
+    """Universities with every filterable field populated"""
+    universities = []
+    for i in range(count):
+        universities.append({
+            'id': i + 1,
+            'name': f"University {i}",
+            'city': f"City {i % 500}",
+            'country': COUNTRIES[int(rng.integers(len(COUNTRIES)))],
+            'fields': [FIELDS[j] for j in rng.choice(len(FIELDS), int(rng.integers(1, 5)), replace=False)],
+            'type': 'Public' if rng.random() < 0.6 else 'Private',
+            'tuition_fee': int(rng.integers(0, 60000)),
+            'ranking': i + 1,
+            'min_cgpa': round(float(rng.uniform(2.5, 3.9)), 1),
+            'min_gre': int(rng.integers(290, 335)),
+            'min_ielts': float(rng.choice([5.5, 6.0, 6.5, 7.0, 7.5])),
+            'min_toefl': int(rng.integers(70, 115)),
+            'acceptance_rate': round(float(rng.random()), 3)
+        })
+    return universities
+
+
+def _time_per_query(run, repeat: int) -> float:
+    """Median seconds per call"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def benchmark(sizes, repeat: int = 5, seed: int = 42) -> None:
+    service = UniversityService()
+    rng = np.random.default_rng(seed)
+    
+    for size in sizes:
+        universities = synthetic_universities(size, rng)
+        started = time.perf_counter()
+        catalogs = {backend: UniversityCatalog(universities, backend) for backend in ['numpy', 'int']}
+        build_seconds = (time.perf_counter() - started) / len(catalogs)
+        bitmap_bytes = {
+            backend: catalog.country_bitmaps.nbytes() + catalog.field_bitmaps.nbytes() + catalog.type_bitmaps.nbytes()
+            for backend, catalog in catalogs.items()
+        }
+        
+        print(f"\n📊 {size} universities (catalog build {build_seconds * 1000:.0f} ms, bitmaps "
+              f"{bitmap_bytes['numpy'] / 1024:.0f} KiB numpy / {bitmap_bytes['int'] / 1024:.0f} KiB int)")
+        print(f"   {'query':<16} {'matches':>8} {'per-row':>11} {'numpy':>10} {'int':>10} {'speedup':>8}  plan")
+        
+        for name, filters in QUERIES.items():
+            expected = [u for u in universities if service._matches_filters(u, filters)]
+            for catalog in catalogs.values():
+                assert catalog.take(catalog.filter_rows(filters)) == expected, name
+            
+            per_row = _time_per_query(lambda: [u for u in universities if service._matches_filters(u, filters)],
+                                      max(1, repeat // 2))
+            indexed = {
+                backend: _time_per_query(lambda: catalog.take(catalog.filter_rows(filters)), repeat)
+                for backend, catalog in catalogs.items()
+            }
+            plan = ' -> '.join(f"{step['access']}({','.join(step['filters']) or 'all'})"
+                               for step in catalogs['numpy'].plan(filters).describe())
+            print(f"   {name:<16} {len(expected):>8} {per_row * 1e6:>9.0f}µs {indexed['numpy'] * 1e6:>8.0f}µs "
+                  f"{indexed['int'] * 1e6:>8.0f}µs {per_row / indexed['numpy']:>7.0f}x  {plan}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark indexed university filtering')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='Catalog sizes to benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per query (median is reported)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for the synthetic catalogs')
+    args = parser.parse_args()
+    
+    print("🧪 BENCHMARKING UNIVERSITY FILTERS")
+    print("=" * 50)
+    benchmark(args.sizes, args.repeat, args.seed)
@@ -0,0 +1,29 @@
+"""
+Shared pytest fixtures
+Small admission models trained on synthetic data, quick enough for tests
+"""
+
+import numpy as np
+import pytest
+
+from ml.admission_predictor import AdmissionPredictor, load_universities_data
+
+
+def train_predictor(n_estimators: int = 10, num_samples: int = 300) -> AdmissionPredictor:
+    """A predictor trained reproducibly on a small forest"""
+    predictor = AdmissionPredictor()
+    predictor.model.set_params(n_estimators=n_estimators)
+    predictor.train(load_universities_data(), num_samples, np.random.default_rng(0))
+    return predictor
+
+
+@pytest.fixture(scope='module')
+def trained_predictor() -> AdmissionPredictor:
+    """One predictor per test module, for tests that do not change the model"""
+    return train_predictor()
+
+
+@pytest.fixture
+def make_predictor():
+    """Train a fresh predictor, for tests that grow it or inspect its counters"""
+    return train_predictor
@@ -0,0 +1,31 @@
+"""
+Gunicorn Configuration
+Preloads the app and ML stack in the master so workers share it copy-on-write
+
+Run with: gunicorn -c gunicorn.conf.py
+"""
+
+import os
+
+wsgi_app = 'app:app'
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('WEB_CONCURRENCY', '4'))
+
+# Import app.py (which builds the ML service) once in the master before forking
+preload_app = True
+
+
+def when_ready(server):
+    """Warm the preloaded ML stack and freeze the heap before workers fork"""
+    from ml.preload import preload_ml_service
+    
+    info = preload_ml_service()
+    server.log.info(f"Preloaded ML stack in {info['seconds']}s: model {info['model_version']}, "
+                    f"catalog {info['catalog_version']} ({info['universities']} universities)")
+
+
+def post_fork(server, worker):
+    """Reset per-process ML state in the new worker"""
+    from ml.preload import after_fork
+    
+    after_fork()
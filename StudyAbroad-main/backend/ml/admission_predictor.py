@@ -3,18 +3,46 @@ Admission Probability Prediction Model
 
 This module implements a machine learning model to predict admission probability
 based on student academic credentials and university requirements.
+
+Only NumPy is imported at module level. scikit-learn is imported when a model
+is trained or a scikit-learn artifact is used, so workers serving with the
+compiled forest never load it.
 """
 
 import numpy as np
-import pandas as pd
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, r2_score
+import copy
 import json
+import numbers
 import os
+import threading
+import time
+import uuid
 from typing import Dict, List, Tuple, Optional
 
+from .forest_inference import CompiledForest, tree_mean
+from .prediction_memo import create_prediction_memo
+
+
+# Marks the scikit-learn model and scaler as not created yet
+_UNSET = object()
+
+
+def _numeric_mask(universities_data: List[Dict], key: str, default: float) -> np.ndarray:
+    """
+    Which universities have a number (or nothing, with a numeric default) in a field
+    """
+    return np.array([isinstance(u.get(key, default), numbers.Real) for u in universities_data], dtype=bool)
+
+
+def _numeric_column(universities_data: List[Dict], key: str, default: float) -> np.ndarray:
+    """
+    Float values of one university field, NaN where the value is not a number
+    """
+    values = np.full(len(universities_data), np.nan)
+    numeric = _numeric_mask(universities_data, key, default)
+    values[numeric] = [universities_data[i].get(key, default) for i in np.flatnonzero(numeric).tolist()]
+    return values
+
 
 class AdmissionPredictor:
     """
@@ -22,18 +50,63 @@ class AdmissionPredictor:
     """
     
     def __init__(self):
-        self.model = RandomForestRegressor(
-            n_estimators=100,
-            random_state=42,
-            max_depth=10,
-            min_samples_split=5
-        )
-        self.scaler = StandardScaler()
+        self._model = _UNSET
+        self._scaler = _UNSET
         self.is_trained = False
         self.feature_names = [
             'cgpa_score', 'gre_score', 'english_score', 'cgpa_diff', 
             'gre_diff', 'english_diff', 'acceptance_rate', 'ranking_score'
         ]
+        # Set when the model comes from (or is saved to) the model store
+        self.model_version = None
+        self.catalog_version = None
+        # 'sklearn' or 'numpy' (CompiledForest, no scikit-learn at predict time)
+        self.inference_backend = os.getenv('ML_INFERENCE_BACKEND', 'sklearn')
+        self.compiled_forest = None
+        # Cores used while fitting (-1 = all); prediction always stays single-threaded
+        self.training_jobs = int(os.getenv('ML_TRAINING_JOBS', '-1'))
+        # Bumped whenever the model changes in-process (train or grow)
+        self.model_revision = 0
+        self.training_history = []
+        self._growth_lock = threading.Lock()
+        # Optional precomputed lookup tensor (see ml/probability_grid.py)
+        self.probability_grid = None
+        self._grid_revision = None
+        # Single predictions by (university id, engineered features), per model revision
+        self.prediction_memo = create_prediction_memo()
+    
+    @property
+    def model(self):
+        """
+        RandomForestRegressor, created on first use
+        """
+        if self._model is _UNSET:
+            from sklearn.ensemble import RandomForestRegressor
+            self._model = RandomForestRegressor(
+                n_estimators=100,
+                random_state=42,
+                max_depth=10,
+                min_samples_split=5
+            )
+        return self._model
+    
+    @model.setter
+    def model(self, model) -> None:
+        self._model = model
+    
+    @property
+    def scaler(self):
+        """
+        StandardScaler for the engineered features, created on first use
+        """
+        if self._scaler is _UNSET:
+            from sklearn.preprocessing import StandardScaler
+            self._scaler = StandardScaler()
+        return self._scaler
+    
+    @scaler.setter
+    def scaler(self, scaler) -> None:
+        self._scaler = scaler
     
     def _engineer_features(self, student_data: Dict, university_data: Dict) -> np.ndarray:
         """
@@ -89,6 +162,88 @@ class AdmissionPredictor:
         
         return features.reshape(1, -1)
     
+    def _engineer_features_batch(self, student_data: Dict, universities_data: List[Dict],
+                                 university_features: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Engineer features for one student against many universities at once
+        
+        Produces the same values as stacking _engineer_features row by row.
+        
+        Args:
+            student_data: Dictionary containing student academic data
+            universities_data: List of university requirement dictionaries
+            university_features: Optional precomputed build_university_features rows
+        
+        Returns:
+            Numpy array of shape (len(universities_data), 8)
+        """
+        # Student side is shared by every row
+        cgpa_score = student_data.get('cgpa', 0) / 4.0
+        gre_score = student_data.get('gre_score', 0) / 340.0
+        
+        ielts_score = student_data.get('ielts_score', 0)
+        toefl_score = student_data.get('toefl_score', 0)
+        
+        if toefl_score > 0:
+            english_score = self._toefl_to_ielts(toefl_score) / 9.0
+        else:
+            english_score = ielts_score / 9.0
+        
+        if university_features is None:
+            university_features = self.build_university_features(universities_data)
+        
+        min_cgpa, min_gre, min_english, acceptance_rate, ranking_score = university_features.T
+        
+        n = len(university_features)
+        features = np.column_stack([
+            np.full(n, cgpa_score), np.full(n, gre_score), np.full(n, english_score),
+            cgpa_score - min_cgpa, gre_score - min_gre, english_score - min_english,
+            acceptance_rate, ranking_score
+        ])
+        
+        if not np.isfinite(features).all():
+            raise ValueError("University data contains missing or non-numeric requirements")
+        
+        return features
+    
+    def build_university_features(self, universities_data: List[Dict]) -> np.ndarray:
+        """
+        University-side inputs of _engineer_features, one row per university
+        
+        These only depend on the catalog, so they can be computed once per
+        catalog load and reused for every student.
+        
+        Returns:
+            Numpy array of shape (len(universities_data), 5) with columns
+            min_cgpa, min_gre, min_english (normalized), acceptance_rate, ranking_score.
+            Rows _engineer_features would fail on (non-numeric requirements,
+            ranking of -1) hold NaN or inf, so callers can set just them aside.
+        """
+        min_cgpa = _numeric_column(universities_data, 'min_cgpa', 0) / 4.0
+        min_gre = _numeric_column(universities_data, 'min_gre', 0) / 340.0
+        min_ielts = _numeric_column(universities_data, 'min_ielts', 0) / 9.0
+        min_toefl = _numeric_column(universities_data, 'min_toefl', 0)
+        min_english = np.where(min_toefl > 0, self._toefl_to_ielts_batch(min_toefl) / 9.0, min_ielts)
+        # A NaN TOEFL requirement falls through to IELTS, one that is not a number cannot be compared
+        min_english[~_numeric_mask(universities_data, 'min_toefl', 0)] = np.nan
+        
+        acceptance_rate = _numeric_column(universities_data, 'acceptance_rate', 0.5)
+        ranking = _numeric_column(universities_data, 'ranking', 100)
+        with np.errstate(divide='ignore'):
+            ranking_score = 1.0 / (ranking + 1)
+        
+        return np.column_stack([min_cgpa, min_gre, min_english, acceptance_rate, ranking_score]).reshape(-1, 5)
+    
+    # TOEFL lower bounds and the IELTS band each one maps to (see _toefl_to_ielts)
+    _TOEFL_THRESHOLDS = np.array([46, 60, 79, 94, 102, 110, 115, 118], dtype=float)
+    _IELTS_BANDS = np.array([5.0, 5.5, 6.0, 6.5, 7.0, 7.5, 8.0, 8.5, 9.0])
+    
+    def _toefl_to_ielts_batch(self, toefl_scores: np.ndarray) -> np.ndarray:
+        """
+        Vectorized version of _toefl_to_ielts
+        """
+        return self._IELTS_BANDS[np.searchsorted(self._TOEFL_THRESHOLDS, toefl_scores, side='right')]
+    
     def _toefl_to_ielts(self, toefl_score: float) -> float:
         """
         Convert TOEFL score to IELTS equivalent
@@ -113,78 +268,114 @@ class AdmissionPredictor:
         else:
             return 5.0
     
-    def generate_synthetic_data(self, universities_data: List[Dict], num_samples: int = 1000) -> Tuple[np.ndarray, np.ndarray]:
+    def generate_synthetic_data(self, universities_data: List[Dict], num_samples: int = 1000,
+                                rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
         """
         Generate synthetic training data based on university requirements
         
         Args:
             universities_data: List of university data dictionaries
             num_samples: Number of synthetic samples to generate
+            rng: Optional seeded generator (defaults to one seeded from np.random)
             
         Returns:
             Tuple of (features, labels) for training
         """
-        features_list = []
-        labels_list = []
+        rng = self._resolve_rng(rng)
+        chunks = list(self.iter_synthetic_data(universities_data, num_samples, rng=rng))
+        if not chunks:
+            return np.empty((0, len(self.feature_names))), np.empty(0)
         
-        for _ in range(num_samples):
-            # Randomly select a university
-            university = np.random.choice(universities_data)
-            
-            # Generate synthetic student data around university requirements
-            min_cgpa = university.get('min_cgpa', 3.0)
-            min_gre = university.get('min_gre', 300)
-            min_ielts = university.get('min_ielts', 6.0)
-            acceptance_rate = university.get('acceptance_rate', 0.5)
-            
-            # Generate student scores with some variation
-            cgpa_variation = np.random.normal(0, 0.3)
-            gre_variation = np.random.normal(0, 20)
-            ielts_variation = np.random.normal(0, 0.5)
-            
-            student_cgpa = max(0, min(4.0, min_cgpa + cgpa_variation))
-            student_gre = max(260, min(340, min_gre + gre_variation))
-            student_ielts = max(0, min(9.0, min_ielts + ielts_variation))
-            
-            student_data = {
-                'cgpa': student_cgpa,
-                'gre_score': student_gre,
-                'ielts_score': student_ielts,
-                'toefl_score': 0
-            }
-            
-            # Engineer features
-            features = self._engineer_features(student_data, university)
-            features_list.append(features.flatten())
-            
-            # Calculate admission probability based on how well student meets requirements
-            cgpa_factor = min(1.0, student_cgpa / min_cgpa) if min_cgpa > 0 else 1.0
-            gre_factor = min(1.0, student_gre / min_gre) if min_gre > 0 else 1.0
-            ielts_factor = min(1.0, student_ielts / min_ielts) if min_ielts > 0 else 1.0
-            
-            # Base probability influenced by acceptance rate and student performance
-            base_prob = acceptance_rate
-            performance_multiplier = (cgpa_factor + gre_factor + ielts_factor) / 3.0
-            
-            # Add some randomness and ensure probability is between 0 and 1
-            admission_prob = min(1.0, max(0.0, base_prob * performance_multiplier + np.random.normal(0, 0.1)))
-            labels_list.append(admission_prob)
+        features, labels = zip(*chunks)
+        return np.concatenate(features), np.concatenate(labels)
+    
+    def iter_synthetic_data(self, universities_data: List[Dict], num_samples: int,
+                            chunk_size: int = 100000, rng: Optional[np.random.Generator] = None):
+        """
+        Stream synthetic training data in chunks of at most chunk_size samples
+        
+        Yields:
+            Tuples of (features, labels) arrays
+        """
+        rng = self._resolve_rng(rng)
+        university_features = self.build_university_features(universities_data)
+        
+        # Requirements the synthetic students are generated around (with their own defaults)
+        requirements = np.array([
+            [u.get('min_cgpa', 3.0), u.get('min_gre', 300), u.get('min_ielts', 6.0), u.get('acceptance_rate', 0.5)]
+            for u in universities_data
+        ], dtype=float).reshape(-1, 4)
+        
+        for start in range(0, num_samples, chunk_size):
+            size = min(chunk_size, num_samples - start)
+            yield self._synthetic_chunk(requirements, university_features, size, rng)
+    
+    def _synthetic_chunk(self, requirements: np.ndarray, university_features: np.ndarray,
+                         size: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        One chunk of synthetic students with features and admission labels
+        """
+        # Randomly select universities
+        index = rng.integers(0, len(requirements), size=size)
+        min_cgpa, min_gre, min_ielts, acceptance_rate = requirements[index].T
+        
+        # Generate student scores with some variation
+        noise = rng.normal(0.0, [0.3, 20.0, 0.5, 0.1], size=(size, 4))
+        student_cgpa = np.clip(min_cgpa + noise[:, 0], 0, 4.0)
+        student_gre = np.clip(min_gre + noise[:, 1], 260, 340)
+        student_ielts = np.clip(min_ielts + noise[:, 2], 0, 9.0)
+        
+        # Same features as _engineer_features for an IELTS-only student
+        cgpa_score = student_cgpa / 4.0
+        gre_score = student_gre / 340.0
+        english_score = student_ielts / 9.0
+        uni_cgpa, uni_gre, uni_english, uni_acceptance, ranking_score = university_features[index].T
+        features = np.column_stack([
+            cgpa_score, gre_score, english_score,
+            cgpa_score - uni_cgpa, gre_score - uni_gre, english_score - uni_english,
+            uni_acceptance, ranking_score
+        ])
+        
+        # Calculate admission probability based on how well student meets requirements
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cgpa_factor = np.where(min_cgpa > 0, np.minimum(1.0, student_cgpa / min_cgpa), 1.0)
+            gre_factor = np.where(min_gre > 0, np.minimum(1.0, student_gre / min_gre), 1.0)
+            ielts_factor = np.where(min_ielts > 0, np.minimum(1.0, student_ielts / min_ielts), 1.0)
+        
+        # Base probability influenced by acceptance rate and student performance
+        performance_multiplier = (cgpa_factor + gre_factor + ielts_factor) / 3.0
+        labels = np.clip(acceptance_rate * performance_multiplier + noise[:, 3], 0.0, 1.0)
         
-        return np.array(features_list), np.array(labels_list)
+        return features, labels
     
-    def train(self, universities_data: List[Dict], num_samples: int = 1000) -> Dict:
+    def _resolve_rng(self, rng: Optional[np.random.Generator]) -> np.random.Generator:
+        """
+        Use the given generator, or one seeded from the legacy global state so
+        np.random.seed() keeps training reproducible
+        """
+        if rng is not None:
+            return rng
+        return np.random.default_rng(np.random.randint(0, 2**31 - 1))
+    
+    def train(self, universities_data: List[Dict], num_samples: int = 1000,
+              rng: Optional[np.random.Generator] = None) -> Dict:
         """
         Train the admission prediction model
         
         Args:
             universities_data: List of university data
             num_samples: Number of synthetic samples to generate
+            rng: Optional seeded generator for the synthetic data
             
         Returns:
             Dictionary with training metrics
         """
+        from sklearn.model_selection import train_test_split
+        
+        started = time.perf_counter()
+        
         # Generate synthetic training data
-        X, y = self.generate_synthetic_data(universities_data, num_samples)
+        X, y = self.generate_synthetic_data(universities_data, num_samples, rng)
         
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
@@ -196,26 +387,133 @@ class AdmissionPredictor:
         X_test_scaled = self.scaler.transform(X_test)
         
         # Train model
-        self.model.fit(X_train_scaled, y_train)
+        self.model.warm_start = False
+        self._fit(self.model, X_train_scaled, y_train)
         
-        # Evaluate model
-        y_pred = self.model.predict(X_test_scaled)
-        mse = mean_squared_error(y_test, y_pred)
-        r2 = r2_score(y_test, y_pred)
+        # Flatten the forest for the NumPy inference backend
+        self.compiled_forest = CompiledForest.from_sklearn(self.model, self.scaler)
         
         self.is_trained = True
+        self.model_revision += 1
+        self.training_history = []
         
-        return {
-            'mse': mse,
-            'r2_score': r2,
-            'training_samples': len(X_train),
-            'test_samples': len(X_test)
+        return self._record_stage(self.model, X_test_scaled, y_test, len(X_train),
+                                  self.model.n_estimators, started)
+    
+    def grow(self, universities_data: Optional[List[Dict]] = None, n_new_trees: int = 20,
+             num_samples: int = 1000, rng: Optional[np.random.Generator] = None,
+             features: Optional[np.ndarray] = None, labels: Optional[np.ndarray] = None,
+             catalog_version: Optional[str] = None) -> Dict:
+        """
+        Add trees fitted on new data to the trained forest (warm start)
+        
+        Existing trees and the feature scaler are kept as they are. The new
+        trees are fitted on a copy of the model, which then replaces the live
+        one, so predictions keep working while the forest grows.
+        
+        Args:
+            universities_data: Catalog to generate synthetic samples from
+            n_new_trees: Number of trees to add
+            num_samples: Number of synthetic samples to generate
+            rng: Optional seeded generator for the synthetic data
+            features: Engineered feature rows of real outcomes (instead of synthetic data)
+            labels: Observed admission outcomes for those rows
+            catalog_version: Version of the catalog the new trees were trained from
+        
+        Returns:
+            Dictionary with the metrics of this training stage
+        """
+        if not self.is_trained or self.model is None:
+            raise ValueError("Model must be trained (with scikit-learn loaded) before it can grow")
+        
+        from sklearn.model_selection import train_test_split
+        
+        with self._growth_lock:
+            started = time.perf_counter()
+            
+            if features is None:
+                features, labels = self.generate_synthetic_data(universities_data, num_samples, rng)
+            X_train, X_test, y_train, y_test = train_test_split(
+                np.asarray(features, dtype=float), np.asarray(labels, dtype=float),
+                test_size=0.2, random_state=42
+            )
+            X_train_scaled = self.scaler.transform(X_train)
+            X_test_scaled = self.scaler.transform(X_test)
+            
+            model = copy.deepcopy(self.model)
+            model.warm_start = True
+            model.n_estimators = len(model.estimators_) + n_new_trees
+            self._fit(model, X_train_scaled, y_train)
+            compiled_forest = CompiledForest.from_sklearn(model, self.scaler)
+            
+            # Swap in the grown forest
+            self.model = model
+            self.compiled_forest = compiled_forest
+            self.model_revision += 1
+            # A grown forest is a different model (invalidates cached recommendations)
+            self.model_version = f"{self.model_version or 'unversioned'}+{uuid.uuid4().hex[:8]}"
+            if catalog_version is not None:
+                self.catalog_version = catalog_version
+            
+            return self._record_stage(model, X_test_scaled, y_test, len(X_train), n_new_trees, started)
+    
+    def grow_in_background(self, universities_data: List[Dict], **kwargs) -> threading.Thread:
+        """
+        Run grow() on a daemon thread so request workers are not blocked
+        """
+        def run():
+            try:
+                metrics = self.grow(universities_data, **kwargs)
+                print(f"Admission model grown to {metrics['total_trees']} trees. "
+                      f"R² Score: {metrics['r2_score']:.3f}")
+            except Exception as e:
+                print(f"Admission model growth failed: {str(e)}")
+        
+        thread = threading.Thread(target=run, name='admission-model-growth', daemon=True)
+        thread.start()
+        return thread
+    
+    def _fit(self, model, X: np.ndarray, y: np.ndarray) -> None:
+        """
+        Fit on all configured cores, then return the forest to single-threaded use
+        
+        Threaded prediction would sum tree outputs in completion order, which
+        is not reproducible (and would no longer match the compiled forest).
+        """
+        model.n_jobs = self.training_jobs
+        try:
+            model.fit(X, y)
+        finally:
+            model.n_jobs = None
+    
+    def _record_stage(self, model, X_test_scaled: np.ndarray, y_test: np.ndarray,
+                      training_samples: int, trees_added: int, started: float) -> Dict:
+        """
+        Evaluate the forest after a training stage and append it to training_history
+        """
+        from sklearn.metrics import mean_squared_error, r2_score
+        
+        y_pred = model.predict(X_test_scaled)
+        metrics = {
+            'stage': len(self.training_history),
+            'mse': mean_squared_error(y_test, y_pred),
+            'r2_score': r2_score(y_test, y_pred),
+            'training_samples': training_samples,
+            'test_samples': len(y_test),
+            'trees_added': trees_added,
+            'total_trees': len(model.estimators_),
+            'training_seconds': round(time.perf_counter() - started, 3)
         }
+        self.training_history.append(metrics)
+        return metrics
     
     def predict(self, student_data: Dict, university_data: Dict) -> Dict:
         """
         Predict admission probability for a student-university pair
         
+        Results are memoized per model revision; the key holds the engineered
+        features, which capture every student and university input used.
+        
         Args:
             student_data: Dictionary containing student academic data
             university_data: Dictionary containing university data
@@ -226,35 +524,280 @@ class AdmissionPredictor:
         if not self.is_trained:
             raise ValueError("Model must be trained before making predictions")
         
+        # Read before the model, so a concurrent grow() cannot file an old result under a new revision
+        revision = self.model_revision
+        
         # Engineer features
         features = self._engineer_features(student_data, university_data)
-        features_scaled = self.scaler.transform(features)
         
-        # Make prediction
-        probability = self.model.predict(features_scaled)[0]
-        probability = max(0.0, min(1.0, probability))  # Ensure valid probability
+        memo_key = (university_data.get('id'), tuple(features.ravel().tolist()))
+        prediction = self.prediction_memo.get(memo_key, revision)
+        if prediction is not None:
+            return prediction
         
-        # Calculate confidence based on feature importance and variance
-        feature_importance = self.model.feature_importances_
-        confidence = self._calculate_confidence(features.flatten(), feature_importance)
+        # Make prediction (the tree spread comes out of the same pass)
+        probabilities, spread = self._predict_with_spread(features)
+        probability = max(0.0, min(1.0, probabilities[0]))  # Ensure valid probability
         
-        return {
+        # Confidence reflects how much the individual trees agree
+        confidence = self._calculate_confidence(spread[0])
+        
+        prediction = {
             'admission_probability': round(probability, 3),
             'confidence': round(confidence, 3),
+            'uncertainty': round(float(spread[0]), 3),
             'probability_category': self._categorize_probability(probability)
         }
+        self.prediction_memo.set(memo_key, revision, prediction)
+        return prediction
     
-    def _calculate_confidence(self, features: np.ndarray, importance: np.ndarray) -> float:
+    def predict_batch(self, student_data: Dict, universities_data: List[Dict],
+                      university_features: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
         """
-        Calculate prediction confidence based on feature quality
+        Predict admission probability for one student against many universities
+        
+        Uses a single scaler and model call for the whole batch. Row i matches
+        predict(student_data, universities_data[i]).
+        
+        Args:
+            student_data: Dictionary containing student academic data
+            universities_data: List of university data dictionaries
+            university_features: Optional precomputed build_university_features rows
+        
+        Returns:
+            Dictionary of arrays keyed like the predict() result
         """
-        # Simple confidence calculation based on feature completeness
-        non_zero_features = np.count_nonzero(features)
-        feature_completeness = non_zero_features / len(features)
+        if not self.is_trained:
+            raise ValueError("Model must be trained before making predictions")
         
-        # Base confidence on feature completeness and importance
-        confidence = feature_completeness * 0.8 + 0.2
-        return min(1.0, confidence)
+        if not universities_data:
+            return {
+                'admission_probability': np.empty(0),
+                'confidence': np.empty(0),
+                'uncertainty': np.empty(0),
+                'probability_category': np.empty(0, dtype=object)
+            }
+        
+        if university_features is None:
+            university_features = self.build_university_features(universities_data)
+        features = self._engineer_features_batch(student_data, universities_data, university_features)
+        
+        probabilities, spread = self._predict_probabilities(features, university_features)
+        
+        return {
+            'admission_probability': np.round(probabilities, 3),
+            'confidence': np.round(self._calculate_confidence_batch(spread), 3),
+            'uncertainty': np.round(spread, 3),
+            'probability_category': self._categorize_probability_batch(probabilities)
+        }
+    
+    def predict_batch_profiles(self, students: List[Dict], universities_data: List[Dict],
+                               university_features: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Predict admission probability for many students against the same universities
+        
+        All student × university rows go through a single scaler and model call.
+        Row i matches predict_batch(students[i], universities_data).
+        
+        Args:
+            students: List of student academic data dictionaries
+            universities_data: List of university data dictionaries
+            university_features: Optional precomputed build_university_features rows
+        
+        Returns:
+            Dictionary of arrays of shape (len(students), len(universities_data))
+        """
+        result = self.predict_many(students, universities_data, cross_product=True,
+                                   university_features=university_features)
+        probabilities = result['admission_probability']
+        
+        return {
+            'admission_probability': np.round(probabilities, 3),
+            'confidence': np.round(result['confidence'], 3),
+            'uncertainty': np.round(result['uncertainty'], 3),
+            'probability_category': self.PROBABILITY_CATEGORIES[result['category_code']]
+        }
+    
+    # Labels of the category codes returned by predict_many
+    PROBABILITY_CATEGORIES = np.array(["Very Low", "Low", "Moderate", "High", "Very High"], dtype=object)
+    
+    def predict_many(self, students: List[Dict], universities_data: List[Dict],
+                     cross_product: bool = False,
+                     university_features: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Predict admission probabilities for many student-university pairs
+        
+        Features for every pair are built at once and go through a single
+        scaler and model call.
+        
+        Args:
+            students: List of student academic data dictionaries
+            universities_data: List of university data dictionaries
+            cross_product: Pair every student with every university instead of
+                students[i] with universities_data[i]
+            university_features: Optional precomputed build_university_features rows
+        
+        Returns:
+            Dictionary with unrounded 'admission_probability', 'confidence' and
+            'uncertainty' (standard deviation of the tree predictions) arrays and
+            'category_code' (index into PROBABILITY_CATEGORIES), of shape
+            (len(students), len(universities_data)) for a cross product and
+            (len(students),) otherwise
+        """
+        if not self.is_trained:
+            raise ValueError("Model must be trained before making predictions")
+        
+        if not cross_product and len(students) != len(universities_data):
+            raise ValueError("students and universities_data must have the same length")
+        
+        if university_features is None:
+            university_features = self.build_university_features(universities_data)
+        student_scores = self._student_scores(students)
+        
+        if cross_product:
+            shape = (len(students), len(universities_data))
+            student_scores = np.repeat(student_scores, len(universities_data), axis=0)
+            pair_features = np.tile(university_features, (len(students), 1))
+        else:
+            shape = (len(students),)
+            pair_features = university_features
+        
+        min_cgpa, min_gre, min_english, acceptance_rate, ranking_score = pair_features.T
+        cgpa_score, gre_score, english_score = student_scores.T
+        features = np.column_stack([
+            cgpa_score, gre_score, english_score,
+            cgpa_score - min_cgpa, gre_score - min_gre, english_score - min_english,
+            acceptance_rate, ranking_score
+        ]).reshape(-1, 8)
+        
+        if not np.isfinite(features).all():
+            raise ValueError("University data contains missing or non-numeric requirements")
+        
+        probabilities, spread = self._predict_probabilities(features, university_features)
+        
+        return {
+            'admission_probability': probabilities.reshape(shape),
+            'confidence': self._calculate_confidence_batch(spread).reshape(shape),
+            'uncertainty': spread.reshape(shape),
+            'category_code': self._category_codes(probabilities).reshape(shape)
+        }
+    
+    def _student_scores(self, students: List[Dict]) -> np.ndarray:
+        """
+        Normalized cgpa, gre and english scores of each student (as in _engineer_features)
+        
+        Returns:
+            Numpy array of shape (len(students), 3)
+        """
+        cgpa = np.array([s.get('cgpa', 0) for s in students], dtype=float)
+        gre = np.array([s.get('gre_score', 0) for s in students], dtype=float)
+        ielts = np.array([s.get('ielts_score', 0) for s in students], dtype=float)
+        toefl = np.array([s.get('toefl_score', 0) for s in students], dtype=float)
+        english = np.where(toefl > 0, self._toefl_to_ielts_batch(toefl) / 9.0, ielts / 9.0)
+        
+        return np.column_stack([cgpa / 4.0, gre / 340.0, english]).reshape(-1, 3)
+    
+    def use_probability_grid(self, grid) -> None:
+        """
+        Serve batch predictions from a ProbabilityGrid built for the current model
+        
+        The grid is ignored once the model is retrained or grown.
+        """
+        self.probability_grid = grid
+        self._grid_revision = self.model_revision
+    
+    def _active_grid(self):
+        grid = self.probability_grid
+        if (grid is None or self._grid_revision != self.model_revision or
+                grid.model_version != self.model_version):
+            return None
+        return grid
+    
+    def _predict_probabilities(self, features: np.ndarray,
+                               university_features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Clipped probabilities and tree spread for student-major rows of features
+        
+        Rows covered by the probability grid are interpolated from it; the
+        rest (or everything, without a grid) go through the model.
+        """
+        if not len(features):
+            return np.empty(0), np.empty(0)
+        
+        grid = self._active_grid()
+        rows = grid.rows_for(university_features) if grid is not None else None
+        if rows is None:
+            probabilities, spread = self._predict_with_spread(features)
+            return np.clip(probabilities, 0.0, 1.0), spread
+        
+        rows = np.tile(rows, len(features) // len(rows))
+        scores = features[:, :3] * [4.0, 340.0, 9.0]
+        covered = grid.covers(scores)
+        
+        probabilities = np.empty(len(features))
+        spread = np.empty(len(features))
+        probabilities[covered], spread[covered] = grid.lookup(scores[covered], rows[covered])
+        if not covered.all():
+            probabilities[~covered], spread[~covered] = self._predict_with_spread(features[~covered])
+        return np.clip(probabilities, 0.0, 1.0), spread
+    
+    def _predict_raw(self, features: np.ndarray) -> np.ndarray:
+        """
+        Scale engineered features and run the forest with the configured backend
+        """
+        if self.inference_backend == 'numpy' and self.compiled_forest is not None:
+            return self.compiled_forest.predict(features)
+        return self.model.predict(self.scaler.transform(features))
+    
+    def _predict_with_spread(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Forest prediction plus the standard deviation of the individual tree
+        predictions, from a single pass over the trees
+        
+        The mean is accumulated in scikit-learn's order, so it equals _predict_raw.
+        """
+        if self.inference_backend == 'numpy' and self.compiled_forest is not None:
+            return self.compiled_forest.predict_with_spread(features)
+        
+        # RandomForestRegressor.predict runs each tree on float32 inputs too
+        X = self.scaler.transform(features).astype(np.float32)
+        tree_values = np.stack([tree.predict(X, check_input=False) for tree in self.model.estimators_])
+        return tree_mean(tree_values), tree_values.std(axis=0)
+    
+    def _feature_importances(self) -> np.ndarray:
+        """
+        Feature importances from whichever form of the forest is loaded
+        """
+        if self.compiled_forest is not None:
+            return self.compiled_forest.feature_importances
+        return self.model.feature_importances_
+    
+    def _calculate_confidence_batch(self, spread: np.ndarray) -> np.ndarray:
+        """
+        Vectorized version of _calculate_confidence
+        """
+        return np.clip(1.0 - 2.0 * spread, 0.0, 1.0)
+    
+    def _categorize_probability_batch(self, probabilities: np.ndarray) -> np.ndarray:
+        """
+        Vectorized version of _categorize_probability
+        """
+        return self.PROBABILITY_CATEGORIES[self._category_codes(probabilities)]
+    
+    def _category_codes(self, probabilities: np.ndarray) -> np.ndarray:
+        """
+        Index of each probability's category in PROBABILITY_CATEGORIES
+        """
+        return np.searchsorted([0.2, 0.4, 0.6, 0.8], probabilities, side='right').astype(np.int8)
+    
+    def _calculate_confidence(self, spread: float) -> float:
+        """
+        Calculate prediction confidence from the spread of the tree predictions
+        
+        Trees predict probabilities in [0, 1], so their standard deviation is
+        at most 0.5: full agreement gives 1.0, an even split gives 0.0.
+        """
+        return float(min(1.0, max(0.0, 1.0 - 2.0 * spread)))
     
     def _categorize_probability(self, probability: float) -> str:
         """
@@ -280,7 +823,7 @@ class AdmissionPredictor:
         
         importance_dict = {}
         for i, feature_name in enumerate(self.feature_names):
-            importance_dict[feature_name] = round(self.model.feature_importances_[i], 3)
+            importance_dict[feature_name] = round(self._feature_importances()[i], 3)
         
         return importance_dict
 
@@ -311,18 +854,35 @@ _predictor_instance = None
 def get_predictor() -> AdmissionPredictor:
     """
     Get or create the global predictor instance
+    
+    Loads the persisted model artifact when one exists (see ml/model_store.py
+    and train_admission_model.py); otherwise trains a model in-process.
     """
     global _predictor_instance
     if _predictor_instance is None:
+        from .model_store import load_predictor, compute_catalog_version, get_model_path
+        
+        predictor = load_predictor()
+        if predictor is not None:
+            print(f"Loaded admission model {predictor.model_version} from {get_model_path()}")
+            current_catalog = compute_catalog_version()
+            if current_catalog and predictor.catalog_version != current_catalog:
+                print("Warning: admission model was trained on a different universities.json. "
+                      "Run train_admission_model.py to refresh it.")
+            _predictor_instance = predictor
+            return _predictor_instance
+        
         _predictor_instance = AdmissionPredictor()
         
-        # Load universities data and train the model
+        # No artifact: load universities data and train the model
         universities_data = load_universities_data()
         if universities_data:
-            print("Training admission prediction model...")
+            print("Training admission prediction model (no saved model found, "
+                  "run train_admission_model.py to create one)...")
             metrics = _predictor_instance.train(universities_data)
+            _predictor_instance.catalog_version = compute_catalog_version()
             print(f"Model trained successfully. R² Score: {metrics['r2_score']:.3f}")
         else:
             print("Warning: No universities data found. Model not trained.")
     
-    return _predictor_instance
\ No newline at end of file
+    return _predictor_instance
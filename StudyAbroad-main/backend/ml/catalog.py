@@ -0,0 +1,238 @@
+"""
+University Catalog Snapshots
+
+This module keeps the universities catalog and everything derived from it in
+an immutable snapshot. A CatalogStore watches data/universities.json and
+rebuilds the snapshot in the background when the file changes, then swaps it
+in with a single reference assignment. Request handlers take one snapshot at
+the start and use it throughout, so they always see a consistent catalog.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from .university_columns import UniversityColumns
+
+
+def get_catalog_path() -> str:
+    """
+    Default location of the universities catalog
+    """
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(current_dir, '..', 'data', 'universities.json')
+
+
+def compute_content_version(content: bytes) -> str:
+    """
+    Short content hash used as the catalog version
+    """
+    return hashlib.sha256(content).hexdigest()[:12]
+
+
+class CatalogSnapshot:
+    """
+    Immutable universities catalog with its derived indexes
+    """
+    
+    def __init__(self, universities: List[Dict], version: Optional[str] = None,
+                 columns: Optional[UniversityColumns] = None):
+        self.universities = universities
+        self.version = version
+        self.loaded_at = time.time()
+        
+        # id -> university record and id -> row position (first record wins for duplicate ids)
+        self.index = {}
+        self.positions = {}
+        for position, university in enumerate(universities):
+            university_id = university.get('id')
+            if university_id not in self.positions:
+                self.index[university_id] = university
+                self.positions[university_id] = position
+        
+        # Student-independent scoring inputs, one row per university
+        # (see RecommendationEngine.build_university_columns)
+        self.columns = columns
+    
+    def __len__(self) -> int:
+        return len(self.universities)
+    
+    def get(self, university_id) -> Optional[Dict]:
+        """
+        Look up a university by id in O(1)
+        """
+        try:
+            return self.index.get(university_id)
+        except TypeError:  # Unhashable id from a malformed request
+            return None
+    
+    def rows_for(self, universities: List[Dict]) -> Optional[np.ndarray]:
+        """
+        Row positions of records taken from this snapshot, or None if any
+        record is not one of this snapshot's objects
+        """
+        rows = np.empty(len(universities), dtype=np.int64)
+        for i, university in enumerate(universities):
+            position = self.positions.get(university.get('id'))
+            if position is None or self.universities[position] is not university:
+                return None
+            rows[i] = position
+        return rows
+    
+    def columns_for(self, universities: List[Dict]) -> Optional[UniversityColumns]:
+        """
+        Precomputed university columns for a subset of this snapshot
+        """
+        if self.columns is None:
+            return None
+        if universities is self.universities:
+            return self.columns
+        rows = self.rows_for(universities)
+        return None if rows is None else self.columns.take(rows)
+    
+    def info(self) -> Dict:
+        return {
+            'version': self.version,
+            'university_count': len(self.universities),
+            'columns_bytes': self.columns.nbytes() if self.columns is not None else 0,
+            'loaded_at': self.loaded_at
+        }
+
+
+def build_catalog_snapshot(universities: List[Dict], version: Optional[str] = None) -> CatalogSnapshot:
+    """
+    Build a snapshot and all derived structures for a list of universities
+    """
+    from .recommendation_engine import get_recommendation_engine
+    
+    try:
+        columns = get_recommendation_engine().build_university_columns(universities)
+    except Exception as e:
+        print(f"Unable to precompute university columns: {str(e)}")
+        columns = None
+    
+    return CatalogSnapshot(universities, version, columns)
+
+
+class CatalogStore:
+    """
+    Holds the current catalog snapshot and replaces it when the file changes
+    
+    The file is polled from a background thread every poll_interval seconds
+    (CATALOG_POLL_INTERVAL, 0 disables polling); reload() forces a rebuild.
+    """
+    
+    def __init__(self, file_path: Optional[str] = None, poll_interval: Optional[float] = None):
+        self.file_path = file_path or get_catalog_path()
+        if poll_interval is None:
+            poll_interval = float(os.getenv('CATALOG_POLL_INTERVAL', '30'))
+        self.poll_interval = poll_interval
+        
+        self._rebuild_lock = threading.Lock()
+        self._poller_lock = threading.Lock()
+        self._listeners = []
+        self._poller_pid = None
+        self._mtime = None
+        self._snapshot = self._load()
+    
+    def current(self) -> CatalogSnapshot:
+        """
+        The snapshot to use for one request
+        """
+        self._ensure_poller()
+        return self._snapshot
+    
+    def add_listener(self, callback: Callable[[CatalogSnapshot, CatalogSnapshot], None]) -> None:
+        """
+        Register callback(old_snapshot, new_snapshot), called after each swap
+        """
+        self._listeners.append(callback)
+    
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Rebuild the snapshot if the file changed (or always when forced)
+        
+        Returns:
+            True if a new snapshot was swapped in
+        """
+        with self._rebuild_lock:
+            current = self._snapshot
+            try:
+                mtime = os.stat(self.file_path).st_mtime
+            except OSError:
+                return False
+            
+            if not force and mtime == self._mtime:
+                return False
+            
+            new_snapshot = self._load(previous=current)
+            if new_snapshot is current:
+                return False
+            
+            # A single reference assignment; readers see either snapshot, never a mix
+            self._snapshot = new_snapshot
+        
+        print(f"Universities catalog reloaded: version {new_snapshot.version} "
+              f"({len(new_snapshot)} universities)")
+        for callback in self._listeners:
+            try:
+                callback(current, new_snapshot)
+            except Exception as e:
+                print(f"Catalog listener failed: {str(e)}")
+        return True
+    
+    def reload(self) -> Dict:
+        """
+        Force a rebuild (admin endpoint) and report the resulting version
+        """
+        swapped = self.refresh(force=True)
+        info = self._snapshot.info()
+        info['reloaded'] = swapped
+        return info
+    
+    def _load(self, previous: Optional[CatalogSnapshot] = None) -> CatalogSnapshot:
+        """
+        Read and parse the file; keeps previous when unreadable or unchanged
+        """
+        try:
+            mtime = os.stat(self.file_path).st_mtime
+            with open(self.file_path, 'rb') as f:
+                content = f.read()
+            version = compute_content_version(content)
+            if previous is not None and version == previous.version:
+                self._mtime = mtime
+                return previous
+            universities = json.loads(content.decode('utf-8'))
+        except (OSError, ValueError) as e:
+            # Possibly caught mid-write; the mtime is not recorded so the next poll retries
+            print(f"Error loading universities data: {str(e)}")
+            return previous if previous is not None else CatalogSnapshot([])
+        
+        self._mtime = mtime
+        
+        return build_catalog_snapshot(universities, version)
+    
+    def _ensure_poller(self) -> None:
+        """
+        Start the polling thread in this process (again after a fork)
+        """
+        if self.poll_interval <= 0 or self._poller_pid == os.getpid():
+            return
+        with self._poller_lock:
+            if self._poller_pid == os.getpid():
+                return
+            self._poller_pid = os.getpid()
+            threading.Thread(target=self._poll_loop, name='catalog-poller', daemon=True).start()
+    
+    def _poll_loop(self) -> None:
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Catalog refresh failed: {str(e)}")
@@ -0,0 +1,195 @@
+"""
+Country Resolution
+
+This module maps the many spellings of a country used in the catalog and in
+user preferences ("US", "usa", "United States", "america") to one integer
+country id. It is built once from data/countries.json plus an alias table, so
+country filtering and scoring become integer set-membership tests.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+import numpy as np
+
+
+# Common abbreviations and alternative names, keyed by ISO code
+COUNTRY_ALIASES = {
+    'US': ['usa', 'united states', 'united states of america', 'america'],
+    'GB': ['uk', 'united kingdom', 'britain', 'great britain', 'england', 'scotland', 'wales'],
+    'CA': ['canada'],
+    'AU': ['australia'],
+    'DE': ['germany', 'deutschland'],
+    'FR': ['france'],
+    'IN': ['india'],
+    'CN': ['china'],
+    'JP': ['japan'],
+    'SG': ['singapore'],
+    'NZ': ['new zealand'],
+    'NL': ['netherlands', 'holland', 'the netherlands'],
+    'SE': ['sweden'],
+    'CH': ['switzerland'],
+    'IT': ['italy'],
+    'ES': ['spain'],
+    'KR': ['south korea', 'korea'],
+    'AE': ['uae', 'united arab emirates', 'emirates'],
+    'HK': ['hong kong'],
+    'CZ': ['czechia', 'czech republic']
+}
+
+# Preference tokens shorter than this only resolve through exact names and codes
+MIN_PARTIAL_LENGTH = 3
+
+
+def _normalize(name) -> str:
+    return ' '.join(str(name).lower().split())
+
+
+class CountryResolver:
+    """
+    Resolves country names, codes and aliases to integer country ids
+    """
+    
+    MAX_MEMO_ENTRIES = 1024
+    
+    def __init__(self, countries: Optional[List[Dict]] = None,
+                 aliases: Optional[Dict[str, List[str]]] = None):
+        """
+        Args:
+            countries: List of {'code', 'name'} entries (data/countries.json)
+            aliases: Extra names per country code
+        """
+        self._ids: Dict[str, int] = {}      # normalized name or code -> id
+        self._names: List[str] = []         # id -> display name
+        self._lock = threading.Lock()
+        self._memo: Dict[str, FrozenSet[int]] = {}
+        
+        for country in countries or []:
+            self._add(country.get('code'), [country.get('name')])
+        for code, names in (aliases or {}).items():
+            self._add(code, names)
+    
+    def _add(self, code: Optional[str], names: Iterable[str]) -> int:
+        keys = [_normalize(name) for name in names if name]
+        if code:
+            keys.insert(0, _normalize(code))
+        
+        country_id = next((self._ids[key] for key in keys if key in self._ids), None)
+        if country_id is None:
+            country_id = len(self._names)
+            self._names.append(next(iter(names), None) or code)
+        for key in keys:
+            self._ids.setdefault(key, country_id)
+        self._memo.clear()
+        return country_id
+    
+    def country_id(self, country) -> int:
+        """
+        Id of a catalog country value; names not known yet get a new id
+        """
+        key = _normalize(country or '')
+        country_id = self._ids.get(key)
+        if country_id is None:
+            with self._lock:
+                country_id = self._ids.get(key)
+                if country_id is None:
+                    country_id = self._add(None, [key])
+        return country_id
+    
+    def country_ids(self, countries: Iterable) -> np.ndarray:
+        return np.array([self.country_id(country) for country in countries], dtype=np.int32)
+    
+    def name(self, country_id: int) -> Optional[str]:
+        return self._names[country_id] if 0 <= country_id < len(self._names) else None
+    
+    def resolve(self, token: str) -> FrozenSet[int]:
+        """
+        Country ids a single user token refers to
+        
+        Exact names, codes and aliases resolve to their country. Longer tokens
+        also match countries with a name containing the token (e.g. "korea"),
+        or named inside it (e.g. "republic of korea"). Unknown tokens resolve to
+        nothing, and never add countries.
+        """
+        key = _normalize(token)
+        ids = self._memo.get(key)
+        if ids is not None:
+            return ids
+        
+        if not key:
+            ids = frozenset()
+        elif key in self._ids:
+            ids = frozenset([self._ids[key]])
+        elif len(key) >= MIN_PARTIAL_LENGTH:
+            ids = frozenset(
+                country_id for name, country_id in list(self._ids.items())
+                if len(name) >= MIN_PARTIAL_LENGTH and (key in name or name in key)
+            )
+        else:
+            ids = frozenset()
+        
+        if len(self._memo) >= self.MAX_MEMO_ENTRIES:
+            self._memo.clear()
+        self._memo[key] = ids
+        return ids
+    
+    def preference_ids(self, preferred_countries) -> Optional[FrozenSet[int]]:
+        """
+        Country ids of a preferred_countries profile value
+        
+        Args:
+            preferred_countries: Comma-separated string (or a single value)
+        
+        Returns:
+            Set of country ids, or None if no preference is given
+        """
+        if not preferred_countries:
+            return None
+        
+        if isinstance(preferred_countries, str):
+            tokens = [token for token in preferred_countries.split(',') if token.strip()]
+        elif isinstance(preferred_countries, (list, tuple, set)):
+            tokens = [str(token) for token in preferred_countries if str(token).strip()]
+        else:
+            tokens = [str(preferred_countries)]
+        
+        if not tokens:
+            return None
+        
+        ids = set()
+        for token in tokens:
+            ids.update(self.resolve(token))
+        return frozenset(ids)
+
+
+def load_country_resolver(file_path: str = None) -> CountryResolver:
+    """
+    Build a resolver from countries.json and the alias table
+    """
+    if file_path is None:
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        file_path = os.path.join(current_dir, '..', 'data', 'countries.json')
+    
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            countries = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Error loading countries data: {str(e)}")
+        countries = []
+    
+    return CountryResolver(countries, COUNTRY_ALIASES)
+
+
+# Global resolver instance
+_resolver_instance = None
+
+def get_country_resolver() -> CountryResolver:
+    """
+    Get or create the global country resolver
+    """
+    global _resolver_instance
+    if _resolver_instance is None:
+        _resolver_instance = load_country_resolver()
+    return _resolver_instance
@@ -0,0 +1,85 @@
+"""
+Field of Study Match Index
+
+This module indexes the distinct (lowercased) field names of a catalog with
+postings to the field sets that contain them. Scoring a student's field then
+scans the small field vocabulary once instead of every university's field list,
+and the resulting per-field-set match tiers are memoized per student field.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+
+# Match tiers of RecommendationEngine._calculate_field_match
+EXACT_MATCH = 1.0
+KEYWORD_MATCH = 0.7
+NO_MATCH = 0.2
+NEUTRAL = 0.5
+
+
+class FieldMatchIndex:
+    """
+    Inverted index from normalized field names to field-set codes
+    """
+    
+    MAX_MEMO_ENTRIES = 512
+    
+    def __init__(self, field_sets: List[tuple]):
+        """
+        Args:
+            field_sets: Distinct university field lists, indexed by field-set code
+        """
+        postings: Dict[str, List[int]] = {}
+        empty = np.zeros(len(field_sets), dtype=bool)
+        
+        for code, fields in enumerate(field_sets):
+            if not fields:
+                empty[code] = True
+            for field in fields:
+                sets = postings.setdefault(field.lower(), [])
+                if not sets or sets[-1] != code:
+                    sets.append(code)
+        
+        self.vocabulary = list(postings)
+        self.postings = [np.array(postings[field], dtype=np.int32) for field in self.vocabulary]
+        self.empty = empty
+        self.n_sets = len(field_sets)
+        self._memo: Dict[str, np.ndarray] = {}
+    
+    def match_scores(self, user_field: str) -> np.ndarray:
+        """
+        Field match score of every field set for an already normalized
+        (lowercased, stripped) student field
+        
+        Returns:
+            Array of scores indexed by field-set code
+        """
+        scores = self._memo.get(user_field)
+        if scores is not None:
+            return scores
+        
+        if not user_field:
+            scores = np.full(self.n_sets, NEUTRAL)
+        else:
+            keywords = [keyword for keyword in user_field.split() if len(keyword) > 2]
+            exact = np.zeros(self.n_sets, dtype=bool)
+            partial = np.zeros(self.n_sets, dtype=bool)
+            
+            for field, sets in zip(self.vocabulary, self.postings):
+                if user_field in field or field in user_field:
+                    exact[sets] = True
+                elif any(keyword in field for keyword in keywords):
+                    partial[sets] = True
+            
+            scores = np.full(self.n_sets, NO_MATCH)
+            scores[partial] = KEYWORD_MATCH
+            scores[exact] = EXACT_MATCH
+            scores[self.empty] = NEUTRAL
+        
+        scores.setflags(write=False)
+        if len(self._memo) >= self.MAX_MEMO_ENTRIES:
+            self._memo.clear()
+        self._memo[user_field] = scores
+        return scores
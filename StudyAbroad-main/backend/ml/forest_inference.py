@@ -0,0 +1,204 @@
+"""
+Compiled Forest Inference
+
+This module flattens a trained random forest and its feature scaler into plain
+NumPy arrays and evaluates it without scikit-learn. All trees are walked
+together, one level per step, over the whole batch of rows. Saved forests are
+memory-mapped and evaluated straight from the mapping.
+"""
+
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+def _arrays_dtype(n_nodes: int) -> np.dtype:
+    """
+    One record holding every node array back to back, 8-byte fields first so
+    each array stays aligned; saved as .npy, it can be memory-mapped and used
+    in place
+    """
+    return np.dtype([
+        ('threshold', np.float64, (n_nodes,)),
+        ('value', np.float64, (n_nodes,)),
+        ('feature', np.int32, (n_nodes,)),
+        ('children', np.int32, (2 * n_nodes,))
+    ])
+
+
+class CompiledForest:
+    """
+    Random forest regressor stored as contiguous per-field node arrays
+    """
+    
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, children: np.ndarray,
+                 value: np.ndarray, roots: np.ndarray, max_depth: int,
+                 scaler_mean: np.ndarray, scaler_scale: np.ndarray,
+                 feature_importances: np.ndarray):
+        """
+        Node arrays are used as given (no copies), so memory-mapped arrays
+        stay shared between processes. children[2 * node + go_right] is the
+        next node.
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.max_depth = int(max_depth)
+        self.scaler_mean = np.asarray(scaler_mean, dtype=np.float64)
+        self.scaler_scale = np.asarray(scaler_scale, dtype=np.float64)
+        self.feature_importances = np.asarray(feature_importances, dtype=np.float64)
+    
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+    
+    @classmethod
+    def from_sklearn(cls, model, scaler) -> 'CompiledForest':
+        """
+        Flatten a fitted RandomForestRegressor and StandardScaler
+        
+        Leaves point to themselves, so extra traversal steps are no-ops.
+        """
+        features, thresholds, children, values = [], [], [], []
+        roots = []
+        offset = 0
+        max_depth = 0
+        
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            is_leaf = tree.children_left == -1
+            own_index = np.arange(n_nodes) + offset
+            
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            children.append(np.column_stack([
+                np.where(is_leaf, own_index, tree.children_left + offset),
+                np.where(is_leaf, own_index, tree.children_right + offset)
+            ]).ravel())
+            values.append(tree.value[:, 0, 0])
+            
+            roots.append(offset)
+            offset += n_nodes
+            max_depth = max(max_depth, tree.max_depth)
+        
+        return cls(
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            children=np.concatenate(children).astype(np.int32),
+            value=np.concatenate(values).astype(np.float64),
+            roots=np.array(roots, dtype=np.int32),
+            max_depth=max_depth,
+            scaler_mean=scaler.mean_,
+            scaler_scale=scaler.scale_,
+            feature_importances=model.feature_importances_
+        )
+    
+    def transform(self, features: np.ndarray) -> np.ndarray:
+        """
+        Apply the fitted StandardScaler
+        """
+        return (np.asarray(features, dtype=np.float64) - self.scaler_mean) / self.scaler_scale
+    
+    def predict_trees(self, features: np.ndarray) -> np.ndarray:
+        """
+        Per-tree predictions for unscaled feature rows
+        
+        Returns:
+            Array of shape (n_trees, n_rows)
+        """
+        # Trees split on float32 inputs, like scikit-learn
+        X = self.transform(features).astype(np.float32)
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        row_offsets = (np.arange(n_rows) * n_features)[None, :]
+        node = np.repeat(self.roots[:, None], n_rows, axis=1)
+        
+        for _ in range(self.max_depth):
+            go_right = ~(flat_X[row_offsets + self.feature[node]] <= self.threshold[node])
+            node = self.children[2 * node + go_right]
+        
+        return self.value[node]
+    
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """
+        Forest prediction (mean over trees) for unscaled feature rows
+        """
+        return tree_mean(self.predict_trees(features))
+    
+    def predict_with_spread(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Forest prediction and the standard deviation of the tree predictions per row
+        """
+        tree_values = self.predict_trees(features)
+        return tree_mean(tree_values), tree_values.std(axis=0)
+    
+    def max_deviation(self, model, scaler, features: np.ndarray) -> float:
+        """
+        Largest absolute difference from the scikit-learn forest on the given rows
+        """
+        expected = model.predict(scaler.transform(features))
+        return float(np.max(np.abs(self.predict(features) - expected))) if len(features) else 0.0
+    
+    def save(self, path: str, metadata: Optional[Dict] = None) -> None:
+        """
+        Write the node arrays as one .npy record (memory-mappable) with a JSON sidecar
+        """
+        arrays = np.zeros((), dtype=_arrays_dtype(len(self.feature)))
+        for name in arrays.dtype.names:
+            arrays[name] = getattr(self, name)
+        np.save(path, arrays)
+        with open(_metadata_path(path), 'w', encoding='utf-8') as f:
+            json.dump({
+                'roots': self.roots.tolist(),
+                'max_depth': self.max_depth,
+                'scaler_mean': self.scaler_mean.tolist(),
+                'scaler_scale': self.scaler_scale.tolist(),
+                'feature_importances': self.feature_importances.tolist(),
+                'metadata': metadata or {}
+            }, f)
+    
+    @classmethod
+    def load(cls, path: str) -> Tuple['CompiledForest', Dict]:
+        """
+        Load a compiled forest, memory-mapping its node arrays
+        
+        The forest reads the mapped file directly, so processes loading the
+        same file share its pages.
+        
+        Returns:
+            Tuple of (forest, metadata saved with it)
+        """
+        with open(_metadata_path(path), 'r', encoding='utf-8') as f:
+            sidecar = json.load(f)
+        
+        stored = np.load(path, mmap_mode='r')
+        forest = cls(
+            **{name: stored[name] for name in stored.dtype.names},
+            roots=sidecar['roots'],
+            max_depth=sidecar['max_depth'],
+            scaler_mean=sidecar['scaler_mean'],
+            scaler_scale=sidecar['scaler_scale'],
+            feature_importances=sidecar['feature_importances']
+        )
+        return forest, sidecar.get('metadata', {})
+
+
+def tree_mean(tree_values: np.ndarray) -> np.ndarray:
+    """
+    Mean of (n_trees, n_rows) tree predictions, accumulated tree by tree to
+    match scikit-learn's summation order
+    """
+    prediction = np.zeros(tree_values.shape[1])
+    for values in tree_values:
+        prediction += values
+    prediction /= len(tree_values)
+    return prediction
+
+
+def _metadata_path(path: str) -> str:
+    return os.path.splitext(path)[0] + '.json'
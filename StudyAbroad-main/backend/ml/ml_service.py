@@ -5,11 +5,13 @@ This module provides a unified interface for all machine learning services
 including admission prediction and university recommendations.
 """
 
-import json
 import os
+import uuid
 from typing import Dict, List, Optional
 from .admission_predictor import get_predictor
 from .recommendation_engine import get_recommendation_engine
+from .catalog import CatalogSnapshot, CatalogStore
+from .recommendation_cache import create_recommendation_cache, make_cache_key
 
 
 class MLService:
@@ -20,24 +22,55 @@ class MLService:
     def __init__(self):
         self.predictor = get_predictor()
         self.recommendation_engine = get_recommendation_engine()
-        self._universities_cache = None
+        self.catalog = CatalogStore()
+        self.recommendation_cache = create_recommendation_cache()
+        self.catalog.add_listener(lambda old, new: self.recommendation_cache.clear())
+        # Trees added to the admission model when the catalog changes (0 disables)
+        self.grow_trees_on_catalog_change = int(os.getenv('ML_GROW_TREES_ON_CATALOG_CHANGE', '0'))
+        if self.grow_trees_on_catalog_change > 0:
+            self.catalog.add_listener(self._grow_model_for_catalog)
+        # Stands in for the model version when the model was trained in-process
+        self._process_model_token = f"unversioned-{uuid.uuid4().hex[:12]}"
     
     def _load_universities(self) -> List[Dict]:
         """
-        Load universities data with caching
+        Universities of the current catalog snapshot
         """
-        if self._universities_cache is None:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            file_path = os.path.join(current_dir, '..', 'data', 'universities.json')
-            
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    self._universities_cache = json.load(f)
-            except (FileNotFoundError, json.JSONDecodeError) as e:
-                print(f"Error loading universities data: {str(e)}")
-                self._universities_cache = []
+        return self.catalog.current().universities
+    
+    def _get_university(self, university_id, catalog: Optional[CatalogSnapshot] = None) -> Optional[Dict]:
+        """
+        Look up a university by id in O(1)
+        """
+        catalog = catalog or self.catalog.current()
+        return catalog.get(university_id)
+    
+    def _model_cache_version(self) -> str:
+        """
+        Model version used in recommendation cache keys
+        """
+        return self.predictor.model_version or self._process_model_token
+    
+    def _grow_model_for_catalog(self, old: CatalogSnapshot, new: CatalogSnapshot) -> None:
+        """
+        Fit extra trees on the new catalog in the background instead of retraining
         
-        return self._universities_cache
+        Skipped when serving from the compiled forest: growing needs the
+        scikit-learn model, and the model property would import it.
+        """
+        if self.predictor.inference_backend == 'numpy' or not self.predictor.is_trained:
+            return
+        self.predictor.grow_in_background(
+            new.universities,
+            n_new_trees=self.grow_trees_on_catalog_change,
+            catalog_version=new.version
+        )
+    
+    def reload_catalog(self) -> Dict:
+        """
+        Force a catalog reload and return the active catalog version
+        """
+        return self.catalog.reload()
     
     def predict_admission_probability(self, user_profile: Dict, university_id: int) -> Dict:
         """
@@ -50,8 +83,7 @@ class MLService:
         Returns:
             Dictionary with prediction results
         """
-        universities = self._load_universities()
-        university = next((u for u in universities if u['id'] == university_id), None)
+        university = self._get_university(university_id)
         
         if not university:
             return {
@@ -76,6 +108,8 @@ class MLService:
         """
         Predict admission probability for multiple universities
         
+        All found universities are scored with a single predict_many call.
+        
         Args:
             user_profile: User's academic profile
             university_ids: List of university IDs
@@ -83,12 +117,25 @@ class MLService:
         Returns:
             List of prediction results
         """
-        results = []
-        universities = self._load_universities()
+        catalog = self.catalog.current()
+        universities = [self._get_university(university_id, catalog) for university_id in university_ids]
+        found = [university for university in universities if university]
         
-        for university_id in university_ids:
-            university = next((u for u in universities if u['id'] == university_id), None)
-            
+        predictions = None
+        if found:
+            columns = catalog.columns_for(found)
+            try:
+                predictions = self.predictor.predict_many(
+                    [user_profile], found, cross_product=True,
+                    university_features=columns.model_features if columns is not None else None
+                )
+            except Exception as e:
+                # Fall back to one prediction per university so errors are reported per id
+                print(f"Batch admission prediction failed, predicting one by one: {str(e)}")
+        
+        results = []
+        position = 0
+        for university_id, university in zip(university_ids, universities):
             if not university:
                 results.append({
                     'university_id': university_id,
@@ -99,7 +146,16 @@ class MLService:
                 continue
             
             try:
-                prediction = self.predictor.predict(user_profile, university)
+                if predictions is not None:
+                    prediction = {
+                        'admission_probability': round(float(predictions['admission_probability'][0, position]), 3),
+                        'confidence': round(float(predictions['confidence'][0, position]), 3),
+                        'uncertainty': round(float(predictions['uncertainty'][0, position]), 3),
+                        'probability_category': self.predictor.PROBABILITY_CATEGORIES[
+                            predictions['category_code'][0, position]]
+                    }
+                else:
+                    prediction = self.predictor.predict(user_profile, university)
                 prediction['university_id'] = university_id
                 prediction['university_name'] = university['name']
                 prediction['university_country'] = university['country']
@@ -111,6 +167,7 @@ class MLService:
                     'admission_probability': 0.0,
                     'confidence': 0.0
                 })
+            position += 1
         
         return results
     
@@ -127,7 +184,16 @@ class MLService:
         Returns:
             Dictionary with recommendations and summary
         """
-        universities = self._load_universities()
+        catalog = self.catalog.current()
+        model_version = self._model_cache_version()
+        self.recommendation_cache.ensure_versions(catalog.version, model_version)
+        cache_key = make_cache_key(user_profile, filters, max_recommendations,
+                                   catalog.version, model_version)
+        cached_result = self.recommendation_cache.get(cache_key)
+        if cached_result is not None:
+            return cached_result
+        
+        universities = catalog.universities
         
         # Apply filters if provided
         if filters:
@@ -142,16 +208,18 @@ class MLService:
         
         try:
             recommendations = self.recommendation_engine.generate_recommendations(
-                user_profile, universities, max_recommendations
+                user_profile, universities, max_recommendations, catalog
             )
             
             summary = self.recommendation_engine.get_recommendation_summary(recommendations)
             
-            return {
+            result = {
                 'recommendations': recommendations,
                 'summary': summary,
                 'total_universities_considered': len(universities)
             }
+            self.recommendation_cache.set(cache_key, result)
+            return result
         except Exception as e:
             return {
                 'error': f'Recommendation generation failed: {str(e)}',
@@ -159,6 +227,73 @@ class MLService:
                 'summary': {}
             }
     
+    def generate_recommendations_batch(self, user_profiles: List[Dict], filters: Optional[Dict] = None,
+                                     max_recommendations: int = 10) -> List[Dict]:
+        """
+        Generate recommendations for a cohort of students in one pass
+        
+        Args:
+            user_profiles: List of user academic profiles
+            filters: Optional filters applied to every profile
+            max_recommendations: Maximum number of recommendations per profile
+        
+        Returns:
+            One generate_recommendations-style result per profile, in input order
+        """
+        catalog = self.catalog.current()
+        model_version = self._model_cache_version()
+        self.recommendation_cache.ensure_versions(catalog.version, model_version)
+        
+        results = [None] * len(user_profiles)
+        cache_keys = []
+        pending = []
+        for i, user_profile in enumerate(user_profiles):
+            cache_key = make_cache_key(user_profile, filters, max_recommendations,
+                                       catalog.version, model_version)
+            cache_keys.append(cache_key)
+            results[i] = self.recommendation_cache.get(cache_key)
+            if results[i] is None:
+                pending.append(i)
+        
+        if not pending:
+            return results
+        
+        universities = catalog.universities
+        if filters:
+            universities = self._apply_filters(universities, filters)
+        
+        if not universities:
+            for i in pending:
+                results[i] = {
+                    'recommendations': [],
+                    'summary': {},
+                    'message': 'No universities match the specified criteria'
+                }
+            return results
+        
+        try:
+            recommendation_lists = self.recommendation_engine.generate_recommendations_batch(
+                [user_profiles[i] for i in pending], universities, max_recommendations, catalog
+            )
+        except Exception as e:
+            for i in pending:
+                results[i] = {
+                    'error': f'Recommendation generation failed: {str(e)}',
+                    'recommendations': [],
+                    'summary': {}
+                }
+            return results
+        
+        for i, recommendations in zip(pending, recommendation_lists):
+            results[i] = {
+                'recommendations': recommendations,
+                'summary': self.recommendation_engine.get_recommendation_summary(recommendations),
+                'total_universities_considered': len(universities)
+            }
+            self.recommendation_cache.set(cache_keys[i], results[i])
+        
+        return results
+    
     def _apply_filters(self, universities: List[Dict], filters: Dict) -> List[Dict]:
         """
         Apply filters to university list
@@ -208,8 +343,7 @@ class MLService:
         Returns:
             Dictionary with detailed explanation
         """
-        universities = self._load_universities()
-        university = next((u for u in universities if u['id'] == university_id), None)
+        university = self._get_university(university_id)
         
         if not university:
             return {
@@ -280,8 +414,13 @@ class MLService:
         Returns:
             Dictionary with detailed cost analysis
         """
-        universities = self._load_universities()
-        selected_universities = [u for u in universities if u['id'] in university_ids]
+        catalog = self.catalog.current()
+        # Catalog order, each university once
+        positions = sorted({
+            catalog.positions[university_id] for university_id in university_ids
+            if catalog.get(university_id) is not None
+        })
+        selected_universities = [catalog.universities[position] for position in positions]
         
         if not selected_universities:
             return {'error': 'No valid universities found for analysis'}
@@ -289,7 +428,7 @@ class MLService:
         try:
             # Generate recommendations to get cost breakdowns
             recommendations = self.recommendation_engine.generate_recommendations(
-                user_profile, selected_universities, len(selected_universities)
+                user_profile, selected_universities, len(selected_universities), catalog
             )
             
             if analysis_type == 'comparison':
@@ -318,8 +457,7 @@ class MLService:
         Returns:
             Dictionary with cost trends and projections
         """
-        universities = self._load_universities()
-        university = next((u for u in universities if u['id'] == university_id), None)
+        university = self._get_university(university_id)
         
         if not university:
             return {'error': f'University with ID {university_id} not found'}
@@ -547,8 +685,18 @@ class MLService:
                 'admission_predictor': {
                     'is_trained': self.predictor.is_trained,
                     'feature_importance': feature_importance,
-                    'model_type': 'Random Forest Regressor'
+                    'model_type': 'Random Forest Regressor',
+                    'model_version': self.predictor.model_version,
+                    'catalog_version': self.predictor.catalog_version,
+                    'model_revision': self.predictor.model_revision,
+                    'training_history': self.predictor.training_history,
+                    'probability_grid': (self.predictor.probability_grid.info()
+                                         if self.predictor._active_grid() is not None else None)
                 },
+                'catalog': self.catalog.current().info(),
+                'recommendation_cache': self.recommendation_cache.stats(),
+                'prediction_memo': self.predictor.prediction_memo.stats(),
+                'parallel_scoring': self.recommendation_engine.sharded_scorer.info(),
                 'recommendation_engine': {
                     'scoring_weights': self.recommendation_engine.weight_config,
                     'components': ['admission_probability', 'cost_fit', 'field_match', 
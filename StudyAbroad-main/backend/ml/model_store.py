@@ -0,0 +1,299 @@
+"""
+Admission Model Store
+
+This module persists a trained AdmissionPredictor to disk so workers can load
+a shared, versioned model at startup instead of training their own.
+
+Every save writes its files under new, versioned names next to the model path
+and then publishes them by replacing one small pointer file. A worker reads
+the pointer once and loads the files it names, so it never pairs files from
+two different saves.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+import uuid
+from typing import Dict, Optional
+
+from .admission_predictor import AdmissionPredictor
+from .forest_inference import CompiledForest
+from .probability_grid import ProbabilityGrid
+
+
+ARTIFACT_FORMAT = 1
+ARTIFACT_FILENAME = 'admission_model.joblib'
+
+_BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+def get_model_path() -> str:
+    """
+    Resolve the model artifact path (ML_MODEL_PATH may be a directory or a file)
+    """
+    model_path = os.getenv('ML_MODEL_PATH', 'models/')
+    if not os.path.isabs(model_path):
+        model_path = os.path.join(_BACKEND_DIR, model_path)
+    if model_path.endswith(os.sep) or os.path.isdir(model_path):
+        model_path = os.path.join(model_path, ARTIFACT_FILENAME)
+    return model_path
+
+
+def get_current_path(model_path: Optional[str] = None) -> str:
+    """
+    Path of the pointer file naming the files of the current model
+    """
+    model_path = model_path or get_model_path()
+    return os.path.splitext(model_path)[0] + '.current.json'
+
+
+def _version_files(model_path: str, tag: str) -> Dict[str, str]:
+    """
+    File names of one saved version, relative to the model directory
+    """
+    stem = os.path.basename(os.path.splitext(model_path)[0])
+    return {
+        'model': f"{stem}.{tag}.joblib",
+        'compiled_forest': f"{stem}.{tag}.forest.npy",
+        'compiled_forest_sidecar': f"{stem}.{tag}.forest.json"
+    }
+
+
+def get_probability_grid_path(model_path: Optional[str] = None) -> str:
+    """
+    Path of the precomputed probability grid saved next to the model artifact
+    """
+    model_path = model_path or get_model_path()
+    return os.path.splitext(model_path)[0] + '.grid.npy'
+
+
+def get_universities_path() -> str:
+    """
+    Default location of the universities catalog
+    """
+    return os.path.join(_BACKEND_DIR, 'data', 'universities.json')
+
+
+def compute_catalog_version(file_path: Optional[str] = None) -> Optional[str]:
+    """
+    Content hash of the universities catalog the model was trained from
+    """
+    file_path = file_path or get_universities_path()
+    digest = hashlib.sha256()
+    try:
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()[:12]
+
+
+def save_predictor(predictor: AdmissionPredictor, catalog_version: Optional[str],
+                   metrics: Optional[Dict] = None, path: Optional[str] = None) -> Dict:
+    """
+    Serialize a trained predictor with its version metadata
+    
+    The model and its compiled forest are written under versioned names, then
+    the pointer file is replaced in one rename: workers see either every file
+    of the previous save or every file of this one. Files of the version this
+    save replaces are kept for workers still loading them; older ones are
+    removed.
+    
+    Returns:
+        Metadata dictionary stored alongside the model
+    """
+    if not predictor.is_trained:
+        raise ValueError("Model must be trained before it can be saved")
+    
+    path = path or get_model_path()
+    trained_at = time.time()
+    metadata = {
+        'format': ARTIFACT_FORMAT,
+        'model_version': f"{catalog_version or 'unknown'}-{int(trained_at)}",
+        'catalog_version': catalog_version,
+        'trained_at': trained_at,
+        'metrics': metrics or {}
+    }
+    
+    import joblib
+    
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    files = _version_files(path, f"{int(trained_at)}-{uuid.uuid4().hex[:8]}")
+    
+    # Uncompressed for fast loads. scikit-learn copies tree arrays into its own
+    # buffers when unpickling, so the memory-mapped, shareable copy of the
+    # forest is the compiled one below
+    joblib.dump({
+        'metadata': metadata,
+        'feature_names': predictor.feature_names,
+        'scaler': predictor.scaler,
+        'model': predictor.model
+    }, os.path.join(directory, files['model']))
+    
+    # NumPy-only copy of the forest for ML_INFERENCE_BACKEND=numpy
+    if predictor.compiled_forest is not None:
+        predictor.compiled_forest.save(os.path.join(directory, files['compiled_forest']), metadata)
+    else:
+        del files['compiled_forest'], files['compiled_forest_sidecar']
+    
+    previous = _read_current(path)
+    _write_current(path, dict(files, model_version=metadata['model_version']))
+    _remove_stale_versions(path, [files, previous or {}])
+    
+    return metadata
+
+
+def _read_current(path: str) -> Optional[Dict]:
+    """
+    Contents of the pointer file, or None if no model was saved at path
+    """
+    try:
+        with open(get_current_path(path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Error reading admission model pointer {get_current_path(path)}: {str(e)}")
+        return None
+
+
+def _write_current(path: str, current: Dict) -> None:
+    """
+    Replace the pointer file in one rename (the commit point of a save)
+    """
+    current_path = get_current_path(path)
+    tmp_path = f"{current_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(current, f)
+    os.replace(tmp_path, current_path)
+
+
+def _remove_stale_versions(path: str, keep: list) -> None:
+    """
+    Delete versioned files of path that none of the keep entries names
+    """
+    directory = os.path.dirname(path)
+    stem = os.path.basename(os.path.splitext(path)[0])
+    pattern = re.compile(re.escape(stem) + r'\.\d+-[0-9a-f]{8}\.(joblib|forest\.npy|forest\.json)$')
+    kept = {name for files in keep for key, name in files.items() if key != 'model_version'}
+    for name in os.listdir(directory):
+        if pattern.match(name) and name not in kept:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError as e:
+                print(f"Unable to remove old admission model file {name}: {str(e)}")
+
+
+def load_predictor(path: Optional[str] = None) -> Optional[AdmissionPredictor]:
+    """
+    Load a predictor from its artifact, or None if there is no usable artifact
+    
+    The pointer file is read once and every file comes from the version it
+    names. With ML_INFERENCE_BACKEND=numpy only the compiled forest is
+    loaded, so scikit-learn is not needed to serve predictions.
+    """
+    path = path or get_model_path()
+    current = _read_current(path)
+    if current is None:
+        return None
+    directory = os.path.dirname(path)
+    
+    backend = os.getenv('ML_INFERENCE_BACKEND', 'sklearn')
+    if backend == 'numpy' and current.get('compiled_forest'):
+        predictor = _load_compiled_predictor(os.path.join(directory, current['compiled_forest']))
+        if predictor is not None:
+            _attach_probability_grid(predictor, path)
+            return predictor
+    
+    import joblib
+    
+    model_path = os.path.join(directory, current['model'])
+    try:
+        artifact = joblib.load(model_path, mmap_mode='r')
+    except Exception as e:
+        print(f"Error loading admission model artifact {model_path}: {str(e)}")
+        return None
+    
+    metadata = artifact.get('metadata', {})
+    if metadata.get('format') != ARTIFACT_FORMAT:
+        print(f"Unsupported admission model artifact format: {metadata.get('format')}")
+        return None
+    
+    predictor = AdmissionPredictor()
+    predictor.model = artifact['model']
+    predictor.scaler = artifact['scaler']
+    predictor.feature_names = artifact['feature_names']
+    predictor.model_version = metadata.get('model_version')
+    predictor.catalog_version = metadata.get('catalog_version')
+    predictor.is_trained = True
+    
+    if backend == 'numpy':
+        predictor.compiled_forest = CompiledForest.from_sklearn(predictor.model, predictor.scaler)
+    
+    _attach_probability_grid(predictor, path)
+    return predictor
+
+
+def _attach_probability_grid(predictor: AdmissionPredictor, model_path: str) -> None:
+    """
+    Serve from the saved probability grid when ML_PROBABILITY_GRID enables it
+    
+    The grid must belong to the loaded model version and pass an accuracy
+    check against the live model (ML_PROBABILITY_GRID_CHECK_SAMPLES random
+    students, mean absolute error at most ML_PROBABILITY_GRID_TOLERANCE).
+    """
+    mode = os.getenv('ML_PROBABILITY_GRID', 'off')
+    grid_path = get_probability_grid_path(model_path)
+    if mode not in ('linear', 'nearest') or not os.path.exists(grid_path):
+        return
+    
+    try:
+        grid = ProbabilityGrid.load(grid_path, mode)
+    except Exception as e:
+        print(f"Error loading probability grid {grid_path}: {str(e)}")
+        return
+    
+    if grid.model_version != predictor.model_version:
+        print(f"Ignoring probability grid built for model {grid.model_version}")
+        return
+    
+    samples = int(os.getenv('ML_PROBABILITY_GRID_CHECK_SAMPLES', '2000'))
+    tolerance = float(os.getenv('ML_PROBABILITY_GRID_TOLERANCE', '0.02'))
+    if samples > 0:
+        accuracy = grid.check_accuracy(predictor, samples)
+        if accuracy['mean_abs_error'] > tolerance:
+            print(f"Ignoring probability grid: mean error {accuracy['mean_abs_error']:.4f} "
+                  f"exceeds tolerance {tolerance}")
+            return
+    
+    predictor.use_probability_grid(grid)
+
+
+def _load_compiled_predictor(forest_path: str) -> Optional[AdmissionPredictor]:
+    """
+    Build a predictor backed only by the compiled forest
+    """
+    try:
+        forest, metadata = CompiledForest.load(forest_path)
+    except Exception as e:
+        print(f"Error loading compiled admission model {forest_path}: {str(e)}")
+        return None
+    
+    if metadata.get('format') != ARTIFACT_FORMAT:
+        print(f"Unsupported compiled admission model format: {metadata.get('format')}")
+        return None
+    
+    predictor = AdmissionPredictor()
+    predictor.model = None
+    predictor.scaler = None
+    predictor.compiled_forest = forest
+    predictor.inference_backend = 'numpy'
+    predictor.model_version = metadata.get('model_version')
+    predictor.catalog_version = metadata.get('catalog_version')
+    predictor.is_trained = True
+    
+    return predictor
@@ -0,0 +1,145 @@
+"""
+Parallel Recommendation Scoring
+
+This module shards the scoring of a large catalog across a process pool. The
+pool is forked after the model and the catalog snapshot are loaded, so workers
+start with both already in memory and requests only send row positions. Each
+worker returns its local top-K; the caller merges them into the global top-K.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# Catalog snapshot inherited by forked workers
+_worker_snapshot = None
+
+
+def _warm_up(_=None) -> int:
+    return os.getpid()
+
+
+def _score_shard(user_profile: Dict, rows: np.ndarray, offset: int, k: int) -> List[Tuple]:
+    """
+    Score one shard of catalog rows in a worker process
+    
+    Returns:
+        Up to k (overall_score, offset + shard position, scores) tuples, best first
+    """
+    from .recommendation_engine import get_recommendation_engine
+    
+    snapshot = _worker_snapshot
+    universities = [snapshot.universities[row] for row in rows.tolist()]
+    columns = snapshot.columns.take(rows)
+    return get_recommendation_engine().score_top_k(user_profile, universities, columns, k, offset)
+
+
+class ShardedScorer:
+    """
+    Fork-based process pool for scoring catalogs above a size threshold
+    """
+    
+    def __init__(self, threshold: int = 0, max_workers: Optional[int] = None):
+        """
+        Args:
+            threshold: Minimum number of candidates to shard (0 disables sharding)
+            max_workers: Worker processes (defaults to the CPU count)
+        """
+        self.threshold = threshold
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = None
+        self._snapshot = None
+        self._pid = None
+        self._lock = threading.Lock()
+    
+    @property
+    def available(self) -> bool:
+        return (self.threshold > 0 and self.max_workers > 1 and
+                'fork' in multiprocessing.get_all_start_methods())
+    
+    def should_shard(self, n_candidates: int) -> bool:
+        return self.available and n_candidates >= self.threshold
+    
+    def score(self, snapshot, user_profile: Dict, rows: np.ndarray, k: int) -> List[List[Tuple]]:
+        """
+        Score catalog rows of snapshot in parallel
+        
+        Args:
+            snapshot: CatalogSnapshot the rows refer to
+            user_profile: User's academic profile and preferences
+            rows: Snapshot row positions of the candidates, in ranking tie order
+            k: Number of results needed
+        
+        Returns:
+            One best-first list of (overall_score, candidate position, scores) per shard
+        """
+        shards = np.array_split(np.arange(len(rows)), self.max_workers)
+        # Submitted under the lock, so a catalog change cannot retire the pool in between
+        with self._lock:
+            executor = self._executor_for(snapshot)
+            futures = [
+                executor.submit(_score_shard, user_profile, rows[shard], int(shard[0]), k)
+                for shard in shards if len(shard)
+            ]
+        return [future.result() for future in futures]
+    
+    def shutdown(self) -> None:
+        """
+        Release the pool; shards already submitted still finish
+        """
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False)
+            self._executor = None
+            self._snapshot = None
+    
+    def info(self) -> Dict:
+        return {
+            'enabled': self.available,
+            'threshold': self.threshold,
+            'max_workers': self.max_workers,
+            'catalog_version': self._snapshot.version if self._snapshot is not None else None
+        }
+    
+    def _executor_for(self, snapshot) -> ProcessPoolExecutor:
+        """
+        Pool whose workers were forked with this snapshot, (re)creating it if needed
+        
+        Caller holds the lock. A pool forked with an older snapshot is retired
+        without cancelling anything: shards other requests already submitted
+        to it still run, and its workers exit once its queue is drained.
+        """
+        if self._executor is not None and self._snapshot is snapshot and self._pid == os.getpid():
+            return self._executor
+        
+        if self._executor is not None and self._pid == os.getpid():
+            self._executor.shutdown(wait=False)
+        
+        global _worker_snapshot
+        _worker_snapshot = snapshot
+        executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context('fork')
+        )
+        # Fork every worker now, while the snapshot is the one they should see
+        list(executor.map(_warm_up, range(self.max_workers)))
+        
+        self._executor = executor
+        self._snapshot = snapshot
+        self._pid = os.getpid()
+        return executor
+
+
+def create_sharded_scorer() -> ShardedScorer:
+    """
+    Build the scorer from PARALLEL_SCORING_THRESHOLD (0 disables) and
+    PARALLEL_SCORING_WORKERS
+    """
+    threshold = int(os.getenv('PARALLEL_SCORING_THRESHOLD', '0'))
+    max_workers = int(os.getenv('PARALLEL_SCORING_WORKERS', '0')) or None
+    return ShardedScorer(threshold, max_workers)
@@ -0,0 +1,95 @@
+"""
+Prediction Memo
+
+This module keeps a bounded LRU of single admission predictions, so repeated
+requests for the same student and university (page refreshes, or the
+predict, explain and cost-trends endpoints firing in sequence) skip the
+scaler and forest. Entries are tagged with the model revision they were
+computed by and are dropped as soon as the model changes.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+
+class PredictionMemo:
+    """
+    Thread-safe LRU of prediction dictionaries with hit/miss counters
+    """
+    
+    def __init__(self, max_entries: int = 4096):
+        """
+        Args:
+            max_entries: Maximum number of memoized predictions (0 disables the memo)
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._revision = None
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+    
+    def get(self, key: Hashable, revision) -> Optional[Dict]:
+        """
+        Memoized prediction for key computed by this model revision, or None
+        
+        Each hit returns a fresh copy, so callers may modify it.
+        """
+        if not self.enabled:
+            return None
+        
+        with self._lock:
+            self._ensure_revision(revision)
+            prediction = self._entries.get(key)
+            if prediction is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(prediction)
+    
+    def set(self, key: Hashable, revision, prediction: Dict) -> None:
+        if not self.enabled:
+            return
+        
+        with self._lock:
+            self._ensure_revision(revision)
+            self._entries[key] = dict(prediction)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'model_revision': self._revision
+            }
+    
+    def _ensure_revision(self, revision) -> None:
+        # Caller holds the lock
+        if revision != self._revision:
+            self._entries.clear()
+            self._revision = revision
+
+
+def create_prediction_memo() -> PredictionMemo:
+    """
+    Build the memo from ML_PREDICTION_MEMO_SIZE (0 disables)
+    """
+    return PredictionMemo(int(os.getenv('ML_PREDICTION_MEMO_SIZE', '4096')))
@@ -0,0 +1,91 @@
+"""
+Pre-fork Preloading
+
+This module builds the ML stack (admission model, catalog snapshot, columns
+and indexes) once in a pre-forking server's master process, so every worker
+inherits it copy-on-write instead of loading or training its own. See
+gunicorn.conf.py for the server hooks.
+"""
+
+import gc
+import os
+import threading
+import time
+from typing import Dict
+
+import numpy as np
+
+from .ml_service import get_ml_service
+
+
+# Profile used to run every scoring path once before forking
+_WARM_UP_PROFILE = {
+    'cgpa': 3.5, 'gre_score': 315, 'toefl_score': 100, 'field_of_study': 'Computer Science',
+    'preferred_countries': 'US', 'budget_min': 20000, 'budget_max': 60000
+}
+
+_preload_info = None
+
+
+def preload_ml_service() -> Dict:
+    """
+    Build and warm the ML service in the current process, then freeze the heap
+    
+    Call this in the master process after the app is imported and before
+    workers fork. gc.freeze() moves every object built so far into a
+    permanent generation, so workers' garbage collections no longer write
+    to (and thereby copy) the pages holding them. The large structures are
+    NumPy arrays (compiled forest, catalog columns, field index) that are
+    not tracked by the collector at all.
+    
+    Returns:
+        Dictionary describing what was preloaded
+    """
+    global _preload_info
+    started = time.perf_counter()
+    
+    service = get_ml_service()
+    snapshot = service.catalog.current()
+    predictor = service.predictor
+    
+    # Run the batch and single-university paths once so lazily built state
+    # (scikit-learn model pages, memoized indexes) is created before the fork
+    service.recommendation_engine.generate_recommendations(_WARM_UP_PROFILE, snapshot.universities, 5, snapshot)
+    if snapshot.universities:
+        predictor.predict(_WARM_UP_PROFILE, snapshot.universities[0])
+    service.recommendation_cache.clear()
+    predictor.prediction_memo.clear()
+    
+    gc.collect()
+    gc.freeze()
+    
+    _preload_info = {
+        'pid': os.getpid(),
+        'model_version': predictor.model_version,
+        'catalog_version': snapshot.version,
+        'universities': len(snapshot.universities),
+        'frozen_objects': gc.get_freeze_count(),
+        'seconds': round(time.perf_counter() - started, 3)
+    }
+    return _preload_info
+
+
+def after_fork() -> None:
+    """
+    Per-worker reset, to be called in each child right after the fork
+    
+    Locks that a master thread (the catalog poller) may have held at fork
+    time are replaced, and the global NumPy RNG is reseeded so workers do
+    not share one random stream.
+    """
+    service = get_ml_service()
+    service.catalog._rebuild_lock = threading.Lock()
+    service.catalog._poller_lock = threading.Lock()
+    np.random.seed()
+
+
+def get_preload_info() -> Dict:
+    """
+    What preload_ml_service() built, or None when the process was not preloaded
+    """
+    return _preload_info
@@ -0,0 +1,255 @@
+"""
+Admission Probability Grid
+
+This module precomputes the admission model (probability and tree spread)
+over a quantized lattice of student scores (CGPA × GRE × English band) for
+every distinct university requirement row. Serving then interpolates in the
+float16 tensor instead of running the forest. The tensor is saved as .npy and
+memory-mapped, so forked workers share one copy.
+"""
+
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+# Default lattice axes (raw student scores); GRE 0 means "no GRE score"
+CGPA_AXIS = np.round(np.arange(0.0, 4.0 + 1e-9, 0.1), 2)
+GRE_AXIS = np.concatenate([[0.0], np.arange(260.0, 340.0 + 1e-9, 4.0)])
+ENGLISH_AXIS = np.round(np.arange(0.0, 9.0 + 1e-9, 0.5), 2)  # IELTS bands (TOEFL maps onto them)
+
+# Student rows scored per model call while building the grid
+BUILD_CHUNK_ROWS = 65536
+
+
+class ProbabilityGrid:
+    """
+    Float16 (university row × cgpa × gre × english × [probability, spread]) tensor
+    """
+    
+    def __init__(self, values: np.ndarray, university_features: np.ndarray,
+                 cgpa_axis: np.ndarray, gre_axis: np.ndarray, english_axis: np.ndarray,
+                 model_version: Optional[str] = None, mode: str = 'linear',
+                 accuracy: Optional[Dict] = None):
+        """
+        Args:
+            values: Probability and tree spread, shape (n_rows, len(cgpa), len(gre), len(english), 2)
+            university_features: Distinct build_university_features rows, one per grid row
+            cgpa_axis, gre_axis, english_axis: Increasing raw student score axes
+            model_version: Version of the model the grid was computed from
+            mode: 'linear' (trilinear interpolation) or 'nearest' (nearest cell)
+            accuracy: Result of the last check_accuracy run
+        """
+        self.values = values
+        self.university_features = np.asarray(university_features, dtype=np.float64)
+        self.axes = [np.asarray(axis, dtype=np.float64) for axis in (cgpa_axis, gre_axis, english_axis)]
+        self.model_version = model_version
+        self.mode = mode
+        self.accuracy = accuracy
+        
+        # Row lookup by the exact bytes of a university feature row
+        self._row_keys = _row_keys(self.university_features)
+        self._key_order = np.argsort(self._row_keys)
+        self._sorted_keys = self._row_keys[self._key_order]
+    
+    @classmethod
+    def build(cls, predictor, university_features: np.ndarray, cgpa_axis: np.ndarray = CGPA_AXIS,
+              gre_axis: np.ndarray = GRE_AXIS, english_axis: np.ndarray = ENGLISH_AXIS,
+              mode: str = 'linear') -> 'ProbabilityGrid':
+        """
+        Evaluate the predictor's model on every lattice point of every distinct university row
+        
+        Args:
+            predictor: Trained AdmissionPredictor
+            university_features: build_university_features rows of the catalog
+        """
+        university_features = np.unique(np.asarray(university_features, dtype=np.float64), axis=0)
+        cgpa, gre, english = np.meshgrid(cgpa_axis, gre_axis, english_axis, indexing='ij')
+        students = np.column_stack([cgpa.ravel() / 4.0, gre.ravel() / 340.0, english.ravel() / 9.0])
+        
+        values = np.empty((len(university_features), students.shape[0], 2), dtype=np.float16)
+        rows_per_chunk = max(1, BUILD_CHUNK_ROWS // len(students))
+        for start in range(0, len(university_features), rows_per_chunk):
+            block = university_features[start:start + rows_per_chunk]
+            features = _lattice_features(students, block)
+            probabilities, spread = predictor._predict_with_spread(features)
+            values[start:start + len(block), :, 0] = np.clip(probabilities, 0.0, 1.0).reshape(len(block), -1)
+            values[start:start + len(block), :, 1] = spread.reshape(len(block), -1)
+        
+        shape = (len(university_features), len(cgpa_axis), len(gre_axis), len(english_axis), 2)
+        return cls(values.reshape(shape), university_features, cgpa_axis, gre_axis, english_axis,
+                   model_version=predictor.model_version, mode=mode)
+    
+    def rows_for(self, university_features: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Grid row of each university feature row, or None if any row is not in the grid
+        """
+        keys = _row_keys(university_features)
+        positions = np.searchsorted(self._sorted_keys, keys)
+        positions = np.minimum(positions, len(self._sorted_keys) - 1)
+        if len(keys) and not np.array_equal(self._sorted_keys[positions], keys):
+            return None
+        return self._key_order[positions]
+    
+    def covers(self, student_scores: np.ndarray) -> np.ndarray:
+        """
+        Mask of student rows (raw cgpa, gre, english) inside the lattice
+        
+        GRE scores between 0 (no score) and the lowest scaled score are not
+        covered, since interpolating across that gap would be meaningless.
+        """
+        cgpa, gre, english = np.asarray(student_scores, dtype=np.float64).T
+        cgpa_axis, gre_axis, english_axis = self.axes
+        return (
+            (cgpa >= cgpa_axis[0]) & (cgpa <= cgpa_axis[-1]) &
+            (english >= english_axis[0]) & (english <= english_axis[-1]) &
+            ((gre == 0) | ((gre >= gre_axis[1]) & (gre <= gre_axis[-1])))
+        )
+    
+    def lookup(self, student_scores: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Interpolated admission probabilities and tree spread
+        
+        Args:
+            student_scores: (n, 3) raw cgpa, gre and IELTS-equivalent english scores (covered rows)
+            rows: Grid row of each student's university
+        
+        Returns:
+            Tuple of (probabilities, spread) as float64
+        """
+        student_scores = np.asarray(student_scores, dtype=np.float64)
+        lower, weight = zip(*(_bracket(axis, student_scores[:, i]) for i, axis in enumerate(self.axes)))
+        
+        if self.mode == 'nearest':
+            index = [low + (w >= 0.5) for low, w in zip(lower, weight)]
+            result = self.values[rows, index[0], index[1], index[2]].astype(np.float64)
+            return result[:, 0], result[:, 1]
+        
+        result = np.zeros((len(rows), 2))
+        for corner in range(8):
+            offsets = [(corner >> axis) & 1 for axis in range(3)]
+            corner_weight = np.ones(len(rows))
+            for axis, offset in enumerate(offsets):
+                corner_weight *= weight[axis] if offset else 1.0 - weight[axis]
+            cells = self.values[rows, lower[0] + offsets[0], lower[1] + offsets[1], lower[2] + offsets[2]]
+            result += corner_weight[:, None] * cells
+        return result[:, 0], result[:, 1]
+    
+    def check_accuracy(self, predictor, num_samples: int = 10000,
+                       rng: Optional[np.random.Generator] = None) -> Dict:
+        """
+        Compare grid lookups with the live model on random covered students
+        
+        Returns:
+            Dictionary with mean, p99 and max absolute error (also kept on the grid)
+        """
+        rng = rng or np.random.default_rng(0)
+        cgpa_axis, gre_axis, english_axis = self.axes
+        students = np.column_stack([
+            rng.uniform(cgpa_axis[0], cgpa_axis[-1], num_samples),
+            np.where(rng.random(num_samples) < 0.2, 0.0, rng.uniform(gre_axis[1], gre_axis[-1], num_samples)),
+            rng.choice(english_axis, num_samples)
+        ])
+        rows = rng.integers(0, len(self.university_features), num_samples)
+        
+        expected = np.clip(predictor._predict_raw(
+            _lattice_features(students / [4.0, 340.0, 9.0], self.university_features[rows], paired=True)
+        ), 0.0, 1.0)
+        errors = np.abs(self.lookup(students, rows)[0] - expected)
+        
+        self.accuracy = {
+            'samples': int(num_samples),
+            'mean_abs_error': float(errors.mean()),
+            'p99_abs_error': float(np.percentile(errors, 99)),
+            'max_abs_error': float(errors.max())
+        }
+        return self.accuracy
+    
+    def info(self) -> Dict:
+        return {
+            'mode': self.mode,
+            'model_version': self.model_version,
+            'university_rows': len(self.university_features),
+            'shape': list(self.values.shape),
+            'bytes': int(self.values.nbytes),
+            'accuracy': self.accuracy
+        }
+    
+    def save(self, path: str) -> None:
+        """
+        Write the tensor as .npy (memory-mappable) with a JSON sidecar
+        """
+        np.save(path, np.ascontiguousarray(self.values, dtype=np.float16))
+        with open(_metadata_path(path), 'w', encoding='utf-8') as f:
+            json.dump({
+                'university_features': self.university_features.tolist(),
+                'axes': [axis.tolist() for axis in self.axes],
+                'model_version': self.model_version,
+                'accuracy': self.accuracy
+            }, f)
+    
+    @classmethod
+    def load(cls, path: str, mode: str = 'linear') -> 'ProbabilityGrid':
+        """
+        Load a grid, memory-mapping its tensor
+        """
+        with open(_metadata_path(path), 'r', encoding='utf-8') as f:
+            sidecar = json.load(f)
+        
+        values = np.load(path, mmap_mode='r')
+        if values.ndim != 5:
+            raise ValueError("Probability grid has no tree spread layer; rebuild it with train_admission_model.py --grid")
+        
+        cgpa_axis, gre_axis, english_axis = sidecar['axes']
+        return cls(
+            values,
+            np.array(sidecar['university_features'], dtype=np.float64).reshape(-1, 5),
+            cgpa_axis, gre_axis, english_axis,
+            model_version=sidecar.get('model_version'),
+            mode=mode,
+            accuracy=sidecar.get('accuracy')
+        )
+
+
+def _lattice_features(students: np.ndarray, university_features: np.ndarray,
+                      paired: bool = False) -> np.ndarray:
+    """
+    _engineer_features rows for normalized student scores against university rows
+    
+    Args:
+        students: (n, 3) normalized cgpa, gre and english scores
+        university_features: (m, 5) build_university_features rows
+        paired: Pair row i with row i instead of building the m × n cross product
+    """
+    if not paired:
+        n_students = len(students)
+        students = np.tile(students, (len(university_features), 1))
+        university_features = np.repeat(university_features, n_students, axis=0)
+    
+    min_cgpa, min_gre, min_english, acceptance_rate, ranking_score = university_features.T
+    cgpa_score, gre_score, english_score = students.T
+    return np.column_stack([
+        cgpa_score, gre_score, english_score,
+        cgpa_score - min_cgpa, gre_score - min_gre, english_score - min_english,
+        acceptance_rate, ranking_score
+    ])
+
+
+def _bracket(axis: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lower cell index and interpolation weight of each value along an axis
+    """
+    lower = np.clip(np.searchsorted(axis, values, side='right') - 1, 0, len(axis) - 2)
+    weight = np.clip((values - axis[lower]) / (axis[lower + 1] - axis[lower]), 0.0, 1.0)
+    return lower, weight
+
+
+def _row_keys(rows: np.ndarray) -> np.ndarray:
+    rows = np.ascontiguousarray(rows, dtype=np.float64).reshape(-1, 5)
+    return rows.view(np.dtype((np.void, rows.dtype.itemsize * 5))).ravel()
+
+
+def _metadata_path(path: str) -> str:
+    return os.path.splitext(path)[0] + '.json'
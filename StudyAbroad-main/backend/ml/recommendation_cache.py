@@ -0,0 +1,247 @@
+"""
+Recommendation Result Cache
+
+This module caches generated recommendation results keyed by a canonical hash
+of the scoring-relevant profile fields, the filters and max_recommendations.
+Results live in an in-process LRU tier with size and TTL bounds and, when
+configured, in a shared Redis tier. Keys include the catalog and model
+versions, so a new catalog or model never serves stale results.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+# Profile fields that influence recommendation scoring; everything else in a
+# stored user document (name, email, timestamps, ...) is left out of the key
+SCORING_PROFILE_FIELDS = (
+    'cgpa', 'gre_score', 'ielts_score', 'toefl_score', 'field_of_study',
+    'preferred_countries', 'home_country', 'budget_min', 'budget_max'
+)
+
+KEY_PREFIX = 'recommendations:'
+
+
+def _json_default(value):
+    # Sets and NumPy scalars/arrays become lists and numbers; anything else its text
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+def make_cache_key(user_profile: Dict, filters: Optional[Dict], max_recommendations: int,
+                   catalog_version: Optional[str], model_version: Optional[str]) -> str:
+    """
+    Canonical cache key for one recommendation request
+    """
+    profile = {field: user_profile.get(field) for field in SCORING_PROFILE_FIELDS
+               if user_profile.get(field) is not None}
+    payload = json.dumps({
+        'profile': profile,
+        'filters': filters or {},
+        'max_recommendations': max_recommendations,
+        'catalog_version': catalog_version,
+        'model_version': model_version
+    }, sort_keys=True, separators=(',', ':'), default=str)
+    return KEY_PREFIX + hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LocalRedis:
+    """
+    In-memory stand-in for the subset of the Redis client used by the cache
+    """
+    
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+    
+    def setex(self, key: str, ttl: int, value) -> bool:
+        if isinstance(value, str):
+            value = value.encode('utf-8')
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+        return True
+    
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+
+class RecommendationCache:
+    """
+    Two-tier (local LRU + optional shared Redis) cache of recommendation results
+    """
+    
+    def __init__(self, max_entries: int = 1024, ttl: float = 300, shared_client=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.shared_client = shared_client
+        
+        self._entries = OrderedDict()  # key -> (JSON payload, expires_at)
+        self._lock = threading.Lock()
+        self._versions = None
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Cached result for key, or None on a miss
+        
+        Each hit returns a fresh copy, so callers may modify it.
+        """
+        if not self.enabled:
+            return None
+        
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                payload, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(payload)
+                del self._entries[key]
+        
+        payload = self._get_shared(key)
+        result = None
+        if payload is not None:
+            try:
+                result = json.loads(payload)
+            except ValueError as e:
+                print(f"Ignoring malformed shared recommendation cache entry: {str(e)}")
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.shared_hits += 1
+        self._store_local(key, payload)
+        return result
+    
+    def set(self, key: str, result: Dict) -> None:
+        """
+        Store a result in both tiers
+        
+        Both tiers hold the same JSON payload, so a hit from either one returns
+        the same values: tuples come back as lists and sets as sorted lists.
+        """
+        if not self.enabled:
+            return
+        payload = json.dumps(result, default=_json_default).encode('utf-8')
+        self._store_local(key, payload)
+        self._set_shared(key, payload)
+    
+    def ensure_versions(self, catalog_version: Optional[str], model_version: Optional[str]) -> None:
+        """
+        Drop the local tier when the catalog or model version changes
+        """
+        versions = (catalog_version, model_version)
+        if versions == self._versions:
+            return
+        with self._lock:
+            if versions != self._versions:
+                self._entries.clear()
+                self._versions = versions
+    
+    def clear(self) -> None:
+        """
+        Drop every entry of the local tier (shared entries age out by TTL)
+        """
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+                'shared_tier': self.shared_client is not None,
+                'catalog_version': self._versions[0] if self._versions else None,
+                'model_version': self._versions[1] if self._versions else None
+            }
+    
+    def _store_local(self, key: str, payload: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (payload, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def _get_shared(self, key: str) -> Optional[bytes]:
+        if self.shared_client is None:
+            return None
+        try:
+            return self.shared_client.get(key)
+        except Exception as e:
+            print(f"Shared recommendation cache read failed: {str(e)}")
+            return None
+    
+    def _set_shared(self, key: str, payload: bytes) -> None:
+        if self.shared_client is None:
+            return
+        try:
+            self.shared_client.setex(key, max(1, int(self.ttl)), payload)
+        except Exception as e:
+            print(f"Shared recommendation cache write failed: {str(e)}")
+
+
+def create_recommendation_cache() -> RecommendationCache:
+    """
+    Build the cache from the environment
+    
+    RECOMMENDATION_CACHE_SIZE and RECOMMENDATION_CACHE_TTL bound the local tier
+    (0 disables caching). The shared tier is used when REDIS_URL is set and the
+    redis package is installed; REDIS_URL=local uses an in-process LocalRedis.
+    """
+    max_entries = int(os.getenv('RECOMMENDATION_CACHE_SIZE', '1024'))
+    ttl = float(os.getenv('RECOMMENDATION_CACHE_TTL', '300'))
+    
+    shared_client = None
+    redis_url = os.getenv('REDIS_URL')
+    if redis_url == 'local':
+        shared_client = LocalRedis()
+    elif redis_url:
+        # Optional dependency, only imported when a shared tier is configured
+        try:
+            import redis
+        except ImportError:
+            redis = None
+        
+        if redis is None:
+            print("REDIS_URL is set but the redis package is not installed; using the local cache only")
+        else:
+            try:
+                shared_client = redis.Redis.from_url(redis_url, socket_timeout=0.05)
+            except Exception as e:
+                print(f"Unable to connect to Redis: {str(e)}")
+    
+    return RecommendationCache(max_entries, ttl, shared_client)
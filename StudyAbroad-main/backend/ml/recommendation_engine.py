@@ -5,11 +5,15 @@ This module implements a comprehensive recommendation system that ranks universi
 based on user profile matching, admission probability, cost fit, and preferences.
 """
 
+import heapq
 import json
 import os
 from typing import Dict, List, Tuple, Optional
 import numpy as np
 from .admission_predictor import get_predictor
+from .country_resolver import get_country_resolver
+from .parallel_scoring import create_sharded_scorer
+from .university_columns import UniversityColumns, encode_column
 
 
 class RecommendationEngine:
@@ -19,6 +23,8 @@ class RecommendationEngine:
     
     def __init__(self):
         self.predictor = get_predictor()
+        self.country_resolver = get_country_resolver()
+        self.sharded_scorer = create_sharded_scorer()
         self.weight_config = {
             'admission_probability': 0.35,
             'cost_fit': 0.25,
@@ -28,7 +34,7 @@ class RecommendationEngine:
         }
     
     def generate_recommendations(self, user_profile: Dict, universities: List[Dict], 
-                               max_recommendations: int = 10) -> List[Dict]:
+                               max_recommendations: int = 10, catalog=None) -> List[Dict]:
         """
         Generate personalized university recommendations
         
@@ -36,56 +42,465 @@ class RecommendationEngine:
             user_profile: User's academic profile and preferences
             universities: List of all available universities
             max_recommendations: Maximum number of recommendations to return
+            catalog: Optional CatalogSnapshot the universities were taken from,
+                     used for its precomputed university columns
             
         Returns:
             List of recommended universities with scores and explanations
         """
-        recommendations = []
+        try:
+            return self._rank_batch(user_profile, universities, max_recommendations, catalog)
+        except Exception as e:
+            print(f"Batch scoring failed, falling back to per-university scoring: {str(e)}")
         
         # Filter universities by preferred countries if specified
         filtered_universities = self._filter_by_country(user_profile, universities)
         
-        for university in filtered_universities:
+        recommendations = self._score_per_university(user_profile, filtered_universities)
+        
+        # Calculate cost percentiles for all recommendations
+        self._calculate_cost_percentiles(recommendations)
+        
+        # Sort by overall score (descending)
+        recommendations.sort(key=lambda x: x['overall_score'], reverse=True)
+        
+        # Return top recommendations
+        return recommendations[:max_recommendations]
+    
+    # Upper bound on student × university rows scored per model call
+    BATCH_CHUNK_ROWS = 65536
+    
+    def generate_recommendations_batch(self, user_profiles: List[Dict], universities: List[Dict],
+                                       max_recommendations: int = 10, catalog=None) -> List[List[Dict]]:
+        """
+        Generate recommendations for many students against the same universities
+        
+        Admission probabilities for a chunk of profiles × all universities come
+        from one model call; the rest of the scoring is vectorized per profile.
+        Each result list matches generate_recommendations for that profile.
+        
+        Args:
+            user_profiles: List of user profiles
+            universities: List of all available universities
+            max_recommendations: Maximum number of recommendations per profile
+            catalog: Optional CatalogSnapshot the universities were taken from
+        
+        Returns:
+            One recommendation list per profile, in input order
+        """
+        try:
+            columns = self._columns_for(universities, catalog)
+        except Exception as e:
+            print(f"Batch scoring failed, falling back to per-profile scoring: {str(e)}")
+            return [self.generate_recommendations(profile, universities, max_recommendations)
+                    for profile in user_profiles]
+        
+        results = []
+        chunk_size = max(1, self.BATCH_CHUNK_ROWS // max(1, len(universities)))
+        
+        for start in range(0, len(user_profiles), chunk_size):
+            chunk = user_profiles[start:start + chunk_size]
+            try:
+                predictions = self.predictor.predict_batch_profiles(chunk, universities, columns.model_features)
+            except Exception:
+                predictions = None  # Each profile is predicted (and reports errors) on its own
+            
+            for j, user_profile in enumerate(chunk):
+                admission = {key: values[j] for key, values in predictions.items()} if predictions else None
+                try:
+                    results.append(self._rank_columns(
+                        user_profile, universities, columns, max_recommendations, admission
+                    ))
+                except Exception as e:
+                    print(f"Batch scoring failed, falling back to per-university scoring: {str(e)}")
+                    results.append(self.generate_recommendations(user_profile, universities, max_recommendations))
+        
+        return results
+    
+    def _columns_for(self, universities: List[Dict], catalog=None) -> UniversityColumns:
+        """
+        Catalog columns for universities, built on the fly when not available
+        """
+        columns = catalog.columns_for(universities) if catalog is not None else None
+        if columns is None:
+            columns = self.build_university_columns(universities)
+        return columns
+    
+    def _rank_batch(self, user_profile: Dict, universities: List[Dict],
+                    max_recommendations: int, catalog=None) -> List[Dict]:
+        """
+        Score all candidates in one vectorized pass and build only the top results
+        """
+        columns = self._columns_for(universities, catalog)
+        return self._rank_columns(user_profile, universities, columns, max_recommendations, catalog=catalog)
+    
+    def _rank_columns(self, user_profile: Dict, universities: List[Dict], columns: UniversityColumns,
+                      max_recommendations: int, admission: Optional[Dict[str, np.ndarray]] = None,
+                      catalog=None) -> List[Dict]:
+        """
+        Rank universities for one profile from their precomputed columns
+        
+        Phase one computes the overall score and annual cost of every candidate
+        and selects the top max_recommendations. Phase two builds explanations
+        and cost breakdowns for those survivors only. Cost percentiles are still
+        ranked against every candidate.
+        
+        Large catalogs taken from a snapshot are scored by the sharded process
+        pool when it is enabled (see parallel_scoring).
+        
+        Args:
+            admission: Optional precomputed predict_batch result for all universities
+            catalog: Optional CatalogSnapshot the universities were taken from
+        """
+        # Filter universities by preferred countries if specified
+        country_mask = self._country_filter_mask(user_profile, columns.country_ids)
+        if country_mask is not None:
+            rows = np.flatnonzero(country_mask)
+            universities = [universities[i] for i in rows.tolist()]
+            columns = columns.take(rows)
+            if admission is not None:
+                admission = {key: values[rows] for key, values in admission.items()}
+        
+        annual_costs = columns.annual_cost
+        
+        # Rows the per-university path would have dropped while building
+        valid = np.isfinite(annual_costs) & columns.complete
+        for i in np.flatnonzero(~valid):
+            print(f"Error processing university {universities[i].get('name', 'Unknown')}: "
+                  f"incomplete university data")
+        
+        candidates = np.flatnonzero(valid)
+        # Percentiles use the rounded totals shown in each cost breakdown
+        all_costs = [round(cost, 2) for cost in annual_costs[candidates].tolist()]
+        
+        if admission is None and catalog is not None and self.sharded_scorer.should_shard(len(candidates)):
+            recommendations = self._rank_sharded(
+                user_profile, universities, candidates, max_recommendations, catalog
+            )
+            if recommendations is not None:
+                self._calculate_cost_percentiles(recommendations, all_costs)
+                return recommendations
+        
+        score_columns = self._calculate_scores_batch(user_profile, universities, columns, admission)
+        overall_scores = self._calculate_overall_scores_batch(score_columns)
+        candidate_scores = overall_scores[candidates]
+        
+        recommendations = []
+        for position in self._iter_ranked(candidate_scores, max_recommendations):
+            if len(recommendations) >= max_recommendations:
+                break
+            
+            i = candidates[position]
+            university = universities[i]
+            scores = {name: values[i].item() if hasattr(values[i], 'item') else values[i]
+                      for name, values in score_columns.items()}
+            try:
+                recommendations.append(
+                    self._build_recommendation(user_profile, university, scores, overall_scores[i].item())
+                )
+            except Exception as e:
+                print(f"Error processing university {university.get('name', 'Unknown')}: {str(e)}")
+                continue
+        
+        self._calculate_cost_percentiles(recommendations, all_costs)
+        
+        return recommendations
+    
+    def score_top_k(self, user_profile: Dict, universities: List[Dict], columns: UniversityColumns,
+                    k: int, offset: int = 0) -> List[Tuple]:
+        """
+        Score one shard of candidates and keep its k best (runs in pool workers)
+        
+        Returns:
+            List of (overall_score, offset + position, scores) tuples, best first
+        """
+        score_columns = self._calculate_scores_batch(user_profile, universities, columns)
+        overall_scores = self._calculate_overall_scores_batch(score_columns)
+        
+        return [
+            (overall_scores[i].item(), offset + i,
+             {name: values[i].item() if hasattr(values[i], 'item') else values[i]
+              for name, values in score_columns.items()})
+            for i in self._select_top_k(overall_scores, k).tolist()
+        ]
+    
+    def _rank_sharded(self, user_profile: Dict, universities: List[Dict], candidates: np.ndarray,
+                      max_recommendations: int, catalog) -> Optional[List[Dict]]:
+        """
+        Score candidates across the process pool and k-way merge the shard top-Ks
+        
+        Returns:
+            Recommendations, or None when the single-process path must be used
+        """
+        rows = catalog.rows_for([universities[i] for i in candidates.tolist()])
+        if rows is None:
+            return None
+        
+        try:
+            shard_results = self.sharded_scorer.score(catalog, user_profile, rows, max_recommendations)
+        except Exception as e:
+            print(f"Parallel scoring failed, scoring in process: {str(e)}")
+            return None
+        
+        # Best score first, ties in candidate order, as the stable sort would give
+        merged = heapq.merge(*shard_results, key=lambda result: (-result[0], result[1]))
+        
+        recommendations = []
+        for overall_score, position, scores in merged:
+            if len(recommendations) >= max_recommendations:
+                break
+            university = universities[candidates[position]]
+            try:
+                recommendations.append(
+                    self._build_recommendation(user_profile, university, scores, overall_score)
+                )
+            except Exception as e:
+                print(f"Error processing university {university.get('name', 'Unknown')}: {str(e)}")
+        
+        # Shards only return k rows each; rebuild in process if failures used them up
+        shortfall = min(max_recommendations, len(candidates)) - len(recommendations)
+        return recommendations if shortfall <= 0 else None
+    
+    def _iter_ranked(self, scores: np.ndarray, k: int):
+        """
+        Yield positions by descending score, ties in original order
+        
+        The first k come from a partial selection; the full ordering is only
+        computed if more are requested.
+        """
+        top = self._select_top_k(scores, k)
+        yield from top.tolist()
+        
+        if len(top) < len(scores):
+            yield from np.argsort(-scores, kind='stable')[len(top):].tolist()
+    
+    def _select_top_k(self, scores: np.ndarray, k: int) -> np.ndarray:
+        """
+        Positions of the k highest scores, ordered like a stable descending sort
+        """
+        n = len(scores)
+        if k <= 0 or n == 0:
+            return np.empty(0, dtype=int)
+        if k >= n:
+            return np.argsort(-scores, kind='stable')
+        
+        kth_score = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        # Everything at or above the k-th score, in original order, then stable sort
+        shortlist = np.flatnonzero(scores >= kth_score)
+        return shortlist[np.argsort(-scores[shortlist], kind='stable')][:k]
+    
+    def _score_per_university(self, user_profile: Dict, universities: List[Dict]) -> List[Dict]:
+        """
+        Score candidate universities one at a time
+        """
+        recommendations = []
+        
+        for university in universities:
             try:
                 # Calculate individual scores
                 scores = self._calculate_scores(user_profile, university)
                 
                 # Calculate overall recommendation score
-                overall_score = self._calculate_overall_score(scores)
-                
-                # Generate explanation
-                explanation = self._generate_explanation(scores, user_profile, university)
-                
-                # Generate comprehensive cost breakdown
-                cost_breakdown = self._generate_cost_breakdown(user_profile, university)
+                overall_score = round(self._calculate_overall_score(scores), 3)
                 
-                recommendation = {
-                    'university_id': university['id'],
-                    'university_name': university['name'],
-                    'country': university['country'],
-                    'city': university['city'],
-                    'overall_score': round(overall_score, 3),
-                    'scores': scores,
-                    'explanation': explanation,
-                    'cost_breakdown': cost_breakdown,
-                    'admission_probability': scores.get('admission_probability', 0),
-                    'university_data': university
-                }
-                
-                recommendations.append(recommendation)
+                recommendations.append(
+                    self._build_recommendation(user_profile, university, scores, overall_score)
+                )
                 
             except Exception as e:
                 print(f"Error processing university {university.get('name', 'Unknown')}: {str(e)}")
                 continue
         
-        # Calculate cost percentiles for all recommendations
-        self._calculate_cost_percentiles(recommendations)
+        return recommendations
+    
+    def _build_recommendation(self, user_profile: Dict, university: Dict, scores: Dict,
+                              overall_score: float) -> Dict:
+        """
+        Assemble a recommendation entry from its computed scores
+        """
+        # Generate explanation
+        explanation = self._generate_explanation(scores, user_profile, university)
         
-        # Sort by overall score (descending)
-        recommendations.sort(key=lambda x: x['overall_score'], reverse=True)
+        # Generate comprehensive cost breakdown
+        cost_breakdown = self._generate_cost_breakdown(user_profile, university)
         
-        # Return top recommendations
-        return recommendations[:max_recommendations]
+        return {
+            'university_id': university['id'],
+            'university_name': university['name'],
+            'country': university['country'],
+            'city': university['city'],
+            'overall_score': overall_score,
+            'scores': scores,
+            'explanation': explanation,
+            'cost_breakdown': cost_breakdown,
+            'admission_probability': scores.get('admission_probability', 0),
+            'university_data': university
+        }
+    
+    def build_university_columns(self, universities: List[Dict]) -> UniversityColumns:
+        """
+        Precompute everything scoring needs that does not depend on the student
+        
+        Args:
+            universities: List of universities
+        
+        Returns:
+            UniversityColumns with one row per university
+        """
+        try:
+            model_features = self.predictor.build_university_features(universities)
+        except Exception:
+            model_features = None  # predict_batch reports the error per request
+        
+        ranking = np.array([u.get('ranking', 1000) for u in universities], dtype=float)
+        tuition_fee = np.array([u.get('tuition_fee', 0) for u in universities], dtype=float)
+        living_cost = np.array([u.get('living_cost', 0) for u in universities], dtype=float)
+        field_set_codes, field_sets = encode_column([tuple(u.get('fields', [])) for u in universities])
+        
+        return UniversityColumns(
+            model_features=model_features,
+            total_cost=tuition_fee + living_cost,
+            annual_cost=self._calculate_annual_costs_batch(universities),
+            ranking_score=self._calculate_ranking_score_batch(ranking),
+            complete=np.array([
+                all(key in u for key in ('id', 'name', 'country', 'city')) for u in universities
+            ], dtype=bool),
+            country_ids=self.country_resolver.country_ids(u.get('country', '') for u in universities),
+            field_set_codes=field_set_codes,
+            field_sets=field_sets
+        )
+    
+    def _calculate_scores_batch(self, user_profile: Dict, universities: List[Dict],
+                                columns: UniversityColumns,
+                                admission: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+        """
+        Calculate every scoring component for all universities as arrays
+        
+        Keys and values match _calculate_scores, one array element per university.
+        """
+        n = len(universities)
+        scores = {}
+        
+        # 1. Admission Probability Score (single model call unless precomputed)
+        try:
+            prediction = admission or self._predict_admission_batch(
+                user_profile, universities, columns.model_features
+            )
+            scores['admission_probability'] = prediction['admission_probability']
+            scores['admission_confidence'] = prediction['confidence']
+            scores['admission_category'] = prediction['probability_category']
+        except Exception as e:
+            print(f"Error predicting admission probability: {str(e)}")
+            scores['admission_probability'] = np.full(n, 0.5)
+            scores['admission_confidence'] = np.full(n, 0.5)
+            scores['admission_category'] = np.full(n, 'Moderate', dtype=object)
+        
+        # 2. Cost Fit Score
+        scores['cost_fit'] = self._calculate_cost_fit_batch(user_profile, columns.total_cost)
+        
+        # 3. Field Match Score
+        scores['field_match'] = self._calculate_field_match_batch(user_profile, columns)
+        
+        # 4. Country Preference Score
+        scores['country_preference'] = self._calculate_country_preference_batch(user_profile, columns)
+        
+        # 5. Ranking Score (student independent)
+        scores['ranking'] = columns.ranking_score
+        
+        return scores
+    
+    def _predict_admission_batch(self, user_profile: Dict, universities: List[Dict],
+                                 model_features: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        predict_batch for the universities whose requirements can be scored
+        
+        Rows with non-numeric requirements get the same neutral prediction
+        _calculate_scores falls back to, without affecting the other rows.
+        Errors on the student side still fail the whole batch.
+        """
+        if model_features is None:
+            model_features = self.predictor.build_university_features(universities)
+        
+        scorable = np.isfinite(model_features).all(axis=1)
+        if scorable.all():
+            return self.predictor.predict_batch(user_profile, universities, model_features)
+        
+        rows = np.flatnonzero(scorable)
+        prediction = self.predictor.predict_batch(
+            user_profile, [universities[i] for i in rows.tolist()], model_features[rows]
+        )
+        for i in np.flatnonzero(~scorable).tolist():
+            print(f"Error predicting admission probability for {universities[i].get('name', 'Unknown')}: "
+                  f"missing or non-numeric requirements")
+        
+        n = len(universities)
+        result = {
+            'admission_probability': np.full(n, 0.5),
+            'confidence': np.full(n, 0.5),
+            'probability_category': np.full(n, 'Moderate', dtype=object)
+        }
+        for key, values in result.items():
+            values[rows] = prediction[key]
+        return result
+    
+    def _calculate_cost_fit_batch(self, user_profile: Dict, total_cost: np.ndarray) -> np.ndarray:
+        """
+        Vectorized version of _calculate_cost_fit over tuition_fee + living_cost
+        """
+        budget_min = user_profile.get('budget_min', 0)
+        budget_max = user_profile.get('budget_max', 100000)
+        
+        if budget_max <= 0:
+            return np.full(len(total_cost), 0.5)
+        
+        # Every branch is evaluated for every row; only the selected one is kept
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fit_ratio = 1.0 - ((total_cost - budget_min) / (budget_max - budget_min))
+            within_budget = np.maximum(0.3, fit_ratio)
+            
+            over_budget_ratio = (total_cost - budget_max) / budget_max
+            penalty = np.minimum(0.7, over_budget_ratio)
+            over_budget = np.maximum(0.0, 0.3 - penalty)
+        
+        return np.select(
+            [total_cost <= budget_min, total_cost <= budget_max],
+            [1.0, within_budget],
+            over_budget
+        )
+    
+    def _calculate_field_match_batch(self, user_profile: Dict, columns: UniversityColumns) -> np.ndarray:
+        """
+        Field match scores for all universities
+        
+        Match tiers come from the catalog's field index (one pass over the
+        distinct field names) and are broadcast by field-set code.
+        """
+        user_field = user_profile.get('field_of_study', '').lower().strip()
+        return columns.field_index.match_scores(user_field)[columns.field_set_codes]
+    
+    def _calculate_country_preference_batch(self, user_profile: Dict, columns: UniversityColumns) -> np.ndarray:
+        """
+        Country preference scores for all universities
+        
+        A membership test of the canonical country ids against the resolved
+        preference.
+        """
+        preferred_ids = self.country_resolver.preference_ids(user_profile.get('preferred_countries', ''))
+        
+        if preferred_ids is None:
+            return np.full(len(columns), 0.5)
+        
+        return np.where(self._preferred_country_mask(preferred_ids, columns.country_ids), 1.0, 0.1)
+    
+    def _calculate_ranking_score_batch(self, ranking: np.ndarray) -> np.ndarray:
+        """
+        Vectorized version of _calculate_ranking_score
+        """
+        return np.select(
+            [ranking <= 0, ranking <= 10, ranking <= 50, ranking <= 100, ranking <= 200, ranking <= 500],
+            [0.5, 1.0, 0.8, 0.6, 0.4, 0.2],
+            0.1
+        )
     
     def _calculate_scores(self, user_profile: Dict, university: Dict) -> Dict:
         """
@@ -174,99 +589,41 @@ class RecommendationEngine:
         """
         Filter universities by preferred countries if specified
         """
-        preferred_countries = user_profile.get('preferred_countries', '')
-        
-        if not preferred_countries or not preferred_countries.strip():
-            return universities  # No filter, return all
-        
-        # Parse preferred countries (assuming comma-separated string)
-        if isinstance(preferred_countries, str):
-            preferred_list = [country.strip().lower() for country in preferred_countries.split(',') if country.strip()]
-        else:
-            preferred_list = [str(preferred_countries).lower()]
-        
-        if not preferred_list:
+        country_ids = self.country_resolver.country_ids(u.get('country', '') for u in universities)
+        mask = self._country_filter_mask(user_profile, country_ids)
+        if mask is None:
             return universities
         
-        # Filter universities
-        filtered = []
-        for university in universities:
-            university_country = university.get('country', '').lower()
-            
-            # Check for exact or partial match
-            for pref_country in preferred_list:
-                if (pref_country in university_country or 
-                    university_country in pref_country or
-                    self._country_code_match(pref_country, university_country)):
-                    filtered.append(university)
-                    break
-        
-        return filtered if filtered else universities  # Return all if no matches found
-    
-    def _country_code_match(self, pref: str, country: str) -> bool:
-        """
-        Match country codes and common abbreviations
-        """
-        country_mappings = {
-            'us': ['usa', 'united states', 'america'],
-            'usa': ['us', 'united states', 'america'],
-            'uk': ['united kingdom', 'britain', 'england'],
-            'ca': ['canada'],
-            'au': ['australia'],
-            'de': ['germany', 'deutschland'],
-            'fr': ['france'],
-            'in': ['india'],
-            'cn': ['china'],
-            'jp': ['japan'],
-            'sg': ['singapore'],
-            'nz': ['new zealand'],
-            'nl': ['netherlands', 'holland'],
-            'se': ['sweden'],
-            'ch': ['switzerland'],
-            'it': ['italy'],
-            'es': ['spain'],
-            'kr': ['south korea', 'korea']
-        }
-        
-        # Check if preference matches any mapping
-        if pref in country_mappings:
-            return country in country_mappings[pref]
+        return [university for university, keep in zip(universities, mask.tolist()) if keep]
+    
+    def _country_filter_mask(self, user_profile: Dict, country_ids: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Rows in a preferred country, or None to keep every row
         
-        # Check reverse - if country is a code
-        if country in country_mappings:
-            return pref in country_mappings[country]
+        No filter applies when no preference is given or none of the rows match.
+        """
+        preferred_ids = self.country_resolver.preference_ids(user_profile.get('preferred_countries', ''))
+        if not preferred_ids:
+            return None
         
-        return False
+        mask = self._preferred_country_mask(preferred_ids, country_ids)
+        return mask if mask.any() else None
+    
+    def _preferred_country_mask(self, preferred_ids, country_ids: np.ndarray) -> np.ndarray:
+        return np.isin(country_ids, np.fromiter(preferred_ids, dtype=np.int32, count=len(preferred_ids)))
     
     def _calculate_country_preference(self, user_profile: Dict, university: Dict) -> float:
         """
         Calculate country preference match score
         """
-        preferred_countries = user_profile.get('preferred_countries', '')
-        university_country = university.get('country', '')
+        preferred_ids = self.country_resolver.preference_ids(user_profile.get('preferred_countries', ''))
         
-        if not preferred_countries:
+        if preferred_ids is None:
             return 0.5  # No preference specified, neutral score
         
-        # Parse preferred countries (assuming comma-separated string)
-        if isinstance(preferred_countries, str):
-            preferred_list = [country.strip().lower() for country in preferred_countries.split(',')]
-        else:
-            preferred_list = [str(preferred_countries).lower()]
-        
-        university_country_lower = university_country.lower()
-        
-        # Check for exact match
-        if university_country_lower in preferred_list:
+        if self.country_resolver.country_id(university.get('country', '')) in preferred_ids:
             return 1.0
         
-        # Check for partial matches (e.g., "US" matches "USA")
-        for pref_country in preferred_list:
-            if (pref_country in university_country_lower or 
-                university_country_lower in pref_country or
-                self._country_code_match(pref_country, university_country_lower)):
-                return 1.0
-        
         return 0.1  # No match
     
     def _calculate_ranking_score(self, university: Dict) -> float:
@@ -304,6 +661,19 @@ class RecommendationEngine:
         
         return min(1.0, max(0.0, overall_score))
     
+    def _calculate_overall_scores_batch(self, score_columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Vectorized version of _calculate_overall_score (already rounded)
+        """
+        n = len(next(iter(score_columns.values()))) if score_columns else 0
+        overall_scores = np.zeros(n)
+        
+        for component, weight in self.weight_config.items():
+            if component in score_columns:
+                overall_scores = overall_scores + score_columns[component] * weight
+        
+        return np.round(np.clip(overall_scores, 0.0, 1.0), 3)
+    
     def _generate_cost_breakdown(self, user_profile: Dict, university: Dict) -> Dict:
         """
         Generate comprehensive cost breakdown with multiple currency support and analysis
@@ -402,6 +772,21 @@ class RecommendationEngine:
             }
         }
     
+    def _calculate_annual_costs_batch(self, universities: List[Dict]) -> np.ndarray:
+        """
+        Unrounded total_annual_cost of _generate_cost_breakdown for every university
+        """
+        tuition_fee = np.array([u.get('tuition_fee', 0) for u in universities], dtype=float)
+        living_cost = np.array([u.get('living_cost', 0) for u in universities], dtype=float)
+        other_fees = np.array([u.get('other_fees', 0) for u in universities], dtype=float)
+        health_insurance = np.array(
+            [2000 if u.get('country') == 'USA' else 1000 for u in universities], dtype=float
+        )
+        
+        # Same terms, same order of addition as the per-university breakdown
+        return (tuition_fee + living_cost + other_fees +
+                tuition_fee * 0.02 + living_cost * 0.15 + health_insurance)
+    
     def _get_currency_symbol(self, currency_code: str) -> str:
         """Get currency symbol for display"""
         symbols = {
@@ -475,11 +860,27 @@ class RecommendationEngine:
         
         return scholarships[:4]  # Limit to top 4 most relevant
     
-    def _calculate_cost_percentiles(self, recommendations: List[Dict]) -> None:
-        """Calculate cost percentiles for all recommendations"""
+    def _calculate_cost_percentiles(self, recommendations: List[Dict],
+                                    all_costs: Optional[List[float]] = None) -> None:
+        """
+        Calculate cost percentiles for all recommendations
+        
+        Costs are ranked against all_costs when given (every scored candidate),
+        otherwise against the recommendations themselves.
+        """
         if not recommendations:
             return
         
+        if all_costs is not None:
+            sorted_costs = np.sort(np.asarray(all_costs, dtype=float))
+            for rec in recommendations:
+                cost = rec['cost_breakdown']['total_annual_cost']
+                # Position of the first equal cost, as costs.index() would give
+                rank = int(np.searchsorted(sorted_costs, cost, side='left'))
+                percentile = (rank + 1) / len(sorted_costs) * 100
+                rec['cost_breakdown']['cost_efficiency']['total_cost_percentile'] = round(percentile, 1)
+            return
+        
         # Extract all costs
         costs = [rec['cost_breakdown']['total_annual_cost'] for rec in recommendations]
         costs.sort()
@@ -0,0 +1,81 @@
+"""
+University Column Store
+
+This module holds the student-independent parts of recommendation scoring in
+column-oriented arrays, one element per university. Columns are built once per
+catalog load; a request only adds the student-side values on top of them.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .field_index import FieldMatchIndex
+
+
+class UniversityColumns:
+    """
+    Precomputed per-university columns with integer-coded countries and fields
+    """
+    
+    def __init__(self, model_features: Optional[np.ndarray], total_cost: np.ndarray,
+                 annual_cost: np.ndarray, ranking_score: np.ndarray, complete: np.ndarray,
+                 country_ids: np.ndarray,
+                 field_set_codes: np.ndarray, field_sets: List[tuple],
+                 field_index: Optional[FieldMatchIndex] = None):
+        # Admission model inputs (AdmissionPredictor.build_university_features),
+        # None when the catalog has non-numeric requirements
+        self.model_features = model_features
+        self.total_cost = total_cost            # tuition_fee + living_cost
+        self.annual_cost = annual_cost          # unrounded total_annual_cost of the cost breakdown
+        self.ranking_score = ranking_score
+        self.complete = complete                # has id, name, country and city
+        
+        # Canonical country ids (see CountryResolver); field_set_codes[i] indexes field_sets
+        self.country_ids = country_ids
+        self.field_set_codes = field_set_codes
+        self.field_sets = field_sets
+        self.field_index = field_index or FieldMatchIndex(field_sets)
+    
+    def __len__(self) -> int:
+        return len(self.country_ids)
+    
+    def take(self, rows: np.ndarray) -> 'UniversityColumns':
+        """
+        Columns for a subset of rows; the code tables are shared
+        """
+        return UniversityColumns(
+            model_features=self.model_features[rows] if self.model_features is not None else None,
+            total_cost=self.total_cost[rows],
+            annual_cost=self.annual_cost[rows],
+            ranking_score=self.ranking_score[rows],
+            complete=self.complete[rows],
+            country_ids=self.country_ids[rows],
+            field_set_codes=self.field_set_codes[rows],
+            field_sets=self.field_sets,
+            field_index=self.field_index
+        )
+    
+    def nbytes(self) -> int:
+        arrays = [self.total_cost, self.annual_cost, self.ranking_score, self.complete,
+                  self.country_ids, self.field_set_codes]
+        if self.model_features is not None:
+            arrays.append(self.model_features)
+        return int(sum(array.nbytes for array in arrays))
+
+
+def encode_column(values: List) -> tuple:
+    """
+    Integer-code a list of hashable values
+    
+    Returns:
+        Tuple of (int32 codes, list of distinct values in first-seen order)
+    """
+    lookup: Dict = {}
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(lookup)
+        codes[i] = code
+    return codes, list(lookup)
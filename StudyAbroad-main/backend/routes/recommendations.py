@@ -6,7 +6,9 @@ This module provides Flask routes for university recommendations and admission p
 
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+import hmac
 import json
+import os
 from datetime import datetime
 from typing import Dict, List, Optional
 
@@ -282,6 +284,86 @@ def generate_recommendations():
         }), 500
 
 
+@recommendations_bp.route('/generate/batch', methods=['POST'])
+@jwt_required()
+def generate_recommendations_batch():
+    """
+    Generate recommendations for a cohort of students in one call
+    
+    Expected JSON payload:
+    {
+        "profiles": [  // One user profile per student
+            {"cgpa": 3.5, "gre_score": 320, "field_of_study": "Computer Science"},
+            {"cgpa": 3.8, "ielts_score": 7.5, "preferred_countries": "UK,CA"}
+        ],
+        "max_recommendations": 10,  // Optional, default 10, per profile
+        "filters": {}  // Optional, same as /generate, applied to every profile
+    }
+    """
+    try:
+        data = request.get_json() or {}
+        
+        profiles = data.get('profiles')
+        max_recommendations = data.get('max_recommendations', 10)
+        filters = data.get('filters', {})
+        max_profiles = int(os.getenv('MAX_BATCH_PROFILES', '1000'))
+        
+        if not isinstance(profiles, list) or not profiles:
+            return jsonify({
+                'error': 'profiles must be a non-empty list'
+            }), 400
+        
+        if len(profiles) > max_profiles:
+            return jsonify({
+                'error': f'At most {max_profiles} profiles can be scored per request'
+            }), 400
+        
+        if not isinstance(max_recommendations, int) or max_recommendations < 1 or max_recommendations > 50:
+            return jsonify({
+                'error': 'max_recommendations must be an integer between 1 and 50'
+            }), 400
+        
+        # Validate every profile before scoring any of them
+        invalid_profiles = []
+        for index, user_profile in enumerate(profiles):
+            if not isinstance(user_profile, dict):
+                invalid_profiles.append({'index': index, 'details': ['Profile must be an object']})
+                continue
+            validation_result = validate_user_profile_data(user_profile)
+            if not validation_result['valid']:
+                invalid_profiles.append({'index': index, 'details': validation_result['errors']})
+        
+        if invalid_profiles:
+            return jsonify({
+                'error': 'Invalid profile data',
+                'invalid_profiles': invalid_profiles
+            }), 400
+        
+        results = ml_service.generate_recommendations_batch(profiles, filters, max_recommendations)
+        
+        return jsonify({
+            'success': True,
+            'results': [
+                {
+                    'index': index,
+                    'recommendations': result['recommendations'],
+                    'summary': result['summary'],
+                    'total_universities_considered': result.get('total_universities_considered', 0),
+                    **({'error': result['error']} if 'error' in result else {})
+                }
+                for index, result in enumerate(results)
+            ],
+            'total_profiles': len(profiles),
+            'filters_applied': filters
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'error': 'Batch recommendation generation failed',
+            'message': str(e)
+        }), 500
+
+
 @recommendations_bp.route('/explain/<int:university_id>', methods=['POST'])
 @jwt_required()
 def explain_recommendation(university_id: int):
@@ -363,6 +445,37 @@ def get_model_info():
         }), 500
 
 
+@recommendations_bp.route('/catalog/reload', methods=['POST'])
+@jwt_required()
+def reload_catalog():
+    """
+    Reload the universities catalog without restarting the workers
+    
+    Requires the X-Admin-Key header to match ADMIN_API_KEY.
+    """
+    admin_key = os.getenv('ADMIN_API_KEY')
+    provided_key = request.headers.get('X-Admin-Key', '')
+    if not admin_key or not hmac.compare_digest(provided_key.encode(), admin_key.encode()):
+        return jsonify({
+            'error': 'Forbidden',
+            'message': 'Admin key required'
+        }), 403
+    
+    try:
+        catalog_info = ml_service.reload_catalog()
+        
+        return jsonify({
+            'success': True,
+            'catalog': catalog_info
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'error': 'Catalog reload failed',
+            'message': str(e)
+        }), 500
+
+
 @recommendations_bp.route('/cost-analysis', methods=['POST'])
 @jwt_required()
 def get_cost_analysis():
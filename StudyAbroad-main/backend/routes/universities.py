@@ -176,7 +176,7 @@ def search_universities():
     Search and filter universities with advanced filtering options
     
     Query Parameters:
-    - q: Search query (university name or city)
+    - q: Search query (word prefixes of name, city, country or fields; "quoted phrase")
     - country: Country code(s) (comma-separated)
     - field: Field(s) of study (comma-separated)
     - min_tuition, max_tuition: Tuition fee range
@@ -187,7 +187,7 @@ def search_universities():
     - type: University type (Public/Private)
     - min_ranking, max_ranking: Ranking range
     - min_acceptance_rate, max_acceptance_rate: Acceptance rate range
-    - sort_by: Sort field (ranking, tuition_fee, acceptance_rate, name)
+    - sort_by: Sort field (ranking, tuition_fee, acceptance_rate, name, or relevance to keep search order)
     - sort_order: Sort order (asc, desc)
     - page: Page number (default: 1)
     - per_page: Results per page (default: 20, max: 100)
@@ -359,10 +359,18 @@ def get_statistics():
 
 @universities_bp.route('/search/suggestions', methods=['GET'])
 def get_search_suggestions():
-    """Get search suggestions based on partial query"""
+    """
+    Get search suggestions based on partial query
+    
+    Query Parameters:
+    - q: Text typed so far (matches the start of name and city words)
+    - limit: Maximum suggestions (default: 10, max: 20)
+    - fuzzy: Also suggest universities a few typos away (true/false)
+    """
     try:
         query = request.args.get('q', '').strip().lower()
         limit = min(int(request.args.get('limit', 10)), 20)  # Max 20 suggestions
+        typo_tolerant = request.args.get('fuzzy', 'false').lower() == 'true'
         
         if not query or len(query) < 2:
             return jsonify({
@@ -370,24 +378,16 @@ def get_search_suggestions():
                 'data': []
             }), 200
         
-        universities = university_service.load_universities()
-        suggestions = []
-        
-        for university in universities:
-            name = university.get('name', '').lower()
-            city = university.get('city', '').lower()
-            
-            if query in name or query in city:
-                suggestions.append({
-                    'id': university.get('id'),
-                    'name': university.get('name'),
-                    'city': university.get('city'),
-                    'country': university.get('country'),
-                    'type': 'university'
-                })
-                
-                if len(suggestions) >= limit:
-                    break
+        suggestions = [
+            {
+                'id': university.get('id'),
+                'name': university.get('name'),
+                'city': university.get('city'),
+                'country': university.get('country'),
+                'type': 'university'
+            }
+            for university in university_service.suggest_universities(query, limit, typo_tolerant)
+        ]
         
         return jsonify({
             'success': True,
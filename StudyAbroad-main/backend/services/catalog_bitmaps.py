@@ -0,0 +1,177 @@
+"""
+Catalog Bitmaps
+
+This module holds one bitmap per categorical value of the universities catalog
+(each country value, field of study and university type), so the country,
+field and type filters become ORs and ANDs of a few bitmaps instead of list
+checks per university. Two representations are available: NumPy boolean
+arrays (one byte per university, fastest to combine and probe) and Python
+ints used as bitsets (one bit per university, eight times smaller for
+catalogs with many fields), selected with CATALOG_BITMAP_BACKEND.
+"""
+
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+def _count_ones(bitmap: int) -> int:
+    """
+    Population count for Pythons before 3.10, which lack int.bit_count()
+    """
+    return bin(bitmap).count('1')
+
+
+_bit_count = getattr(int, 'bit_count', _count_ones)
+
+
+class NumpyBitmaps:
+    """
+    Bitmaps as NumPy boolean arrays
+    """
+    
+    name = 'numpy'
+    
+    def __init__(self, size: int):
+        self.size = size
+    
+    def empty(self) -> np.ndarray:
+        return np.zeros(self.size, dtype=bool)
+    
+    def from_rows(self, rows: np.ndarray) -> np.ndarray:
+        bitmap = np.zeros(self.size, dtype=bool)
+        bitmap[rows] = True
+        return bitmap
+    
+    def and_(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return a & b
+    
+    def or_(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return a | b
+    
+    def count(self, bitmap: np.ndarray) -> int:
+        return int(np.count_nonzero(bitmap))
+    
+    def rows(self, bitmap: np.ndarray) -> np.ndarray:
+        return np.flatnonzero(bitmap)
+    
+    def contains(self, bitmap: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """
+        Boolean mask of the given rows that are set in bitmap
+        """
+        return bitmap[rows]
+    
+    def nbytes(self, bitmap: np.ndarray) -> int:
+        return bitmap.nbytes
+
+
+class IntBitmaps:
+    """
+    Bitmaps as Python ints, bit i standing for row i
+    
+    AND, OR and population counts run on the ints alone; conversion to and
+    from row arrays goes through a packed byte string.
+    """
+    
+    name = 'int'
+    
+    def __init__(self, size: int):
+        self.size = size
+        self._n_bytes = (size + 7) // 8
+    
+    def empty(self) -> int:
+        return 0
+    
+    def from_rows(self, rows: np.ndarray) -> int:
+        bits = np.zeros(self._n_bytes * 8, dtype=bool)
+        bits[rows] = True
+        return int.from_bytes(np.packbits(bits, bitorder='little').tobytes(), 'little')
+    
+    def and_(self, a: int, b: int) -> int:
+        return a & b
+    
+    def or_(self, a: int, b: int) -> int:
+        return a | b
+    
+    def count(self, bitmap: int) -> int:
+        return _bit_count(bitmap)
+    
+    def _bits(self, bitmap: int) -> np.ndarray:
+        packed = np.frombuffer(bitmap.to_bytes(self._n_bytes, 'little'), dtype=np.uint8)
+        return np.unpackbits(packed, bitorder='little')[:self.size].view(bool)
+    
+    def rows(self, bitmap: int) -> np.ndarray:
+        return np.flatnonzero(self._bits(bitmap)) if bitmap else np.empty(0, dtype=np.int64)
+    
+    def contains(self, bitmap: int, rows: np.ndarray) -> np.ndarray:
+        """
+        Boolean mask of the given rows that are set in bitmap
+        """
+        return self._bits(bitmap)[rows]
+    
+    def nbytes(self, bitmap: int) -> int:
+        return (bitmap.bit_length() + 7) // 8
+
+
+BITMAP_BACKENDS = {'numpy': NumpyBitmaps, 'int': IntBitmaps}
+
+
+def create_bitmaps(size: int, backend: Optional[str] = None):
+    """
+    Bitmap operations for a catalog of size rows
+    
+    Args:
+        size: Number of universities
+        backend: 'numpy' or 'int' (defaults to CATALOG_BITMAP_BACKEND, then 'numpy')
+    """
+    backend = backend or os.getenv('CATALOG_BITMAP_BACKEND', 'numpy')
+    if backend not in BITMAP_BACKENDS:
+        print(f"Unknown catalog bitmap backend '{backend}', using numpy")
+        backend = 'numpy'
+    return BITMAP_BACKENDS[backend](size)
+
+
+def group_rows(codes: np.ndarray, n_codes: int) -> List[np.ndarray]:
+    """
+    Row ids for each code, in row order (negative codes are dropped)
+    """
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(n_codes + 1))
+    return [order[bounds[code]:bounds[code + 1]] for code in range(n_codes)]
+
+
+class BitmapIndex:
+    """
+    One bitmap per value of a categorical column, with its population count
+    """
+    
+    def __init__(self, bitmaps, rows_by_value: Dict[Any, np.ndarray]):
+        """
+        Args:
+            bitmaps: NumpyBitmaps or IntBitmaps for the catalog size
+            rows_by_value: Rows holding each value
+        """
+        self.bitmaps = bitmaps
+        self.index = {value: bitmaps.from_rows(rows) for value, rows in rows_by_value.items()}
+        self.counts = {value: len(rows) for value, rows in rows_by_value.items()}
+    
+    def __len__(self) -> int:
+        return len(self.index)
+    
+    def any_of(self, values: Iterable) -> Any:
+        """
+        OR of the bitmaps of values; values not in the index contribute nothing
+        
+        Raises:
+            TypeError: If a value is unhashable
+        """
+        result = None
+        for value in values:
+            bitmap = self.index.get(value)
+            if bitmap is not None:
+                result = bitmap if result is None else self.bitmaps.or_(result, bitmap)
+        return self.bitmaps.empty() if result is None else result
+    
+    def nbytes(self) -> int:
+        return int(sum(self.bitmaps.nbytes(bitmap) for bitmap in self.index.values()))
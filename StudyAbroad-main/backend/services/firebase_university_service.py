@@ -5,8 +5,12 @@ Simple service that connects to Firebase for the website
 import firebase_admin
 from firebase_admin import credentials, firestore
 import os
+import threading
+import time
 from typing import List, Dict, Any, Optional
 
+from services.university_catalog import UniversityCatalog
+
 class FirebaseUniversityService:
     """Service class for Firebase university operations"""
     
@@ -23,29 +27,53 @@ class FirebaseUniversityService:
                     raise Exception("Firebase service account file not found")
             
             self.db = firestore.client()
+            
+            # Filtering and search run on a columnar copy of the collection,
+            # re-streamed once it is older than UNIVERSITY_CATALOG_TTL seconds
+            self.catalog_ttl = float(os.getenv('UNIVERSITY_CATALOG_TTL', '60'))
+            self._catalog = None
+            self._catalog_loaded_at = 0.0
+            self._catalog_lock = threading.Lock()
             print("✅ Firebase University Service initialized")
             
         except Exception as e:
             print(f"❌ Firebase initialization failed: {e}")
             raise
     
+    def _stream_universities(self) -> List[Dict[str, Any]]:
+        """Read the whole universities collection"""
+        universities_ref = self.db.collection('universities')
+        docs = universities_ref.stream()
+        
+        universities = []
+        for doc in docs:
+            university = doc.to_dict()
+            university['id'] = int(doc.id) if doc.id.isdigit() else doc.id
+            universities.append(university)
+        
+        return universities
+    
     def load_universities(self) -> List[Dict[str, Any]]:
         """Load all universities from Firebase"""
         try:
-            universities_ref = self.db.collection('universities')
-            docs = universities_ref.stream()
-            
-            universities = []
-            for doc in docs:
-                university = doc.to_dict()
-                university['id'] = int(doc.id) if doc.id.isdigit() else doc.id
-                universities.append(university)
-            
-            return universities
+            return self._stream_universities()
         except Exception as e:
             print(f"Error loading universities: {e}")
             return []
     
+    def get_catalog(self) -> UniversityCatalog:
+        """Columnar catalog of the universities collection, re-streamed after catalog_ttl seconds"""
+        catalog = self._catalog
+        if catalog is not None and time.time() - self._catalog_loaded_at < self.catalog_ttl:
+            return catalog
+        
+        with self._catalog_lock:
+            if self._catalog is not catalog:
+                return self._catalog
+            self._catalog = UniversityCatalog(self._stream_universities(), previous=self._catalog)
+            self._catalog_loaded_at = time.time()
+            return self._catalog
+    
     def load_countries(self) -> List[Dict[str, str]]:
         """Load all countries from Firebase"""
         try:
@@ -96,30 +124,25 @@ class FirebaseUniversityService:
     def filter_universities(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Filter universities based on criteria"""
         try:
-            # Start with base query
-            query = self.db.collection('universities')
+            catalog = self.get_catalog()
             
-            # Apply Firebase-compatible filters
-            if 'country' in filters:
-                countries = filters['country']
-                if isinstance(countries, str):
-                    countries = [countries]
-                if countries and len(countries) <= 10:  # Firestore 'in' limit
-                    query = query.where('country', 'in', countries)
+            # Country matches exactly, as Firestore's 'in' query does; an empty
+            # list applies no country filter
+            countries = filters.get('country')
+            if isinstance(countries, str):
+                countries = [countries]
+            indexed_filters = {key: value for key, value in filters.items() if key != 'country'}
+            if countries:
+                indexed_filters['country'] = countries
             
-            # Get results and apply additional filters
-            docs = query.stream()
-            universities = []
+            rows = catalog.filter_rows(indexed_filters, country_match=lambda country, wanted: country in wanted)
+            if rows is None:
+                # Some filtered column holds values only the per-university check handles
+                return [university for university in catalog.universities
+                        if (not countries or university.get('country') in countries)
+                        and self._matches_filters(university, filters)]
             
-            for doc in docs:
-                university = doc.to_dict()
-                university['id'] = int(doc.id) if doc.id.isdigit() else doc.id
-                
-                # Apply additional filters that can't be done in Firestore
-                if self._matches_filters(university, filters):
-                    universities.append(university)
-            
-            return universities
+            return catalog.take(rows)
             
         except Exception as e:
             print(f"Error filtering universities: {e}")
@@ -238,16 +261,18 @@ class FirebaseUniversityService:
         return True
     
     def search_universities(self, query: str) -> List[Dict[str, Any]]:
-        """Search universities by name or other fields"""
+        """Search universities by name, city, country or field of study"""
         try:
-            # Get all universities and filter client-side
-            # Note: Firestore doesn't support full-text search natively
-            all_universities = self.load_universities()
+            # Firestore has no full-text search; query the cached catalog's index
+            catalog = self.get_catalog()
+            rows = catalog.search_rows(query)
+            if rows is not None:
+                return catalog.take(rows)
             
             query_lower = query.lower()
             matching_universities = []
             
-            for university in all_universities:
+            for university in catalog.universities:
                 # Search in name, city, country, and fields
                 searchable_text = ' '.join([
                     university.get('name', ''),
@@ -265,6 +290,15 @@ class FirebaseUniversityService:
             print(f"Error searching universities: {e}")
             return []
     
+    def suggest_universities(self, query: str, limit: int = 10,
+                             typo_tolerant: bool = False) -> List[Dict[str, Any]]:
+        """Autocomplete universities by name or city from the cached catalog"""
+        try:
+            return self.get_catalog().suggest(query, limit, typo_tolerant)
+        except Exception as e:
+            print(f"Error getting search suggestions: {e}")
+            return []
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Get database statistics"""
         try:
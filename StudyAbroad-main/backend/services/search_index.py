@@ -0,0 +1,300 @@
+"""
+University Full-Text Search
+
+This module keeps a positional inverted index over the searchable text of the
+universities (name, city, country and fields of study), so a search reads a
+few posting lists instead of building and scanning a string per university:
+
+- plain words match every indexed word they start ("tech" finds
+  "Technology"), and all of them have to match;
+- "quoted words" have to appear next to each other, in order;
+- matches are ranked with BM25.
+
+Documents are added, replaced and removed one at a time, so a catalog reload
+only re-indexes the universities whose text changed. A reload works on a
+copy-on-write copy of the previous index: posting lists of untouched terms are
+shared, and the index a published catalog uses is never modified.
+"""
+
+import bisect
+import math
+import re
+import threading
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+TOKEN_PATTERN = re.compile(r'\w+')
+QUERY_PATTERN = re.compile(r'"([^"]*)"?|([^"\s]+)')
+
+# Searchable fields, in the order their words are numbered
+SEARCH_FIELDS = ('name', 'city', 'country', 'fields')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased words of text
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def parse_query(query: str) -> List[Tuple[str, List[str]]]:
+    """
+    Split a query into ('phrase', words) and ('prefix', [word]) clauses
+    """
+    clauses = []
+    for match in QUERY_PATTERN.finditer(query):
+        phrase, words = match.groups()
+        if phrase is not None:
+            terms = tokenize(phrase)
+            if terms:
+                clauses.append(('phrase', terms))
+        else:
+            clauses.extend(('prefix', [term]) for term in tokenize(words))
+    return clauses
+
+
+class SearchIndex:
+    """
+    Positional inverted index with BM25 ranking
+    
+    Documents are dictionaries of field name -> text, keyed by any hashable
+    id. All methods are thread-safe.
+    """
+    
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """
+        Args:
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[Hashable, List[int]]] = {}   # term -> doc -> positions
+        self._terms: List[str] = []                                 # sorted, for prefix lookups
+        self._documents: Dict[Hashable, Dict[str, str]] = {}
+        self._lengths: Dict[Hashable, int] = {}
+        self._spans: Dict[Hashable, Dict[str, Tuple[int, int]]] = {}  # doc -> field -> word positions
+        self._total_length = 0
+        # Terms whose posting dictionaries this index may modify; the others
+        # are shared with indexes copied from or to this one
+        self._owned = set()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._documents)
+    
+    def document(self, key: Hashable) -> Optional[Dict[str, str]]:
+        """
+        Fields a document was indexed with, or None
+        """
+        return self._documents.get(key)
+    
+    def add(self, key: Hashable, fields: Dict[str, str]) -> None:
+        """
+        Index a document, replacing any document with the same key
+        """
+        with self._lock:
+            self._add(key, fields)
+    
+    def remove(self, key: Hashable) -> bool:
+        """
+        Drop a document from the index
+        
+        Returns:
+            True if the document was indexed
+        """
+        with self._lock:
+            return self._remove(key)
+    
+    def copy(self) -> 'SearchIndex':
+        """
+        Copy of the index that shares posting lists until either side changes them
+        
+        Costs one dictionary copy per index structure, not per posting.
+        """
+        with self._lock:
+            index = SearchIndex(self.k1, self.b)
+            index._postings = dict(self._postings)
+            index._terms = list(self._terms)
+            index._documents = dict(self._documents)
+            index._lengths = dict(self._lengths)
+            index._spans = dict(self._spans)
+            index._total_length = self._total_length
+            # Every posting dictionary is shared now, so both sides copy before writing
+            self._owned = set()
+            return index
+    
+    def _writable_postings(self, term: str) -> Dict[Hashable, List[int]]:
+        # Caller holds the lock
+        if term not in self._owned:
+            self._postings[term] = dict(self._postings.get(term, {}))
+            self._owned.add(term)
+        return self._postings[term]
+    
+    def sync(self, documents: Dict[Hashable, Dict[str, str]]) -> Dict[str, int]:
+        """
+        Make the index hold exactly documents, re-indexing only what changed
+        
+        Returns:
+            Number of documents added, updated and removed
+        """
+        counts = {'added': 0, 'updated': 0, 'removed': 0}
+        with self._lock:
+            for key in [key for key in self._documents if key not in documents]:
+                self._remove(key)
+                counts['removed'] += 1
+            for key, fields in documents.items():
+                previous = self._documents.get(key)
+                if previous != fields:
+                    self._add(key, fields)
+                    counts['added' if previous is None else 'updated'] += 1
+        return counts
+    
+    def _add(self, key: Hashable, fields: Dict[str, str]) -> None:
+        # Caller holds the lock
+        self._remove(key)
+        position = 0
+        spans = {}
+        for field in SEARCH_FIELDS:
+            start = position
+            for term in tokenize(fields.get(field, '')):
+                if term not in self._postings:
+                    bisect.insort(self._terms, term)
+                postings = self._writable_postings(term)
+                postings.setdefault(key, []).append(position)
+                position += 1
+            spans[field] = (start, position)
+        
+        self._documents[key] = dict(fields)
+        self._lengths[key] = position
+        self._spans[key] = spans
+        self._total_length += position
+    
+    def _remove(self, key: Hashable) -> bool:
+        # Caller holds the lock
+        fields = self._documents.pop(key, None)
+        if fields is None:
+            return False
+        for term in set(term for field in SEARCH_FIELDS for term in tokenize(fields.get(field, ''))):
+            postings = self._writable_postings(term)
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+                self._owned.discard(term)
+                del self._terms[bisect.bisect_left(self._terms, term)]
+        self._total_length -= self._lengths.pop(key)
+        del self._spans[key]
+        return True
+    
+    def expand(self, prefix: str) -> List[str]:
+        """
+        Indexed terms starting with prefix, in sorted order
+        """
+        with self._lock:
+            return self._expand(prefix)
+    
+    def _expand(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self._terms, prefix)
+        stop = bisect.bisect_left(self._terms, prefix + '\U0010ffff', start)
+        return self._terms[start:stop]
+    
+    def search(self, query: str, fields: Optional[Iterable[str]] = None) -> Dict[Hashable, float]:
+        """
+        Documents matching every clause of query, with their BM25 scores
+        
+        Args:
+            query: Words (matched as prefixes) and "quoted phrases"
+            fields: Only match words in these fields (default: all)
+        
+        Returns:
+            Dictionary of document key -> score (empty when the query has no words)
+        """
+        clauses = parse_query(query)
+        if not clauses:
+            return {}
+        
+        fields = tuple(fields) if fields is not None else None
+        with self._lock:
+            scores: Optional[Dict[Hashable, float]] = None
+            # Phrases first (usually the most selective), so later clauses only score survivors
+            for kind, terms in sorted(clauses, key=lambda clause: clause[0] != 'phrase'):
+                if kind == 'phrase':
+                    clause_scores = self._phrase_scores(terms, fields, scores)
+                else:
+                    clause_scores = self._prefix_scores(terms[0], fields, scores)
+                if scores is None:
+                    scores = clause_scores
+                else:
+                    scores = {key: score + clause_scores[key] for key, score in scores.items() if key in clause_scores}
+                if not scores:
+                    return {}
+            return scores
+    
+    def _positions(self, term: str, key: Hashable, fields: Optional[tuple]) -> List[int]:
+        positions = self._postings[term][key]
+        if fields is None:
+            return positions
+        spans = [self._spans[key][field] for field in fields if field in self._spans[key]]
+        return [position for position in positions if any(start <= position < stop for start, stop in spans)]
+    
+    def _idf(self, term: str) -> float:
+        document_count = len(self._documents)
+        df = len(self._postings[term])
+        return math.log(1 + (document_count - df + 0.5) / (df + 0.5))
+    
+    def _length_scale(self) -> float:
+        # b / average document length, so that BM25's norm is 1 - b + length * scale
+        return self.b * len(self._documents) / self._total_length if self._total_length else 0.0
+    
+    def _prefix_scores(self, prefix: str, fields: Optional[tuple],
+                       candidates: Optional[Dict]) -> Dict[Hashable, float]:
+        # A document scores with its best-scoring expansion of the prefix
+        scores: Dict[Hashable, float] = {}
+        k1, b, scale = self.k1, self.b, self._length_scale()
+        lengths = self._lengths
+        for term in self._expand(prefix):
+            weight = self._idf(term) * (k1 + 1)
+            postings = self._postings[term]
+            keys = postings if candidates is None else [key for key in candidates if key in postings]
+            for key in keys:
+                frequency = len(postings[key]) if fields is None else len(self._positions(term, key, fields))
+                if frequency:
+                    # BM25 (inlined: this loop runs once per matching document)
+                    score = weight * frequency / (frequency + k1 * (1 - b + lengths[key] * scale))
+                    if score > scores.get(key, -1.0):
+                        scores[key] = score
+        return scores
+    
+    def _phrase_scores(self, terms: List[str], fields: Optional[tuple],
+                       candidates: Optional[Dict]) -> Dict[Hashable, float]:
+        if any(term not in self._postings for term in terms):
+            return {}
+        first, *rest = [self._postings[term] for term in terms]
+        # Documents holding every word, intersected smallest posting list first
+        keys = candidates.keys() if candidates is not None else None
+        for postings in sorted([first] + rest, key=len):
+            keys = postings.keys() if keys is None else keys & postings.keys()
+        
+        scores: Dict[Hashable, float] = {}
+        k1, b, scale = self.k1, self.b, self._length_scale()
+        weight = sum(self._idf(term) for term in terms) * (k1 + 1)
+        for key in keys:
+            following = [postings[key] for postings in rest]
+            starts = first[key] if fields is None else self._positions(terms[0], key, fields)
+            matches = []
+            for start in starts:
+                offset = start
+                for positions in following:
+                    offset += 1
+                    if offset not in positions:
+                        break
+                else:
+                    matches.append(start)
+            if fields is not None:
+                spans = [self._spans[key][field] for field in fields if field in self._spans[key]]
+                matches = [start for start in matches
+                           if any(begin <= start and start + len(terms) <= end for begin, end in spans)]
+            if matches:
+                frequency = len(matches)
+                scores[key] = weight * frequency / (frequency + k1 * (1 - b + self._lengths[key] * scale))
+        return scores
@@ -0,0 +1,204 @@
+"""
+University Suggestions
+
+This module answers the autocomplete endpoint from a sorted array of
+normalized suggestion keys: every university name and city, and every tail
+of them that starts at a word ("institute of technology", "of technology",
+"technology"). The keys sharing a prefix are a contiguous slice of the
+array, so a prefix is two binary searches away. Prefixes shared by many keys
+have their best universities (by ranking) precomputed, and every other slice
+is short, so a lookup never touches more than a handful of entries.
+
+A typo-tolerant lookup walks the same array as an implicit trie, carrying a
+Levenshtein row per prefix and pruning branches that are already too far
+from the query.
+"""
+
+import bisect
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+NON_WORD_PATTERN = re.compile(r'[\W_]+')
+LAST_CHAR = '\U0010ffff'
+
+
+def normalize(text: str) -> str:
+    """
+    Lowercase text without accents, words separated by single spaces
+    """
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return NON_WORD_PATTERN.sub(' ', text).strip()
+
+
+def word_tails(text: str) -> List[str]:
+    """
+    Normalized text and each of its tails starting at a word
+    """
+    words = normalize(text).split(' ')
+    return [' '.join(words[start:]) for start in range(len(words)) if words[start]]
+
+
+class SuggestionIndex:
+    """
+    Sorted-array prefix index returning the best-ranked rows for a prefix
+    
+    Rows are numbered by the caller (catalog rows); order lists them from the
+    most to the least popular.
+    """
+    
+    def __init__(self, texts: Sequence[Iterable[str]], order: Sequence[int],
+                 top_size: int = 20, scan_limit: int = 32):
+        """
+        Args:
+            texts: Suggestible texts of each row (e.g. name and city)
+            order: Rows, most popular first
+            top_size: Largest limit a lookup can ask for
+            scan_limit: Prefixes matching more keys than this get their top
+                rows precomputed
+        """
+        self.top_size = top_size
+        self.scan_limit = scan_limit
+        self._rows = list(order)   # popularity position -> row
+        
+        # (key, popularity position) pairs, sorted by key
+        entries = sorted(set(
+            (key, position)
+            for position, row in enumerate(self._rows)
+            for text in texts[row]
+            for key in word_tails(text)
+        ))
+        self._keys = [key for key, _ in entries]
+        self._positions = [position for _, position in entries]
+        self._top: Dict[str, Tuple[int, ...]] = {}
+        self._precompute()
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def _precompute(self) -> None:
+        # Record the top rows of every prefix whose slice is too long to scan
+        pending = [('', 0, len(self._keys))]
+        while pending:
+            prefix, lo, hi = pending.pop()
+            if hi - lo <= self.scan_limit:
+                continue
+            self._top[prefix] = tuple(sorted(set(self._positions[lo:hi]))[:self.top_size])
+            pending.extend(self._children(prefix, lo, hi))
+    
+    def _children(self, prefix: str, lo: int, hi: int) -> List[Tuple[str, int, int]]:
+        """
+        (prefix + char, start, stop) for each char following prefix in keys[lo:hi]
+        """
+        keys = self._keys
+        depth = len(prefix)
+        children = []
+        # Keys equal to prefix sort first and have no child
+        if lo < hi and len(keys[lo]) == depth:
+            lo = bisect.bisect_right(keys, prefix, lo, hi)
+        while lo < hi:
+            child = prefix + keys[lo][depth]
+            stop = bisect.bisect_left(keys, child + LAST_CHAR, lo, hi)
+            children.append((child, lo, stop))
+            lo = stop
+        return children
+    
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        lo = bisect.bisect_left(self._keys, prefix)
+        return lo, bisect.bisect_left(self._keys, prefix + LAST_CHAR, lo)
+    
+    def _best(self, prefix: str, lo: int, hi: int, limit: int) -> Sequence[int]:
+        # Best popularity positions among keys[lo:hi], which all start with prefix
+        top = self._top.get(prefix)
+        if top is not None:
+            return top[:limit]
+        return sorted(set(self._positions[lo:hi]))[:limit]
+    
+    def suggest(self, query: str, limit: int = 10) -> List[int]:
+        """
+        Rows with a name or city word starting with query, most popular first
+        
+        Args:
+            query: Text typed so far
+            limit: Maximum number of rows (at most top_size)
+        """
+        prefix = normalize(query)
+        if not prefix or limit <= 0:
+            return []
+        lo, hi = self._range(prefix)
+        return [self._rows[position] for position in self._best(prefix, lo, hi, min(limit, self.top_size))]
+    
+    def suggest_fuzzy(self, query: str, limit: int = 10, max_distance: Optional[int] = None) -> List[int]:
+        """
+        Rows with a name or city word starting with query, allowing typos
+        
+        A key matches when it starts with the query's first character and some
+        prefix of it is within max_distance edits (insertions, deletions,
+        substitutions) of the query. Rows are ordered by edit distance, then
+        popularity.
+        
+        Args:
+            query: Text typed so far
+            limit: Maximum number of rows (at most top_size)
+            max_distance: Edits allowed (default: 0 below 4 characters, 1 up to
+                7, then 2)
+        """
+        target = normalize(query)
+        if not target or limit <= 0:
+            return []
+        if max_distance is None:
+            max_distance = 0 if len(target) < 4 else 1 if len(target) < 8 else 2
+        limit = min(limit, self.top_size)
+        
+        # Best distance found for each popularity position
+        distances: Dict[int, int] = {}
+        width = len(target) + 1
+        # Distances above max_distance are all stored as too_far
+        too_far = max_distance + 1
+        # Walk the implicit trie depth-first; row[i] is the edit distance
+        # between the node's prefix and target[:i]
+        pending = [('', 0, len(self._keys), [min(i, too_far) for i in range(width)])]
+        while pending:
+            prefix, lo, hi, row = pending.pop()
+            distance = row[-1]
+            if distance <= max_distance:
+                for position in self._best(prefix, lo, hi, limit):
+                    if distances.get(position, too_far) > distance:
+                        distances[position] = distance
+                # No row entry ever drops below the current minimum, so longer
+                # prefixes cannot get closer to the whole query
+                if distance == min(row):
+                    continue
+            
+            depth = len(prefix) + 1
+            # Only cells with |depth - i| <= max_distance can be in range
+            first = max(1, depth - max_distance)
+            last = min(width - 1, depth + max_distance)
+            for child, start, stop in self._children(prefix, lo, hi):
+                char = child[-1]
+                # First characters are rarely mistyped; fixing them prunes most of the walk
+                if depth == 1 and char != target[0]:
+                    continue
+                child_row = [too_far] * width
+                child_row[0] = closest = min(depth, too_far)
+                left = child_row[first - 1]
+                for i in range(first, last + 1):
+                    # Substitution (or match), deletion, insertion
+                    cost = row[i - 1] + (target[i - 1] != char)
+                    if row[i] + 1 < cost:
+                        cost = row[i] + 1
+                    if left + 1 < cost:
+                        cost = left + 1
+                    if cost > too_far:
+                        cost = too_far
+                    child_row[i] = left = cost
+                    if cost < closest:
+                        closest = cost
+                # Longer prefixes can only move further from the query
+                if closest <= max_distance:
+                    pending.append((child, start, stop, child_row))
+        
+        ranked = sorted(distances, key=lambda position: (distances[position], position))
+        return [self._rows[position] for position in ranked[:limit]]
@@ -0,0 +1,617 @@
+"""
+University Catalog Columns
+
+This module keeps data/universities.json in memory in column form: a float64
+array per numeric field, dictionary-encoded string columns and an id -> row
+index. The file is parsed once and parsed again only when its mtime or size
+changes, so answering a request costs a few vectorized comparisons and a slice
+instead of a JSON parse and a loop over every university.
+"""
+
+import copy
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from services.catalog_bitmaps import BitmapIndex, create_bitmaps, group_rows
+from services.search_index import SearchIndex
+from services.suggestion_index import SuggestionIndex
+
+
+# Country code to name mapping used by the country filter
+COUNTRY_NAMES = {
+    'US': 'United States', 'UK': 'United Kingdom', 'CA': 'Canada',
+    'AU': 'Australia', 'DE': 'Germany', 'FR': 'France', 'NL': 'Netherlands',
+    'SE': 'Sweden', 'NO': 'Norway', 'DK': 'Denmark', 'FI': 'Finland',
+    'CH': 'Switzerland', 'AT': 'Austria', 'BE': 'Belgium', 'IE': 'Ireland',
+    'ES': 'Spain', 'IT': 'Italy', 'PT': 'Portugal', 'PL': 'Poland',
+    'CZ': 'Czech Republic', 'HU': 'Hungary', 'GR': 'Greece', 'RO': 'Romania',
+    'BG': 'Bulgaria', 'CN': 'China', 'JP': 'Japan', 'KR': 'South Korea',
+    'IN': 'India', 'SG': 'Singapore', 'HK': 'Hong Kong', 'TW': 'Taiwan',
+    'MY': 'Malaysia', 'TH': 'Thailand', 'ID': 'Indonesia', 'PH': 'Philippines',
+    'VN': 'Vietnam', 'NZ': 'New Zealand', 'ZA': 'South Africa',
+    'BR': 'Brazil', 'AR': 'Argentina', 'CL': 'Chile', 'MX': 'Mexico',
+    'CO': 'Colombia', 'PE': 'Peru', 'CR': 'Costa Rica',
+    'AE': 'United Arab Emirates', 'SA': 'Saudi Arabia', 'IL': 'Israel',
+    'TR': 'Turkey', 'EG': 'Egypt', 'JO': 'Jordan', 'LB': 'Lebanon',
+    'QA': 'Qatar', 'RU': 'Russia', 'IS': 'Iceland', 'LU': 'Luxembourg',
+    'MT': 'Malta', 'CY': 'Cyprus'
+}
+
+# Reverse mapping (name to code)
+COUNTRY_CODES = {name: code for code, name in COUNTRY_NAMES.items()}
+
+# Numeric university fields that can be filtered on
+NUMERIC_FIELDS = ['tuition_fee', 'ranking', 'min_cgpa', 'min_gre', 'min_ielts', 'min_toefl', 'acceptance_rate']
+
+# Range filters of UniversityService._matches_filters as
+# (filter key, university field, value when the field is missing,
+#  comparison that excludes a university, cast applied to the filter value).
+# The cgpa/gre/ielts/toefl filters all exclude universities that require more
+# than the given score, whether it is passed as min_* or max_*.
+RANGE_FILTERS = [
+    ('min_tuition', 'tuition_fee', 0, 'lt', float),
+    ('max_tuition', 'tuition_fee', float('inf'), 'gt', float),
+    ('min_cgpa', 'min_cgpa', 0, 'gt', float),
+    ('max_cgpa', 'min_cgpa', 0, 'gt', float),
+    ('min_gre', 'min_gre', 0, 'gt', int),
+    ('max_gre', 'min_gre', 0, 'gt', int),
+    ('min_ielts', 'min_ielts', 0, 'gt', float),
+    ('max_ielts', 'min_ielts', 0, 'gt', float),
+    ('min_toefl', 'min_toefl', 0, 'gt', int),
+    ('max_toefl', 'min_toefl', 0, 'gt', int),
+    ('min_ranking', 'ranking', float('inf'), 'lt', int),
+    ('max_ranking', 'ranking', 0, 'gt', int),
+    ('min_acceptance_rate', 'acceptance_rate', 0, 'lt', float),
+    ('max_acceptance_rate', 'acceptance_rate', 1.0, 'gt', float)
+]
+
+
+def country_matches(uni_country: Any, countries: List[str]) -> bool:
+    """
+    Whether a university's country matches any filter country, by code or name
+    """
+    for filter_country in countries:
+        # Direct match
+        if uni_country == filter_country:
+            return True
+        # Filter is a code and the university has the full name
+        if filter_country in COUNTRY_NAMES and COUNTRY_NAMES[filter_country] == uni_country:
+            return True
+        # Filter is a name and the university has the code
+        if filter_country in COUNTRY_CODES and COUNTRY_CODES[filter_country] == uni_country:
+            return True
+    return False
+
+
+class NumericColumn:
+    """
+    One numeric university field as float64 values plus a presence mask
+    """
+    
+    def __init__(self, universities: List[Dict], key: str):
+        self.values = np.full(len(universities), np.nan)
+        self.present = np.zeros(len(universities), dtype=bool)
+        # False when some university has a non-numeric value (e.g. null); such
+        # columns are left to the per-university filter, which keeps its errors
+        self.regular = True
+        
+        for row, university in enumerate(universities):
+            if key in university:
+                value = university[key]
+                self.present[row] = True
+                if isinstance(value, (int, float)):
+                    self.values[row] = value
+                else:
+                    self.regular = False
+        
+        self._filled: Dict[float, np.ndarray] = {}
+    
+    def filled(self, default: float) -> np.ndarray:
+        """
+        Values with missing fields replaced by default, i.e. university.get(key, default)
+        """
+        values = self._filled.get(default)
+        if values is None:
+            values = np.where(self.present, self.values, default)
+            values.flags.writeable = False
+            self._filled[default] = values
+        return values
+
+
+class DictionaryColumn:
+    """
+    A column of hashable values stored as int32 codes into a list of distinct values
+    """
+    
+    def __init__(self, values: List):
+        lookup: Dict = {}
+        self.codes = np.empty(len(values), dtype=np.int32)
+        self.regular = True
+        for row, value in enumerate(values):
+            try:
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(lookup)
+            except TypeError:  # Unhashable value
+                self.regular = False
+                code = -1
+            self.codes[row] = code
+        self.dictionary = list(lookup)
+
+
+class SortedIndex:
+    """
+    Row ids of one numeric column ordered by value, for range predicates
+    
+    Rows missing the field and rows holding NaN are kept apart: whether a
+    missing value passes depends on the filter's default, and NaN passes every
+    filter because both of its comparisons are false.
+    """
+    
+    def __init__(self, column: NumericColumn):
+        nan = np.isnan(column.values)
+        valued = np.flatnonzero(column.present & ~nan)
+        self.rows = valued[np.argsort(column.values[valued], kind='stable')]
+        self.values = column.values[self.rows]
+        self.missing_rows = np.flatnonzero(~column.present)
+        self.nan_rows = np.flatnonzero(column.present & nan)
+
+
+class RangePredicate:
+    """
+    One range filter resolved against a sorted index
+    
+    The rows it keeps are a contiguous slice of the index plus, depending on
+    the default, the rows missing the field; count is known after one
+    binary search, so predicates can be applied most selective first.
+    """
+    
+    def __init__(self, filter_key: str, column: NumericColumn, index: SortedIndex, excludes: str,
+                 limit: float, default: float):
+        self.filter_key = filter_key
+        self.column = column
+        self.index = index
+        self.excludes = excludes
+        self.limit = limit
+        self.default = default
+        
+        if limit != limit:  # NaN limit: no comparison is true, nothing is excluded
+            self.start, self.stop = 0, len(index.values)
+        elif excludes == 'lt':  # keeps values >= limit
+            self.start, self.stop = int(np.searchsorted(index.values, limit, side='left')), len(index.values)
+        else:  # keeps values <= limit
+            self.start, self.stop = 0, int(np.searchsorted(index.values, limit, side='right'))
+        self.keeps_missing = not self._excluded(default)
+        
+        self.count = self.stop - self.start + len(index.nan_rows)
+        if self.keeps_missing:
+            self.count += len(index.missing_rows)
+    
+    def _excluded(self, values):
+        return values < self.limit if self.excludes == 'lt' else values > self.limit
+    
+    def rows(self) -> np.ndarray:
+        """
+        Sorted row ids of the universities this predicate keeps
+        """
+        parts = [self.index.rows[self.start:self.stop], self.index.nan_rows]
+        if self.keeps_missing:
+            parts.append(self.index.missing_rows)
+        return np.sort(np.concatenate(parts))
+    
+    def keep(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Boolean mask of the given rows that this predicate keeps
+        """
+        # Negated so that NaN values are kept, as a failed Python comparison keeps them
+        return ~self._excluded(self.column.filled(self.default)[rows])
+
+
+class FilterPlan:
+    """
+    Execution plan for one filter request
+    
+    The country, field and type filters are each an OR of value bitmaps and
+    are ANDed into a single bitmap; each range filter is a RangePredicate.
+    Every input's row count is known up front (population count or binary
+    search), so the smallest one drives: its rows are materialized and all
+    other inputs are only probed on them, most selective first.
+    """
+    
+    def __init__(self, catalog: 'UniversityCatalog', ranges: List[RangePredicate], bitmap=None,
+                 bitmap_filters: Optional[List[str]] = None):
+        self.catalog = catalog
+        self.bitmap = bitmap
+        self.bitmap_filters = bitmap_filters or []
+        self.bitmap_count = catalog.bitmaps.count(bitmap) if bitmap is not None else None
+        
+        ranges = sorted(ranges, key=lambda predicate: predicate.count)
+        if bitmap is not None and (not ranges or self.bitmap_count <= ranges[0].count):
+            self.driver = 'bitmap'
+            self.probes = ranges
+        elif ranges:
+            self.driver = ranges[0]
+            self.probes = ranges[1:]
+        else:
+            self.driver = None
+            self.probes = []
+    
+    def execute(self) -> np.ndarray:
+        """
+        Sorted row ids of the matching universities
+        """
+        bitmaps = self.catalog.bitmaps
+        if self.driver == 'bitmap':
+            rows = bitmaps.rows(self.bitmap)
+        elif self.driver is not None:
+            rows = self.driver.rows()
+            if self.bitmap is not None:
+                rows = rows[bitmaps.contains(self.bitmap, rows)]
+        else:
+            rows = self.catalog.all_rows
+        
+        for predicate in self.probes:
+            if not len(rows):
+                break
+            rows = rows[predicate.keep(rows)]
+        return rows
+    
+    def describe(self) -> List[Dict[str, Any]]:
+        """
+        Plan steps in execution order with their estimated row counts
+        """
+        steps = []
+        bitmap_step = {'step': 'bitmap', 'filters': self.bitmap_filters, 'rows': self.bitmap_count}
+        if self.driver == 'bitmap':
+            steps.append(dict(bitmap_step, access='scan'))
+        elif self.driver is not None:
+            steps.append({'step': 'range', 'filters': [self.driver.filter_key], 'rows': self.driver.count,
+                          'access': 'index'})
+            if self.bitmap is not None:
+                steps.append(dict(bitmap_step, access='probe'))
+        else:
+            steps.append({'step': 'all', 'filters': [], 'rows': len(self.catalog), 'access': 'scan'})
+        for predicate in self.probes:
+            steps.append({'step': 'range', 'filters': [predicate.filter_key], 'rows': predicate.count,
+                          'access': 'probe'})
+        return steps
+
+
+class UniversityCatalog:
+    """
+    Column-oriented view of one load of the universities file
+    """
+    
+    def __init__(self, universities: List[Dict], bitmap_backend: Optional[str] = None,
+                 previous: Optional['UniversityCatalog'] = None):
+        """
+        Args:
+            universities: University records
+            bitmap_backend: 'numpy' or 'int' (see create_bitmaps)
+            previous: Catalog this one replaces; its search index is copied
+                and updated rather than rebuilt
+        """
+        self.universities = universities
+        
+        # id -> row (first record wins for duplicate ids)
+        self.index: Dict[Any, int] = {}
+        for row, university in enumerate(universities):
+            try:
+                self.index.setdefault(university.get('id'), row)
+            except TypeError:  # Unhashable id, never equal to a requested one
+                pass
+        
+        self.numeric = {key: NumericColumn(universities, key) for key in NUMERIC_FIELDS}
+        self.sorted_indexes = {key: SortedIndex(column) for key, column in self.numeric.items()}
+        self.all_rows = np.arange(len(universities))
+        self.country = DictionaryColumn([university.get('country', '') for university in universities])
+        # Columns holding values the filters cannot compare (non-string types,
+        # non-list fields) are marked irregular and left to the per-row filter
+        types = [university.get('type', '') for university in universities]
+        self.type = DictionaryColumn([
+            uni_type.strip().lower() if isinstance(uni_type, str) else None for uni_type in types
+        ])
+        self.type.regular = all(isinstance(uni_type, str) for uni_type in types)
+        field_lists = [university.get('fields', []) for university in universities]
+        self.fields = DictionaryColumn([
+            tuple(fields) if isinstance(fields, (list, tuple)) else None for fields in field_lists
+        ])
+        self.fields.regular = self.fields.regular and all(isinstance(fields, (list, tuple)) for fields in field_lists)
+        
+        # One bitmap per country value, per normalized type and per field of study
+        self.bitmaps = create_bitmaps(len(universities), bitmap_backend)
+        self.country_bitmaps = self._bitmap_index(self.country)
+        self.type_bitmaps = self._bitmap_index(self.type)
+        rows_by_field: Dict[Any, List[np.ndarray]] = {}
+        for field_set, rows in zip(self.fields.dictionary, group_rows(self.fields.codes, len(self.fields.dictionary))):
+            for field in set(field_set or ()):
+                rows_by_field.setdefault(field, []).append(rows)
+        self.field_bitmaps = BitmapIndex(self.bitmaps, {
+            field: np.sort(np.concatenate(parts)) for field, parts in rows_by_field.items()
+        })
+        
+        self.search_index = self._build_search_index(previous)
+        # Autocomplete over names and cities, best ranked first (unranked last)
+        self.suggestion_index = SuggestionIndex(
+            [[text for text in (university.get('name'), university.get('city')) if isinstance(text, str)]
+             for university in universities],
+            np.lexsort((self.all_rows, self.numeric['ranking'].filled(np.inf))).tolist()
+        )
+        self._statistics = None
+    
+    def _bitmap_index(self, column: DictionaryColumn) -> BitmapIndex:
+        rows = group_rows(column.codes, len(column.dictionary))
+        return BitmapIndex(self.bitmaps, dict(zip(column.dictionary, rows)))
+    
+    def __len__(self) -> int:
+        return len(self.universities)
+    
+    def get(self, university_id) -> Optional[Dict]:
+        """
+        Look up a university by id in O(1)
+        """
+        try:
+            row = self.index.get(university_id)
+        except TypeError:  # Unhashable id from a malformed request
+            return None
+        return None if row is None else self.universities[row]
+    
+    def take(self, rows: np.ndarray) -> List[Dict]:
+        """
+        University records for an array of row numbers
+        """
+        universities = self.universities
+        return [universities[row] for row in rows.tolist()]
+    
+    def plan(self, filters: Dict[str, Any],
+             country_match: Callable[[Any, List], bool] = country_matches) -> Optional[FilterPlan]:
+        """
+        Resolve filters against the bitmap and sorted indexes
+        
+        Same semantics as UniversityService._matches_filters.
+        
+        Args:
+            filters: Filter criteria
+            country_match: country_match(university_country, filter_countries)
+                decides the country filter
+        
+        Returns:
+            FilterPlan, or None when a filtered column holds values the indexes
+            do not handle (the caller then filters row by row)
+        """
+        ranges = []
+        for filter_key, key, default, excludes, cast in RANGE_FILTERS:
+            if filter_key in filters and filters[filter_key]:
+                limit = cast(filters[filter_key])
+                column = self.numeric[key]
+                if not column.regular:
+                    return None
+                ranges.append(RangePredicate(filter_key, column, self.sorted_indexes[key], excludes, limit, default))
+        
+        # Each categorical filter is an OR over its values' bitmaps; all are ANDed
+        bitmaps = []
+        try:
+            if 'country' in filters:
+                countries = filters['country']
+                if isinstance(countries, str):
+                    countries = [countries]
+                if not self.country.regular:
+                    return None
+                matching = [country for country in self.country_bitmaps.index if country_match(country, countries)]
+                bitmaps.append(('country', self.country_bitmaps.any_of(matching)))
+            
+            if 'field' in filters:
+                fields = filters['field']
+                if isinstance(fields, str):
+                    fields = [fields]
+                if not self.fields.regular:
+                    return None
+                bitmaps.append(('field', self.field_bitmaps.any_of(fields)))
+            
+            if 'type' in filters and filters['type']:
+                filter_type = filters['type'].strip().lower()
+                if not self.type.regular:
+                    return None
+                bitmaps.append(('type', self.type_bitmaps.any_of([filter_type])))
+        except TypeError:  # Unhashable filter value, only comparable row by row
+            return None
+        
+        if not bitmaps:
+            return FilterPlan(self, ranges)
+        
+        bitmap = bitmaps[0][1]
+        for _, other in bitmaps[1:]:
+            bitmap = self.bitmaps.and_(bitmap, other)
+        return FilterPlan(self, ranges, bitmap, [name for name, _ in bitmaps])
+    
+    def filter_rows(self, filters: Dict[str, Any],
+                    country_match: Callable[[Any, List], bool] = country_matches) -> Optional[np.ndarray]:
+        """
+        Row ids, in catalog order, of the universities matching filters
+        
+        Returns:
+            Sorted row ids, or None when the caller has to filter row by row
+            (see plan)
+        """
+        plan = self.plan(filters, country_match)
+        return None if plan is None else plan.execute()
+    
+    def _build_search_index(self, previous: Optional['UniversityCatalog']) -> Optional[SearchIndex]:
+        """
+        Full-text index keyed by university id, or None if ids are not unique
+        or some record has non-string name, city, country or fields
+        
+        A copy of the previous catalog's index is synced to this catalog's
+        records, so only universities whose text changed are re-indexed. The
+        copy shares the unchanged postings; the previous catalog keeps its own
+        index untouched, even if building this one fails.
+        """
+        if len(self.index) != len(self.universities) or not self.fields.regular:
+            return None
+        
+        documents = {}
+        for university in self.universities:
+            try:
+                document = {
+                    'name': university.get('name', ''),
+                    'city': university.get('city', ''),
+                    'country': university.get('country', ''),
+                    'fields': ' '.join(university.get('fields', []))
+                }
+            except TypeError:  # Non-string field names
+                return None
+            if not all(isinstance(text, str) for text in document.values()):
+                return None
+            documents[university.get('id')] = document
+        
+        if previous is not None and previous.search_index is not None:
+            search_index = previous.search_index.copy()
+        else:
+            search_index = SearchIndex()
+        search_index.sync(documents)
+        return search_index
+    
+    def search_rows(self, query: str, fields: Optional[List[str]] = None) -> Optional[np.ndarray]:
+        """
+        Rows of the universities matching a full-text query, best match first
+        
+        Args:
+            query: Words (matched as word prefixes) and "quoted phrases"
+            fields: Restrict matching to some of name, city, country and fields
+        
+        Returns:
+            Row ids ordered by BM25 score (ties in catalog order), or None when
+            the catalog has no search index
+        """
+        if self.search_index is None:
+            return None
+        
+        matches = self.search_index.search(query, fields)
+        rows = []
+        scores = []
+        for university_id, score in matches.items():
+            rows.append(self.index[university_id])
+            scores.append(score)
+        rows = np.array(rows, dtype=np.int64)
+        return rows[np.lexsort((rows, -np.array(scores)))]
+    
+    def suggest(self, query: str, limit: int = 10, typo_tolerant: bool = False) -> List[Dict]:
+        """
+        Universities whose name or city has a word starting with query
+        
+        Args:
+            query: Text typed so far
+            limit: Maximum number of universities (at most 20)
+            typo_tolerant: Also match words a few edits away from query
+        
+        Returns:
+            Universities by ranking (closest matches first when typo tolerant)
+        """
+        if typo_tolerant:
+            rows = self.suggestion_index.suggest_fuzzy(query, limit)
+        else:
+            rows = self.suggestion_index.suggest(query, limit)
+        return [self.universities[row] for row in rows]
+    
+    def statistics(self) -> Dict[str, Any]:
+        """
+        Per-country, type and field counts and fee/acceptance statistics,
+        computed once per load
+        """
+        if self._statistics is None:
+            universities = self.universities
+            tuition_fees = [u.get('tuition_fee', 0) for u in universities if u.get('tuition_fee') is not None]
+            acceptance_rates = [u.get('acceptance_rate', 0) for u in universities if u.get('acceptance_rate') is not None]
+            
+            country_counts = {}
+            type_counts = {'Public': 0, 'Private': 0}
+            field_counts = {}
+            
+            for university in universities:
+                # Count by country
+                country = university.get('country')
+                if country:
+                    country_counts[country] = country_counts.get(country, 0) + 1
+                
+                # Count by type
+                uni_type = university.get('type', 'Unknown')
+                if uni_type in type_counts:
+                    type_counts[uni_type] += 1
+                
+                # Count by fields
+                for field in university.get('fields', []):
+                    field_counts[field] = field_counts.get(field, 0) + 1
+            
+            self._statistics = {
+                'universities_by_country': country_counts,
+                'universities_by_type': type_counts,
+                'universities_by_field': field_counts,
+                'tuition_stats': {
+                    'min': min(tuition_fees) if tuition_fees else 0,
+                    'max': max(tuition_fees) if tuition_fees else 0,
+                    'avg': sum(tuition_fees) / len(tuition_fees) if tuition_fees else 0
+                },
+                'acceptance_rate_stats': {
+                    'min': min(acceptance_rates) if acceptance_rates else 0,
+                    'max': max(acceptance_rates) if acceptance_rates else 0,
+                    'avg': sum(acceptance_rates) / len(acceptance_rates) if acceptance_rates else 0
+                }
+            }
+        return copy.deepcopy(self._statistics)
+
+
+class JsonFileCache:
+    """
+    A JSON file parsed once and again only after its mtime or size changes
+    
+    The parsed content is passed through build (e.g. UniversityCatalog) as
+    build(content, previous=last_built_value), and the result is shared by
+    all callers until the file changes.
+    """
+    
+    def __init__(self, file_path: str, build: Optional[Callable[..., Any]] = None):
+        self.file_path = file_path
+        self.build = build
+        self.loads = 0
+        self._lock = threading.Lock()
+        self._entry = None      # (file signature, built value)
+    
+    def current(self) -> Any:
+        """
+        The built content of the file as it is now
+        
+        Raises:
+            FileNotFoundError: If the file does not exist
+            json.JSONDecodeError: If the file is malformed and was never loaded
+        """
+        stat = os.stat(self.file_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        entry = self._entry
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        
+        with self._lock:
+            entry = self._entry
+            if entry is not None and entry[0] == signature:
+                return entry[1]
+            try:
+                with open(self.file_path, 'r', encoding='utf-8') as file:
+                    content = json.load(file)
+            except json.JSONDecodeError as e:
+                if entry is None:
+                    raise
+                # Possibly caught mid-write; keep serving the last good load and retry next time
+                print(f"Error reloading {self.file_path}: {e}")
+                return entry[1]
+            
+            if self.build is not None:
+                value = self.build(content, previous=entry[1] if entry is not None else None)
+            else:
+                value = content
+            self._entry = (signature, value)
+            self.loads += 1
+            return value
@@ -12,6 +12,7 @@ import json
 import os
 from typing import List, Dict, Any, Optional
 from services.firebase_service import FirebaseService
+from services.university_catalog import JsonFileCache, UniversityCatalog
 
 
 class UniversityService:
@@ -31,6 +32,9 @@ class UniversityService:
         self.countries_file = os.path.join(data_path, "countries.json")
         self.fields_file = os.path.join(data_path, "fields.json")
         
+        # JSON catalog with its search index, parsed again only when the file changes
+        self._catalog_cache = JsonFileCache(self.universities_file, UniversityCatalog)
+        
         # Initialize Firebase service if enabled
         if self.use_firebase:
             try:
@@ -297,11 +301,21 @@ class UniversityService:
                 # Fall back to JSON
         
         # JSON fallback
-        universities = self.load_universities()
+        try:
+            catalog = self._catalog_cache.current()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Universities data file not found: {self.universities_file}")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in universities file: {e}")
+        
+        rows = catalog.search_rows(query, fields=['name', 'city'])
+        if rows is not None:
+            return catalog.take(rows)
+        
         query_lower = query.lower()
         
         matching_universities = []
-        for university in universities:
+        for university in catalog.universities:
             name = university.get('name', '').lower()
             city = university.get('city', '').lower()
             
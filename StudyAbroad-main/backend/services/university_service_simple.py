@@ -7,6 +7,8 @@ import json
 import os
 from typing import List, Dict, Any, Optional
 
+from services.university_catalog import JsonFileCache, UniversityCatalog, country_matches
+
 
 class UniversityService:
     """Service class for managing university data operations."""
@@ -23,23 +25,35 @@ class UniversityService:
         self.countries_file = os.path.join(data_path, "countries.json")
         self.fields_file = os.path.join(data_path, "fields.json")
         
+        # Files are parsed on first use and again only after they change
+        self._catalog_cache = JsonFileCache(self.universities_file, UniversityCatalog)
+        self._countries_cache = JsonFileCache(self.countries_file)
+        self._fields_cache = JsonFileCache(self.fields_file)
+        
         print("✅ University Service initialized (JSON mode)")
         
-    def load_universities(self) -> List[Dict[str, Any]]:
+    def get_catalog(self) -> UniversityCatalog:
         """
-        Load all universities from the JSON file.
+        Get the in-memory columnar catalog, reloaded when the file changes.
         
         Returns:
-            List[Dict[str, Any]]: List of university dictionaries
+            UniversityCatalog: Universities with their columns and id index
         """
         try:
-            with open(self.universities_file, 'r', encoding='utf-8') as file:
-                universities = json.load(file)
-                return universities
+            return self._catalog_cache.current()
         except FileNotFoundError:
             raise FileNotFoundError(f"Universities data file not found: {self.universities_file}")
         except json.JSONDecodeError as e:
-            raise json.JSONDecodeError(f"Invalid JSON in universities file: {e}")
+            raise ValueError(f"Invalid JSON in universities file: {e}")
+    
+    def load_universities(self) -> List[Dict[str, Any]]:
+        """
+        Load all universities from the JSON file.
+        
+        Returns:
+            List[Dict[str, Any]]: List of university dictionaries
+        """
+        return list(self.get_catalog().universities)
     
     def load_countries(self) -> List[Dict[str, str]]:
         """
@@ -49,8 +63,7 @@ class UniversityService:
             List[Dict[str, str]]: List of country dictionaries with code and name
         """
         try:
-            with open(self.countries_file, 'r', encoding='utf-8') as file:
-                return json.load(file)
+            return list(self._countries_cache.current())
         except FileNotFoundError:
             return []
     
@@ -62,8 +75,7 @@ class UniversityService:
             List[Dict[str, Any]]: List of field dictionaries with id and name
         """
         try:
-            with open(self.fields_file, 'r', encoding='utf-8') as file:
-                return json.load(file)
+            return list(self._fields_cache.current())
         except FileNotFoundError:
             # Extract fields from universities if fields.json doesn't exist
             universities = self.load_universities()
@@ -90,11 +102,7 @@ class UniversityService:
         Returns:
             Optional[Dict[str, Any]]: University dictionary if found, None otherwise
         """
-        universities = self.load_universities()
-        for university in universities:
-            if university.get('id') == university_id:
-                return university
-        return None
+        return self.get_catalog().get(university_id)
     
     def filter_universities(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -106,14 +114,14 @@ class UniversityService:
         Returns:
             List[Dict[str, Any]]: Filtered list of universities
         """
-        universities = self.load_universities()
-        filtered_universities = []
-        
-        for university in universities:
-            if self._matches_filters(university, filters):
-                filtered_universities.append(university)
-        
-        return filtered_universities
+        catalog = self.get_catalog()
+        rows = catalog.filter_rows(filters)
+        if rows is None:
+            # Some filtered column holds values only the per-university check handles
+            return [university for university in catalog.universities
+                    if self._matches_filters(university, filters)]
+        
+        return catalog.take(rows)
     
     def _matches_filters(self, university: Dict[str, Any], filters: Dict[str, Any]) -> bool:
         """
@@ -132,48 +140,7 @@ class UniversityService:
             if isinstance(countries, str):
                 countries = [countries]
             
-            uni_country = university.get('country', '')
-            
-            # Country code to name mapping
-            country_mapping = {
-                'US': 'United States', 'UK': 'United Kingdom', 'CA': 'Canada',
-                'AU': 'Australia', 'DE': 'Germany', 'FR': 'France', 'NL': 'Netherlands',
-                'SE': 'Sweden', 'NO': 'Norway', 'DK': 'Denmark', 'FI': 'Finland',
-                'CH': 'Switzerland', 'AT': 'Austria', 'BE': 'Belgium', 'IE': 'Ireland',
-                'ES': 'Spain', 'IT': 'Italy', 'PT': 'Portugal', 'PL': 'Poland',
-                'CZ': 'Czech Republic', 'HU': 'Hungary', 'GR': 'Greece', 'RO': 'Romania',
-                'BG': 'Bulgaria', 'CN': 'China', 'JP': 'Japan', 'KR': 'South Korea',
-                'IN': 'India', 'SG': 'Singapore', 'HK': 'Hong Kong', 'TW': 'Taiwan',
-                'MY': 'Malaysia', 'TH': 'Thailand', 'ID': 'Indonesia', 'PH': 'Philippines',
-                'VN': 'Vietnam', 'NZ': 'New Zealand', 'ZA': 'South Africa',
-                'BR': 'Brazil', 'AR': 'Argentina', 'CL': 'Chile', 'MX': 'Mexico',
-                'CO': 'Colombia', 'PE': 'Peru', 'CR': 'Costa Rica',
-                'AE': 'United Arab Emirates', 'SA': 'Saudi Arabia', 'IL': 'Israel',
-                'TR': 'Turkey', 'EG': 'Egypt', 'JO': 'Jordan', 'LB': 'Lebanon',
-                'QA': 'Qatar', 'RU': 'Russia', 'IS': 'Iceland', 'LU': 'Luxembourg',
-                'MT': 'Malta', 'CY': 'Cyprus'
-            }
-            
-            # Create reverse mapping (name to code)
-            name_to_code = {v: k for k, v in country_mapping.items()}
-            
-            # Check if university country matches any filter (code or name)
-            match_found = False
-            for filter_country in countries:
-                # Direct match
-                if uni_country == filter_country:
-                    match_found = True
-                    break
-                # Check if filter is a code and uni has full name
-                elif filter_country in country_mapping and country_mapping[filter_country] == uni_country:
-                    match_found = True
-                    break
-                # Check if filter is a name and uni has code
-                elif filter_country in name_to_code and name_to_code[filter_country] == uni_country:
-                    match_found = True
-                    break
-            
-            if not match_found:
+            if not country_matches(university.get('country', ''), countries):
                 return False
         
         # Field filter
@@ -278,19 +245,23 @@ class UniversityService:
     
     def search_universities(self, query: str) -> List[Dict[str, Any]]:
         """
-        Search universities by name or city.
+        Search universities by name, city, country or field of study.
         
         Args:
-            query (str): Search query string
+            query (str): Search query; words match word prefixes, "quoted words" match as a phrase
             
         Returns:
-            List[Dict[str, Any]]: List of universities matching the search query
+            List[Dict[str, Any]]: Universities matching every word, best match first
         """
-        universities = self.load_universities()
-        query_lower = query.lower()
+        catalog = self.get_catalog()
+        rows = catalog.search_rows(query)
+        if rows is not None:
+            return catalog.take(rows)
         
+        # No search index (irregular records): substring scan
+        query_lower = query.lower()
         matching_universities = []
-        for university in universities:
+        for university in catalog.universities:
             # Search in name, city, country, and fields
             searchable_text = ' '.join([
                 university.get('name', ''),
@@ -304,6 +275,21 @@ class UniversityService:
         
         return matching_universities
     
+    def suggest_universities(self, query: str, limit: int = 10,
+                             typo_tolerant: bool = False) -> List[Dict[str, Any]]:
+        """
+        Autocomplete universities from the catalog's suggestion index.
+        
+        Args:
+            query (str): Text typed so far; matches the start of name and city words
+            limit (int): Maximum number of suggestions (at most 20)
+            typo_tolerant (bool): Also match words a few typos away
+        
+        Returns:
+            List[Dict[str, Any]]: Suggested universities, best ranked first
+        """
+        return self.get_catalog().suggest(query, limit, typo_tolerant)
+    
     def sort_universities(self, universities: List[Dict[str, Any]], 
                          sort_by: str = 'ranking', 
                          ascending: bool = True) -> List[Dict[str, Any]]:
@@ -334,55 +320,22 @@ class UniversityService:
         Returns:
             Dict[str, Any]: Dictionary containing various statistics
         """
-        universities = self.load_universities()
+        catalog = self.get_catalog()
         countries = self.load_countries()
         fields = self.load_fields()
         
-        if not universities:
+        if not len(catalog):
             return {
                 'total_universities': 0,
                 'countries_count': len(countries),
                 'fields_count': len(fields)
             }
         
-        # Calculate statistics
-        tuition_fees = [u.get('tuition_fee', 0) for u in universities if u.get('tuition_fee') is not None]
-        acceptance_rates = [u.get('acceptance_rate', 0) for u in universities if u.get('acceptance_rate') is not None]
-        
-        country_counts = {}
-        type_counts = {'Public': 0, 'Private': 0}
-        field_counts = {}
-        
-        for university in universities:
-            # Count by country
-            country = university.get('country')
-            if country:
-                country_counts[country] = country_counts.get(country, 0) + 1
-            
-            # Count by type
-            uni_type = university.get('type', 'Unknown')
-            if uni_type in type_counts:
-                type_counts[uni_type] += 1
-            
-            # Count by fields
-            for field in university.get('fields', []):
-                field_counts[field] = field_counts.get(field, 0) + 1
-        
-        return {
-            'total_universities': len(universities),
+        # Per-university counts and averages are computed once per catalog load
+        statistics = {
+            'total_universities': len(catalog),
             'countries_count': len(countries),
-            'fields_count': len(fields),
-            'universities_by_country': country_counts,
-            'universities_by_type': type_counts,
-            'universities_by_field': field_counts,
-            'tuition_stats': {
-                'min': min(tuition_fees) if tuition_fees else 0,
-                'max': max(tuition_fees) if tuition_fees else 0,
-                'avg': sum(tuition_fees) / len(tuition_fees) if tuition_fees else 0
-            },
-            'acceptance_rate_stats': {
-                'min': min(acceptance_rates) if acceptance_rates else 0,
-                'max': max(acceptance_rates) if acceptance_rates else 0,
-                'avg': sum(acceptance_rates) / len(acceptance_rates) if acceptance_rates else 0
-            }
-        }
\ No newline at end of file
+            'fields_count': len(fields)
+        }
+        statistics.update(catalog.statistics())
+        return statistics
\ No newline at end of file
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test Catalog Store
+Checks that the universities catalog is reloaded when the file changes, that a
+broken file keeps the previous snapshot, and that reloads reach the
+recommendation cache and the admin endpoint
+"""
+
+import json
+import os
+
+import pytest
+
+from ml.admission_predictor import load_universities_data
+from ml.catalog import CatalogStore
+
+
+def _write_catalog(path, universities, mtime=None) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(universities, f)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def catalog_path(tmp_path):
+    path = str(tmp_path / 'universities.json')
+    _write_catalog(path, load_universities_data()[:20], mtime=1000)
+    return path
+
+
+def test_reloads_when_mtime_or_content_changes(catalog_path):
+    """A new mtime triggers a reload; only a new content hash swaps the snapshot"""
+    store = CatalogStore(catalog_path, poll_interval=0)
+    first = store.current()
+    assert len(first) == 20 and not store.refresh()
+    
+    # Touched but unchanged: the file is re-read, the snapshot kept
+    os.utime(catalog_path, (2000, 2000))
+    assert not store.refresh() and store.current() is first
+    
+    _write_catalog(catalog_path, load_universities_data()[:25], mtime=3000)
+    assert store.refresh()
+    second = store.current()
+    assert len(second) == 25 and second.version != first.version
+    
+    # Same mtime, new content: only a forced reload notices
+    _write_catalog(catalog_path, load_universities_data()[:5], mtime=3000)
+    assert not store.refresh() and store.current() is second
+    info = store.reload()
+    assert info['reloaded'] and info['university_count'] == 5
+
+
+def test_unparsable_file_keeps_previous_snapshot(catalog_path):
+    """A broken rewrite keeps serving the last good snapshot and is retried later"""
+    store = CatalogStore(catalog_path, poll_interval=0)
+    snapshot = store.current()
+    
+    with open(catalog_path, 'w') as f:
+        f.write('[{"id": ')
+    os.utime(catalog_path, (2000, 2000))
+    assert not store.refresh() and store.current() is snapshot
+    assert not store.reload()['reloaded'] and store.current() is snapshot
+    
+    # The mtime of the broken file was not recorded, so a fix with the same mtime is picked up
+    _write_catalog(catalog_path, load_universities_data()[:3], mtime=2000)
+    assert store.refresh() and len(store.current()) == 3
+
+
+def test_listeners_invalidate_recommendation_cache(catalog_path, monkeypatch):
+    """Each swap calls the listeners; the ML service drops its cached results"""
+    from ml.ml_service import MLService
+    
+    monkeypatch.setattr('ml.catalog.get_catalog_path', lambda: catalog_path)
+    monkeypatch.setenv('CATALOG_POLL_INTERVAL', '0')
+    service = MLService()
+    swaps = []
+    service.catalog.add_listener(lambda old, new: swaps.append((old.version, new.version)))
+    old_version = service.catalog.current().version
+    
+    service.recommendation_cache.set('key', {'recommendations': []})
+    os.utime(catalog_path, (2000, 2000))
+    assert not service.catalog.refresh()
+    assert service.recommendation_cache.get('key') == {'recommendations': []}
+    
+    _write_catalog(catalog_path, load_universities_data()[:10], mtime=3000)
+    assert service.catalog.refresh()
+    assert swaps == [(old_version, service.catalog.current().version)]
+    assert service.recommendation_cache.get('key') is None
+
+
+def test_reload_route_requires_admin_key(catalog_path, monkeypatch):
+    """POST /catalog/reload is refused without the right X-Admin-Key"""
+    from flask import Flask
+    from flask_jwt_extended import JWTManager, create_access_token
+    
+    import routes.recommendations as routes
+    
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'catalog-reload-test-secret-0123456789'
+    JWTManager(app)
+    app.register_blueprint(routes.recommendations_bp)
+    with app.app_context():
+        token = create_access_token(identity='admin')
+    
+    store = CatalogStore(catalog_path, poll_interval=0)
+    monkeypatch.setattr(routes.ml_service, 'catalog', store)
+    client = app.test_client()
+    
+    def reload(headers=None):
+        headers = dict(headers or {}, Authorization=f'Bearer {token}')
+        return client.post('/api/recommendations/catalog/reload', headers=headers)
+    
+    # No ADMIN_API_KEY configured: nobody may reload
+    monkeypatch.delenv('ADMIN_API_KEY', raising=False)
+    assert reload({'X-Admin-Key': ''}).status_code == 403
+    
+    monkeypatch.setenv('ADMIN_API_KEY', 'admin-secret')
+    assert reload().status_code == 403
+    assert reload({'X-Admin-Key': 'wrong'}).status_code == 403
+    assert client.post('/api/recommendations/catalog/reload',
+                       headers={'X-Admin-Key': 'admin-secret'}).status_code == 401
+    
+    _write_catalog(catalog_path, load_universities_data()[:4], mtime=2000)
+    response = reload({'X-Admin-Key': 'admin-secret'})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['success'] and body['catalog']['reloaded'] and body['catalog']['university_count'] == 4
+
+
+if __name__ == "__main__":
+    import tempfile
+    
+    print("🧪 TESTING CATALOG STORE")
+    print("=" * 50)
+    for test in [test_reloads_when_mtime_or_content_changes, test_unparsable_file_keeps_previous_snapshot]:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'universities.json')
+            _write_catalog(path, load_universities_data()[:20], mtime=1000)
+            test(path)
+    print("✅ Catalog store reloads on change and keeps the last good snapshot")
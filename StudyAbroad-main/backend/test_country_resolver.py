@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test Country Resolver
+Checks that codes, names and aliases resolve to one canonical country
+"""
+
+from ml.country_resolver import load_country_resolver
+
+
+def test_codes_names_and_aliases_share_an_id():
+    """Every spelling used in the catalog maps to the same country id"""
+    resolver = load_country_resolver()
+    
+    assert resolver.country_id('US') == resolver.country_id('United States') == resolver.country_id('usa')
+    assert resolver.country_id('UK') == resolver.country_id('United Kingdom') == resolver.country_id('england')
+    assert resolver.country_id('KR') == resolver.country_id('South Korea')
+    assert resolver.country_id('US') != resolver.country_id('Australia')
+
+
+def test_preferences_resolve_without_substring_false_positives():
+    """Short codes only match exactly; longer tokens may match part of a name"""
+    resolver = load_country_resolver()
+    
+    preferred = resolver.preference_ids('US, in')
+    assert preferred == {resolver.country_id('United States'), resolver.country_id('India')}
+    assert resolver.country_id('Australia') not in resolver.preference_ids('us')
+    assert resolver.preference_ids('korea') == {resolver.country_id('KR')}
+    assert resolver.preference_ids('narnia') == frozenset()
+    assert resolver.preference_ids('') is None
+    assert resolver.preference_ids(' , ') is None
+
+
+def test_unknown_catalog_countries_get_stable_ids():
+    """Countries missing from countries.json still compare equal by name"""
+    resolver = load_country_resolver()
+    country_id = resolver.country_id('Saudi Arabia')
+    
+    assert resolver.country_id('saudi  arabia') == country_id
+    assert resolver.preference_ids('Saudi Arabia') == {country_id}
+
+
+if __name__ == "__main__":
+    print("🧪 TESTING COUNTRY RESOLVER")
+    print("=" * 50)
+    test_codes_names_and_aliases_share_an_id()
+    test_preferences_resolve_without_substring_false_positives()
+    test_unknown_catalog_countries_get_stable_ids()
+    print("✅ Country resolver works")
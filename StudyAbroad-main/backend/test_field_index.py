@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test Field Match Index
+Checks that indexed field matching reproduces _calculate_field_match
+"""
+
+from ml.field_index import FieldMatchIndex
+from ml.recommendation_engine import get_recommendation_engine
+
+
+FIELD_SETS = [
+    ('Computer Science', 'Engineering'),
+    ('Mechanical Engineering',),
+    ('Business Administration', 'Law'),
+    ('Arts',),
+    ('Data Science', 'Medicine', 'computer science'),
+    ()
+]
+
+USER_FIELDS = [
+    'Computer Science', 'computer', 'Mechanical', 'science of data', 'art', 'arts and design',
+    'Law', 'la', 'Engineering Management', 'Biology', '', '  Data Science  ', 'business law'
+]
+
+
+def test_index_matches_per_university_scoring():
+    """Every tier (exact, substring, keyword, none, neutral) matches the original function"""
+    engine = get_recommendation_engine()
+    index = FieldMatchIndex(FIELD_SETS)
+    
+    for user_field in USER_FIELDS:
+        profile = {'field_of_study': user_field}
+        scores = index.match_scores(user_field.lower().strip())
+        expected = [engine._calculate_field_match(profile, {'fields': list(fields)}) for fields in FIELD_SETS]
+        assert scores.tolist() == expected, user_field
+
+
+def test_scores_are_memoized_read_only():
+    """Repeated lookups reuse one read-only array"""
+    index = FieldMatchIndex(FIELD_SETS)
+    scores = index.match_scores('computer science')
+    
+    assert index.match_scores('computer science') is scores
+    assert not scores.flags.writeable
+
+
+if __name__ == "__main__":
+    print("🧪 TESTING FIELD MATCH INDEX")
+    print("=" * 50)
+    test_index_matches_per_university_scoring()
+    test_scores_are_memoized_read_only()
+    print("✅ Field match index matches per-university scoring")
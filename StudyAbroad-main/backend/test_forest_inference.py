@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test Compiled Forest Inference
+Checks that the NumPy forest backend reproduces scikit-learn's predictions
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from ml.admission_predictor import AdmissionPredictor, load_universities_data
+from ml.forest_inference import CompiledForest
+
+
+def _trained_predictor():
+    np.random.seed(7)
+    universities = load_universities_data()
+    predictor = AdmissionPredictor()
+    predictor.train(universities, 600)
+    return predictor, universities
+
+
+def test_compiled_forest_matches_sklearn():
+    """Per-row forest output is identical to RandomForestRegressor.predict"""
+    predictor, universities = _trained_predictor()
+    X, _ = predictor.generate_synthetic_data(universities, 300)
+    
+    expected = predictor.model.predict(predictor.scaler.transform(X))
+    actual = predictor.compiled_forest.predict(X)
+    
+    assert np.array_equal(actual, expected)
+
+
+def test_numpy_backend_predictions_match():
+    """predict and predict_batch give the same results on both backends"""
+    predictor, universities = _trained_predictor()
+    student = {'cgpa': 3.4, 'gre_score': 312, 'toefl_score': 98}
+    
+    predictor.inference_backend = 'sklearn'
+    expected_single = predictor.predict(student, universities[0])
+    expected_batch = predictor.predict_batch(student, universities)
+    
+    predictor.inference_backend = 'numpy'
+    predictor.prediction_memo.clear()
+    assert predictor.predict(student, universities[0]) == expected_single
+    actual_batch = predictor.predict_batch(student, universities)
+    for key, values in expected_batch.items():
+        assert np.array_equal(actual_batch[key], values)
+
+
+def test_tree_spread_from_the_same_pass():
+    """Both backends return the forest mean plus the std of the individual trees"""
+    predictor, universities = _trained_predictor()
+    X, _ = predictor.generate_synthetic_data(universities, 200)
+    tree_values = np.stack([tree.predict(predictor.scaler.transform(X)) for tree in predictor.model.estimators_])
+    
+    for backend in ('sklearn', 'numpy'):
+        predictor.inference_backend = backend
+        mean, spread = predictor._predict_with_spread(X)
+        assert np.array_equal(mean, predictor.model.predict(predictor.scaler.transform(X)))
+        assert np.allclose(spread, tree_values.std(axis=0), rtol=0, atol=1e-12)
+    
+    prediction = predictor.predict({'cgpa': 3.4, 'gre_score': 312}, universities[0])
+    assert abs(prediction['confidence'] - (1.0 - 2.0 * prediction['uncertainty'])) <= 0.002
+
+
+def test_compiled_forest_round_trip():
+    """A saved and memory-mapped forest predicts the same as the original"""
+    predictor, universities = _trained_predictor()
+    X, _ = predictor.generate_synthetic_data(universities, 100)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'forest.npy')
+        predictor.compiled_forest.save(path, {'model_version': 'test'})
+        loaded, metadata = CompiledForest.load(path)
+        
+        assert metadata['model_version'] == 'test'
+        assert np.array_equal(loaded.predict(X), predictor.compiled_forest.predict(X))
+        # Inference reads the mapping itself, not private copies of it
+        for name in ['feature', 'threshold', 'children', 'value']:
+            assert isinstance(getattr(loaded, name), np.memmap) and getattr(loaded, name).flags['C_CONTIGUOUS']
+
+
+if __name__ == "__main__":
+    print("🧪 TESTING COMPILED FOREST INFERENCE")
+    print("=" * 50)
+    test_compiled_forest_matches_sklearn()
+    test_numpy_backend_predictions_match()
+    test_tree_spread_from_the_same_pass()
+    test_compiled_forest_round_trip()
+    print("✅ Compiled forest matches scikit-learn")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test Incremental Training
+Checks that growing the forest adds trees without refitting the existing ones
+"""
+
+import numpy as np
+
+from ml.admission_predictor import load_universities_data
+
+
+def test_grow_keeps_existing_trees_and_recompiles(make_predictor):
+    """Grown forests keep their first trees, record a stage and stay compiled"""
+    universities = load_universities_data()
+    predictor = make_predictor(num_samples=400)
+    first_thresholds = [tree.tree_.threshold.copy() for tree in predictor.model.estimators_]
+    version_before = predictor.model_version
+    
+    metrics = predictor.grow(universities, n_new_trees=5, num_samples=400,
+                             rng=np.random.default_rng(1), catalog_version='abc123')
+    
+    assert metrics['trees_added'] == 5 and metrics['total_trees'] == 15
+    assert all(np.array_equal(tree.tree_.threshold, thresholds)
+               for tree, thresholds in zip(predictor.model.estimators_, first_thresholds))
+    assert predictor.model.n_jobs is None
+    assert [stage['stage'] for stage in predictor.training_history] == [0, 1]
+    assert predictor.model_version != version_before and predictor.catalog_version == 'abc123'
+    
+    X_check, _ = predictor.generate_synthetic_data(universities, 200, np.random.default_rng(2))
+    assert predictor.compiled_forest.max_deviation(predictor.model, predictor.scaler, X_check) < 1e-9
+
+
+def test_grow_accepts_observed_outcomes(make_predictor):
+    """Real outcome rows can be used instead of synthetic samples"""
+    universities = load_universities_data()
+    predictor = make_predictor(n_estimators=5)
+    
+    features, labels = predictor.generate_synthetic_data(universities, 100, np.random.default_rng(4))
+    metrics = predictor.grow(n_new_trees=3, features=features, labels=labels)
+    
+    assert metrics['training_samples'] == 80 and metrics['total_trees'] == 8
+
+
+if __name__ == "__main__":
+    from conftest import train_predictor
+    
+    print("🧪 TESTING INCREMENTAL TRAINING")
+    print("=" * 50)
+    test_grow_keeps_existing_trees_and_recompiles(train_predictor)
+    test_grow_accepts_observed_outcomes(train_predictor)
+    print("✅ Incremental training works")
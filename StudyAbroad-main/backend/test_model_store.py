@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test Model Store
+Checks that a saved admission model loads back with the same predictions and
+metadata on both inference backends, and that a save is published atomically
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from ml import model_store
+from ml.admission_predictor import load_universities_data
+from ml.model_store import get_current_path, load_predictor, save_predictor
+
+
+STUDENT = {'cgpa': 3.4, 'gre_score': 312, 'toefl_score': 98}
+
+
+@pytest.mark.parametrize('backend', ['sklearn', 'numpy'])
+def test_save_load_round_trip(trained_predictor, tmp_path, monkeypatch, backend):
+    """A loaded model predicts like the saved one and carries its metadata"""
+    universities = load_universities_data()
+    path = str(tmp_path / 'admission_model.joblib')
+    metadata = save_predictor(trained_predictor, 'catalog-1', {'mse': 0.01}, path)
+    
+    monkeypatch.setenv('ML_INFERENCE_BACKEND', backend)
+    loaded = load_predictor(path)
+    
+    assert loaded.model_version == metadata['model_version'] and loaded.catalog_version == 'catalog-1'
+    assert loaded.feature_names == trained_predictor.feature_names
+    assert (loaded.model is None) == (backend == 'numpy')
+    
+    trained_predictor.inference_backend = 'sklearn'
+    expected = trained_predictor.predict_batch(STUDENT, universities)
+    actual = loaded.predict_batch(STUDENT, universities)
+    for key, values in expected.items():
+        assert np.array_equal(actual[key], values), key
+
+
+def test_save_is_published_by_one_rename(trained_predictor, tmp_path, monkeypatch):
+    """An interrupted save leaves the previous model in place; old versions are cleaned up"""
+    path = str(tmp_path / 'admission_model.joblib')
+    assert load_predictor(path) is None
+    first = save_predictor(trained_predictor, 'catalog-1', path=path)
+    
+    def fail(*args):
+        raise OSError('disk full')
+    
+    # Every file of the new version is written, but the pointer is never swapped
+    with monkeypatch.context() as patch:
+        patch.setattr(model_store, '_write_current', fail)
+        with pytest.raises(OSError):
+            save_predictor(trained_predictor, 'catalog-2', path=path)
+    assert load_predictor(path).model_version == first['model_version']
+    
+    # Each save keeps its own files and the ones it replaced, and removes the rest
+    for catalog_version in ['catalog-3', 'catalog-4']:
+        latest = save_predictor(trained_predictor, catalog_version, path=path)
+    assert load_predictor(path).model_version == latest['model_version']
+    names = sorted(os.listdir(tmp_path))
+    assert len(names) == 7 and os.path.basename(get_current_path(path)) in names
+    assert not any(name.endswith('.tmp') for name in names)
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    
+    from conftest import train_predictor
+    
+    print("🧪 TESTING MODEL STORE")
+    print("=" * 50)
+    predictor = train_predictor()
+    for backend in ['sklearn', 'numpy']:
+        with tempfile.TemporaryDirectory() as tmp_dir, pytest.MonkeyPatch.context() as patch:
+            test_save_load_round_trip(predictor, Path(tmp_dir), patch, backend)
+    with tempfile.TemporaryDirectory() as tmp_dir, pytest.MonkeyPatch.context() as patch:
+        test_save_is_published_by_one_rename(predictor, Path(tmp_dir), patch)
+    print("✅ Saved models load back atomically with the same predictions")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test Batched Prediction API
+Checks predict_many against one predict() call per student-university pair
+"""
+
+import numpy as np
+import pytest
+
+from ml.admission_predictor import load_universities_data
+
+
+STUDENTS = [
+    {'cgpa': 3.6, 'gre_score': 320, 'toefl_score': 104},
+    {'cgpa': 2.9, 'ielts_score': 6.5},
+    {}
+]
+
+
+def test_aligned_pairs_match_predict(trained_predictor):
+    """students[i] is scored against universities[i]"""
+    predictor = trained_predictor
+    universities = load_universities_data()[:3]
+    
+    result = predictor.predict_many(STUDENTS, universities)
+    
+    assert result['admission_probability'].shape == (3,)
+    for i, (student, university) in enumerate(zip(STUDENTS, universities)):
+        expected = predictor.predict(student, university)
+        assert round(float(result['admission_probability'][i]), 3) == expected['admission_probability']
+        assert round(float(result['confidence'][i]), 3) == expected['confidence']
+        assert round(float(result['uncertainty'][i]), 3) == expected['uncertainty']
+        assert predictor.PROBABILITY_CATEGORIES[result['category_code'][i]] == expected['probability_category']
+    
+    with pytest.raises(ValueError):
+        predictor.predict_many(STUDENTS, universities[:2])
+
+
+def test_cross_product_matches_predict_batch(trained_predictor):
+    """Every student is scored against every university"""
+    predictor = trained_predictor
+    universities = load_universities_data()[:50]
+    
+    result = predictor.predict_many(STUDENTS, universities, cross_product=True)
+    
+    assert result['admission_probability'].shape == (3, 50)
+    for i, student in enumerate(STUDENTS):
+        expected = predictor.predict_batch(student, universities)
+        assert np.array_equal(np.round(result['admission_probability'][i], 3), expected['admission_probability'])
+        assert np.array_equal(np.round(result['confidence'][i], 3), expected['confidence'])
+    
+    assert predictor.predict_many(STUDENTS, [], cross_product=True)['confidence'].shape == (3, 0)
+
+
+if __name__ == "__main__":
+    from conftest import train_predictor
+    
+    print("🧪 TESTING BATCHED PREDICTION API")
+    print("=" * 50)
+    predictor = train_predictor()
+    test_aligned_pairs_match_predict(predictor)
+    test_cross_product_matches_predict_batch(predictor)
+    print("✅ predict_many matches single predictions")
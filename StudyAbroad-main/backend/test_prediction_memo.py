@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test Prediction Memo
+Checks that repeated predictions are served from the memo until the model changes
+"""
+
+import numpy as np
+
+from ml.admission_predictor import load_universities_data
+
+
+def test_repeated_predictions_hit_the_memo(make_predictor):
+    """Same student and university hit; results are copies and match a fresh predictor"""
+    universities = load_universities_data()
+    predictor = make_predictor()
+    student = {'cgpa': 3.4, 'gre_score': 312, 'toefl_score': 100}
+    
+    first = predictor.predict(student, universities[0])
+    first['university_name'] = 'changed by caller'
+    second = predictor.predict(dict(student, name='same scores'), universities[0])
+    
+    assert 'university_name' not in second
+    assert predictor.prediction_memo.stats()['hits'] == 1
+    assert predictor.prediction_memo.stats()['misses'] == 1
+    
+    predictor.prediction_memo.max_entries = 0
+    assert predictor.predict(student, universities[0]) == second
+
+
+def test_memo_is_dropped_when_the_model_changes(make_predictor):
+    """Growing the model invalidates memoized predictions"""
+    universities = load_universities_data()
+    predictor = make_predictor(n_estimators=5)
+    student = {'cgpa': 3.0, 'ielts_score': 6.5}
+    
+    predictor.predict(student, universities[1])
+    predictor.grow(universities, n_new_trees=5, num_samples=300, rng=np.random.default_rng(1))
+    predictor.predict(student, universities[1])
+    
+    stats = predictor.prediction_memo.stats()
+    assert stats['hits'] == 0 and stats['entries'] == 1
+    assert stats['model_revision'] == predictor.model_revision
+
+
+if __name__ == "__main__":
+    from conftest import train_predictor
+    
+    print("🧪 TESTING PREDICTION MEMO")
+    print("=" * 50)
+    test_repeated_predictions_hit_the_memo(train_predictor)
+    test_memo_is_dropped_when_the_model_changes(train_predictor)
+    print("✅ Prediction memo works")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test Probability Grid
+Checks the precomputed admission probability lattice against the live model
+"""
+
+import numpy as np
+
+from ml.admission_predictor import load_universities_data
+from ml.probability_grid import ProbabilityGrid
+
+
+def test_lattice_points_match_the_model(make_predictor, tmp_path):
+    """On lattice points the grid returns the model output (to float16 precision)"""
+    predictor = make_predictor(num_samples=500)
+    universities = load_universities_data()
+    university_features = predictor.build_university_features(universities)
+    grid = ProbabilityGrid.build(predictor, university_features, cgpa_axis=np.array([2.0, 3.0, 4.0]),
+                                 gre_axis=np.array([0.0, 300.0, 340.0]), english_axis=np.array([6.0, 7.0]))
+    grid.save(str(tmp_path / 'grid.npy'))
+    grid = ProbabilityGrid.load(str(tmp_path / 'grid.npy'))
+    assert isinstance(grid.values, np.memmap)
+    
+    student = {'cgpa': 3.0, 'gre_score': 300, 'ielts_score': 7.0}
+    expected = predictor.predict_batch(student, universities, university_features)
+    predictor.use_probability_grid(grid)
+    result = predictor.predict_batch(student, universities, university_features)
+    assert np.abs(result['admission_probability'] - expected['admission_probability']).max() <= 0.002
+    
+    assert grid.rows_for(university_features[:1] + 1.0) is None
+    assert grid.check_accuracy(predictor, 500)['samples'] == 500
+    
+    # Students outside the lattice fall back to the model
+    student = {'cgpa': 1.0, 'gre_score': 250, 'ielts_score': 7.0}
+    result = predictor.predict_batch(student, universities, university_features)
+    predictor.probability_grid = None
+    expected = predictor.predict_batch(student, universities, university_features)
+    assert np.array_equal(result['admission_probability'], expected['admission_probability'])
+
+
+def test_grid_is_ignored_after_the_model_changes(make_predictor):
+    """Retraining or growing the model deactivates a grid built for the old one"""
+    predictor = make_predictor(num_samples=500)
+    universities = load_universities_data()
+    grid = ProbabilityGrid.build(predictor, predictor.build_university_features(universities),
+                                 cgpa_axis=np.array([0.0, 4.0]), gre_axis=np.array([0.0, 260.0, 340.0]),
+                                 english_axis=np.array([0.0, 9.0]))
+    predictor.use_probability_grid(grid)
+    assert predictor._active_grid() is grid
+    
+    predictor.grow(universities, n_new_trees=2, num_samples=200, rng=np.random.default_rng(1))
+    assert predictor._active_grid() is None
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+    
+    from conftest import train_predictor
+    
+    print("🧪 TESTING PROBABILITY GRID")
+    print("=" * 50)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_lattice_points_match_the_model(train_predictor, pathlib.Path(tmp_dir))
+    test_grid_is_ignored_after_the_model_changes(train_predictor)
+    print("✅ Probability grid matches the model")
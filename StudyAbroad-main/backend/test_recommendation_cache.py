@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test Recommendation Cache
+Checks keying, LRU/TTL bounds, version invalidation and the shared tier
+"""
+
+import json
+import time
+
+from ml.recommendation_cache import LocalRedis, RecommendationCache, make_cache_key
+
+
+PROFILE = {'cgpa': 3.5, 'gre_score': 315, 'field_of_study': 'Computer Science'}
+RESULT = {'recommendations': [{'university_id': 1, 'overall_score': 81.2}], 'summary': {}}
+
+
+def test_cache_key_is_canonical():
+    """Field order and non-scoring profile fields do not change the key"""
+    reordered = {'field_of_study': 'Computer Science', 'gre_score': 315, 'cgpa': 3.5,
+                 'email': 'student@example.com'}
+    
+    assert make_cache_key(PROFILE, {}, 10, 'c1', 'm1') == make_cache_key(reordered, None, 10, 'c1', 'm1')
+    assert make_cache_key(PROFILE, {}, 10, 'c1', 'm1') != make_cache_key(PROFILE, {}, 20, 'c1', 'm1')
+    assert make_cache_key(PROFILE, {}, 10, 'c1', 'm1') != make_cache_key(PROFILE, {}, 10, 'c2', 'm1')
+
+
+def test_lru_and_ttl_bounds():
+    """The oldest entry is evicted past max_entries and entries expire after the TTL"""
+    cache = RecommendationCache(max_entries=2, ttl=0.05)
+    for key in ('a', 'b', 'c'):
+        cache.set(key, RESULT)
+    
+    assert cache.get('a') is None
+    assert cache.get('c') == RESULT
+    
+    time.sleep(0.06)
+    assert cache.get('c') is None
+
+
+def test_hits_return_copies():
+    """Callers can modify a cached result without corrupting the cache"""
+    cache = RecommendationCache()
+    cache.set('key', RESULT)
+    
+    cache.get('key')['recommendations'].clear()
+    assert cache.get('key') == RESULT
+
+
+def test_version_change_clears_local_tier():
+    """A new catalog or model version drops the local entries"""
+    cache = RecommendationCache()
+    cache.ensure_versions('c1', 'm1')
+    cache.set('key', RESULT)
+    
+    cache.ensure_versions('c1', 'm1')
+    assert cache.get('key') == RESULT
+    
+    cache.ensure_versions('c1', 'm2')
+    assert cache.get('key') is None
+
+
+def test_shared_tier_serves_other_workers():
+    """A result stored by one worker is a hit for another using the same store"""
+    shared = LocalRedis()
+    RecommendationCache(shared_client=shared).set('key', RESULT)
+    
+    other_worker = RecommendationCache(shared_client=shared)
+    assert other_worker.get('key') == RESULT
+    assert other_worker.stats()['shared_hits'] == 1
+
+
+def test_shared_hits_equal_local_hits():
+    """Both tiers hold the same JSON payload, so their hits compare equal"""
+    result = {'recommendations': [], 'summary': {'top_countries': [('US', 3), ('UK', 1)],
+                                                 'fields': {'Law'}, 'average': 2.5}}
+    shared = LocalRedis()
+    worker = RecommendationCache(shared_client=shared)
+    worker.set('key', result)
+    
+    other_worker = RecommendationCache(shared_client=shared)
+    shared_hit = other_worker.get('key')
+    local_hit = other_worker.get('key')
+    expected = {'recommendations': [], 'summary': {'top_countries': [['US', 3], ['UK', 1]],
+                                                   'fields': ['Law'], 'average': 2.5}}
+    assert shared_hit == local_hit == worker.get('key') == expected
+    assert other_worker.stats()['shared_hits'] == 1 and other_worker.stats()['hits'] == 1
+    
+    # The shared tier is plain JSON; anything else is a miss, never unpickled
+    assert json.loads(shared.get('key')) == expected
+    shared.setex('other', 60, b'\x80\x04not json')
+    assert other_worker.get('other') is None
+
+
+if __name__ == "__main__":
+    print("🧪 TESTING RECOMMENDATION CACHE")
+    print("=" * 50)
+    test_cache_key_is_canonical()
+    test_lru_and_ttl_bounds()
+    test_hits_return_copies()
+    test_version_change_clears_local_tier()
+    test_shared_tier_serves_other_workers()
+    test_shared_hits_equal_local_hits()
+    print("✅ Recommendation cache works")
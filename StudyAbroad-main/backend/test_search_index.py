@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test Search Index
+Checks prefix, phrase and BM25 queries and incremental updates of the
+university full-text index
+"""
+
+from services.search_index import SearchIndex, parse_query
+
+
+DOCUMENTS = {
+    1: {'name': 'Massachusetts Institute of Technology', 'city': 'Cambridge', 'country': 'US',
+        'fields': 'Computer Science Engineering'},
+    2: {'name': 'University of Cambridge', 'city': 'Cambridge', 'country': 'UK', 'fields': 'Law Medicine'},
+    3: {'name': 'Technical University of Munich', 'city': 'Munich', 'country': 'Germany',
+        'fields': 'Engineering Computer Science'},
+    4: {'name': 'University of Technology Sydney', 'city': 'Sydney', 'country': 'Australia', 'fields': 'Design'}
+}
+
+
+def _index() -> SearchIndex:
+    index = SearchIndex()
+    for key, document in DOCUMENTS.items():
+        index.add(key, document)
+    return index
+
+
+def test_query_parsing():
+    """Plain words become prefix clauses and quoted words a phrase"""
+    assert parse_query('tech "university of" Munich') == [
+        ('prefix', ['tech']), ('phrase', ['university', 'of']), ('prefix', ['munich'])
+    ]
+    assert parse_query('  "unterminated phrase') == [('phrase', ['unterminated', 'phrase'])]
+    assert parse_query(' !! ') == []
+
+
+def test_prefix_phrase_and_ranking():
+    """Every clause must match; documents where the words matter more rank higher"""
+    index = _index()
+    assert set(index.search('tech')) == {1, 3, 4}
+    assert set(index.search('tech univ')) == {3, 4}
+    assert set(index.search('"university of technology"')) == {4}
+    assert set(index.search('"of cambridge"')) == {2}
+    assert index.search('"cambridge university"') == {}
+    assert index.search('zzz') == {}
+    
+    # "Cambridge" appears twice in document 2 (name and city), once in document 1
+    scores = index.search('cambridge')
+    assert scores[2] > scores[1]
+    
+    # Field restriction
+    assert set(index.search('cambridge', fields=['name'])) == {2}
+    assert set(index.search('"science engineering"', fields=['name', 'city'])) == set()
+
+
+def test_incremental_updates():
+    """Documents can be replaced and removed without rebuilding"""
+    index = _index()
+    counts = index.sync({**DOCUMENTS, 2: dict(DOCUMENTS[2], name='Cambridge College'), 5: DOCUMENTS[4]})
+    assert counts == {'added': 1, 'updated': 1, 'removed': 0}
+    assert set(index.search('university of')) == {3, 4, 5}
+    
+    assert index.remove(4) and not index.remove(4)
+    assert index.sync({1: DOCUMENTS[1]}) == {'added': 0, 'updated': 0, 'removed': 3}
+    assert index.expand('tech') == ['technology']
+    assert len(index) == 1
+
+
+def test_copies_do_not_share_changes():
+    """Changing a copy or its original leaves the other as it was"""
+    index = _index()
+    copy = index.copy()
+    copy.sync({**DOCUMENTS, 2: dict(DOCUMENTS[2], name='Cambridge College')})
+    index.remove(3)
+    
+    assert set(index.search('university of')) == {2, 4}
+    assert set(copy.search('university of')) == {3, 4}
+    assert set(copy.search('"cambridge college"')) == {2} and index.search('college') == {}
+    assert index.expand('mun') == [] and set(copy.search('munich')) == {3}
+
+
+if __name__ == "__main__":
+    print("🧪 TESTING SEARCH INDEX")
+    print("=" * 50)
+    test_query_parsing()
+    test_prefix_phrase_and_ranking()
+    test_incremental_updates()
+    test_copies_do_not_share_changes()
+    print("✅ Search index answers prefix, phrase and ranked queries")
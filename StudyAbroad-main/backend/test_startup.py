@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test Worker Startup
+Checks that importing the app with the compiled forest stays within a time and
+memory budget and never loads the training-only stack
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pytest
+
+from ml.admission_predictor import AdmissionPredictor, load_universities_data
+from ml.model_store import save_predictor
+
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Budgets for `import app` in a fresh interpreter (override for slow machines)
+STARTUP_SECONDS_BUDGET = float(os.getenv('STARTUP_SECONDS_BUDGET', '2.5'))
+STARTUP_RSS_MB_BUDGET = float(os.getenv('STARTUP_RSS_MB_BUDGET', '128'))
+
+TRAINING_ONLY_MODULES = ['sklearn', 'pandas', 'scipy', 'joblib']
+
+# Peak RSS comes from VmHWM: ru_maxrss would include the forking pytest process
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app
+seconds = time.perf_counter() - started
+with open('/proc/self/status') as f:
+    peak_kb = next(int(line.split()[1]) for line in f if line.startswith('VmHWM:'))
+%s
+print(json.dumps({
+    'seconds': seconds,
+    'max_rss_mb': peak_kb / 1024,
+    'loaded': [name for name in %r if name in sys.modules]
+}))
+"""
+
+# Swap in a catalog the saved model was not trained on, as a hot reload would
+CATALOG_CHANGE = """
+import threading
+from ml.ml_service import get_ml_service
+catalog = get_ml_service().catalog
+with open(catalog.file_path, encoding='utf-8') as f:
+    universities = json.load(f)
+catalog.file_path = sys.argv[1]
+with open(catalog.file_path, 'w', encoding='utf-8') as f:
+    json.dump(universities[:-1], f)
+assert catalog.refresh(force=True)
+for thread in threading.enumerate():
+    if thread.name == 'admission-model-growth':
+        thread.join()
+"""
+
+
+def _import_app(model_dir: str, after_import: str = '', **env) -> dict:
+    env = dict(os.environ, ML_MODEL_PATH=model_dir + os.sep, ML_INFERENCE_BACKEND='numpy',
+               CATALOG_POLL_INTERVAL='0', **env)
+    probe = PROBE % (after_import, TRAINING_ONLY_MODULES)
+    completed = subprocess.run([sys.executable, '-c', probe, os.path.join(model_dir, 'universities.json')],
+                               cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True)
+    lines = completed.stdout.strip().splitlines()
+    return dict(json.loads(lines[-1]), output='\n'.join(lines[:-1]))
+
+
+@pytest.mark.skipif(not os.path.exists('/proc/self/status'), reason='peak RSS is read from /proc')
+def test_import_app_within_budget():
+    """Serving startup loads only NumPy and the compiled forest"""
+    universities = load_universities_data()
+    predictor = AdmissionPredictor()
+    predictor.train(universities, 1000, np.random.default_rng(0))
+    
+    with tempfile.TemporaryDirectory() as model_dir:
+        save_predictor(predictor, 'startup-test', path=os.path.join(model_dir, 'admission_model.joblib'))
+        startup = _import_app(model_dir)
+    
+    print(f"   import app: {startup['seconds']:.2f}s, max RSS {startup['max_rss_mb']:.0f} MB")
+    assert startup['loaded'] == []
+    assert startup['seconds'] < STARTUP_SECONDS_BUDGET
+    assert startup['max_rss_mb'] < STARTUP_RSS_MB_BUDGET
+
+
+def test_catalog_change_keeps_training_stack_unloaded(trained_predictor):
+    """A catalog the model was not trained on does not pull scikit-learn into a worker"""
+    with tempfile.TemporaryDirectory() as model_dir:
+        save_predictor(trained_predictor, 'stale-catalog', path=os.path.join(model_dir, 'admission_model.joblib'))
+        startup = _import_app(model_dir, CATALOG_CHANGE, ML_GROW_TREES_ON_CATALOG_CHANGE='5')
+    
+    assert 'trained on a different universities.json' in startup['output']
+    assert 'Universities catalog reloaded' in startup['output']
+    assert 'growth failed' not in startup['output']
+    assert startup['loaded'] == []
+
+
+if __name__ == "__main__":
+    from conftest import train_predictor
+    
+    print("🧪 TESTING WORKER STARTUP")
+    print("=" * 50)
+    test_import_app_within_budget()
+    test_catalog_change_keeps_training_stack_unloaded(train_predictor())
+    print("✅ Worker startup is within budget")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test Suggestion Index
+Checks autocomplete prefixes, popularity order and typo-tolerant lookups
+against a brute-force scan
+"""
+
+import random
+
+from services.suggestion_index import SuggestionIndex, normalize, word_tails
+
+
+def _levenshtein(a: str, b: str) -> int:
+    row = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        previous, row[0] = row[0], i
+        for j in range(1, len(b) + 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (char != b[j - 1]))
+    return row[-1]
+
+
+def _synthetic_texts(count: int = 400, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    words = ['University', 'Institute', 'Technology', 'of', 'Technical', 'State', 'National', 'College',
+             'Cambridge', 'Cambria', 'Munich', 'München', 'Sydney', 'São Paulo', 'Zürich', 'Boston']
+    return [[' '.join(rng.sample(words, rng.randint(1, 4))), rng.choice(words[8:])] for _ in range(count)]
+
+
+def test_prefix_suggestions_match_brute_force():
+    """Rows with a name or city word starting with the query, most popular first"""
+    texts = _synthetic_texts()
+    order = list(range(len(texts)))
+    random.Random(1).shuffle(order)
+    # A small scan limit exercises both precomputed and scanned prefixes
+    index = SuggestionIndex(texts, order, scan_limit=8)
+    
+    for query in ['u', 'Uni', 'university of', 'TECHN', 'munchen', 'Sao P', 'zurich', 'cam', 'xyz', 'of t']:
+        prefix = normalize(query)
+        expected = [row for row in order if any(key.startswith(prefix) for text in texts[row]
+                                                 for key in word_tails(text))]
+        for limit in [1, 5, 20]:
+            assert index.suggest(query, limit) == expected[:limit], (query, limit)
+    
+    assert index.suggest(' !! ') == [] and index.suggest('uni', 0) == []
+    assert len(index.suggest('u', 50)) == 20
+
+
+def test_typo_tolerant_suggestions():
+    """Keys with a prefix a few edits from the query, closest then most popular first"""
+    texts = _synthetic_texts(200, seed=3)
+    order = list(range(len(texts)))
+    index = SuggestionIndex(texts, order, scan_limit=8)
+    
+    for query, max_distance in [('univrsity', 2), ('cambrdge', 1), ('tecnical', 1), ('bostn', 1), ('sdyney', 2)]:
+        distances = {}
+        for row in order:
+            for text in texts[row]:
+                for key in word_tails(text):
+                    if key[0] != query[0]:
+                        continue
+                    distance = min(_levenshtein(query, key[:end]) for end in range(len(key) + 1))
+                    if distance <= max_distance:
+                        distances[row] = min(distance, distances.get(row, distance))
+        expected = sorted(distances, key=lambda row: (distances[row], order.index(row)))
+        assert index.suggest_fuzzy(query, 20, max_distance) == expected[:20], query
+    
+    # Exact prefixes come first and short queries get no typo allowance
+    assert index.suggest_fuzzy('cambridge', 5)[:1] == index.suggest('cambridge', 1)
+    assert index.suggest_fuzzy('bst', 10) == index.suggest('bst', 10) == []
+
+
+if __name__ == "__main__":
+    print("🧪 TESTING SUGGESTION INDEX")
+    print("=" * 50)
+    test_prefix_suggestions_match_brute_force()
+    test_typo_tolerant_suggestions()
+    print("✅ Suggestion index answers prefix and typo-tolerant lookups")
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Test University Catalog
+Checks that the columnar catalog answers like the per-university filter and
+reloads only when the file changes
+"""
+
+import json
+import os
+import random
+
+from services.catalog_bitmaps import _count_ones
+from services.university_catalog import UniversityCatalog
+from services.university_service_simple import UniversityService
+
+
+def _synthetic_universities(count: int = 300, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    countries = ['US', 'United States', 'UK', 'Germany', 'DE', 'IN', 'India', 'Narnia']
+    fields = ['Computer Science', 'Engineering', 'Business Administration', 'Medicine', 'Law', 'Arts']
+    universities = []
+    for i in range(count):
+        university = {
+            'id': i + 1,
+            'name': f"University {i}",
+            'city': rng.choice(['Boston', 'London', 'Berlin', 'Mumbai']),
+            'country': rng.choice(countries),
+            'fields': rng.sample(fields, rng.randint(0, 3)),
+            'type': rng.choice(['Public', 'Private', ' private ', 'PUBLIC'])
+        }
+        # Leave some fields out so the per-filter defaults are exercised
+        for key, value in [('tuition_fee', rng.randint(0, 60000)), ('ranking', rng.randint(1, 500)),
+                           ('min_cgpa', rng.choice([2.5, 3.0, 3.3, 3.7])), ('min_gre', rng.randint(290, 330)),
+                           ('min_ielts', rng.choice([6.0, 6.5, 7.0])), ('min_toefl', rng.randint(70, 110)),
+                           ('acceptance_rate', rng.random())]:
+            if rng.random() < 0.8:
+                university[key] = value
+        if rng.random() < 0.1:
+            del university['type']
+        universities.append(university)
+    return universities
+
+
+FILTERS = [
+    {},
+    {'country': ['US']},
+    {'country': ['United Kingdom', 'DE']},
+    {'country': 'India'},
+    {'country': []},
+    {'field': ['Computer Science', 'Law']},
+    {'field': 'Medicine', 'country': ['United States']},
+    {'type': 'private'},
+    {'min_tuition': 10000, 'max_tuition': 40000},
+    {'min_cgpa': 3.2, 'max_gre': 310},
+    {'max_cgpa': 3.0, 'min_ielts': 6.5, 'max_toefl': 95},
+    {'min_ranking': 50, 'max_ranking': 300},
+    {'min_acceptance_rate': 0.2, 'max_acceptance_rate': 0.6},
+    {'min_gre': 0, 'max_tuition': 0},
+    {'country': ['US', 'UK'], 'field': ['Engineering'], 'type': 'Public', 'min_tuition': 5000,
+     'max_ranking': 400, 'min_toefl': 100}
+]
+
+
+def _write_catalog(data_dir, universities) -> None:
+    with open(os.path.join(data_dir, 'universities.json'), 'w', encoding='utf-8') as f:
+        json.dump(universities, f)
+
+
+def test_filters_match_per_university_check(tmp_path):
+    """Every filter combination selects the same universities, in the same order"""
+    universities = _synthetic_universities()
+    _write_catalog(tmp_path, universities)
+    service = UniversityService(str(tmp_path))
+    
+    for filters in FILTERS:
+        expected = [u for u in universities if service._matches_filters(u, filters)]
+        assert service.filter_universities(filters) == expected, filters
+    
+    for university in universities[:20]:
+        assert service.get_university_by_id(university['id']) == university
+    assert service.get_university_by_id(10 ** 6) is None
+    assert service.get_university_by_id(['unhashable']) is None
+    
+    # Every query word has to start a word of the name, city, country or fields
+    for query in ['boston', 'UNIVERSITY 1', 'comp sci', 'zzz', '"business administration" berlin']:
+        query_words = query.lower().replace('"', '').split()
+        expected = []
+        for u in universities:
+            words = ' '.join([u['name'], u['city'], u['country'], ' '.join(u['fields'])]).lower().split()
+            if all(any(word.startswith(query_word) for word in words) for query_word in query_words):
+                expected.append(u['id'])
+        assert sorted(u['id'] for u in service.search_universities(query)) == expected, query
+
+    # Suggestions follow the ranking, unranked universities last
+    boston = [u for u in universities if u['city'] == 'Boston']
+    boston.sort(key=lambda u: u.get('ranking', float('inf')))
+    assert service.suggest_universities('bos', 20) == boston[:20]
+    assert service.suggest_universities('bostno', 5, typo_tolerant=True) == boston[:5]
+
+
+def test_bitmap_backends_and_query_plans(tmp_path):
+    """Both bitmap representations give the same rows; the smallest input drives the plan"""
+    universities = _synthetic_universities(1000, seed=2)
+    _write_catalog(tmp_path, universities)
+    service = UniversityService(str(tmp_path))
+    catalogs = [UniversityCatalog(universities, 'numpy'), UniversityCatalog(universities, 'int')]
+    
+    for filters in FILTERS:
+        expected = [u['id'] for u in universities if service._matches_filters(u, filters)]
+        for catalog in catalogs:
+            assert [u['id'] for u in catalog.take(catalog.filter_rows(filters))] == expected, filters
+    
+    plan = catalogs[0].plan({'country': ['US'], 'type': 'Public', 'max_tuition': 100})
+    steps = plan.describe()
+    assert [step['access'] for step in steps] == ['index', 'probe']
+    assert steps[0]['filters'] == ['max_tuition'] and steps[1]['filters'] == ['country', 'type']
+    
+    plan = catalogs[1].plan({'field': 'Law', 'min_ranking': 2, 'max_ranking': 499})
+    assert [step['step'] for step in plan.describe()] == ['bitmap', 'range', 'range']
+    
+    # The population count used before Python 3.10 agrees with int.bit_count()
+    law = catalogs[1].field_bitmaps.index['Law']
+    assert _count_ones(law) == catalogs[1].bitmaps.count(law) == catalogs[1].field_bitmaps.counts['Law']
+    
+    # Codes and names of a country share one filter result
+    assert (catalogs[0].filter_rows({'country': 'US'}).tolist()
+            == catalogs[0].filter_rows({'country': 'United States'}).tolist())
+
+
+def test_range_indexes_handle_missing_and_nan_values(tmp_path):
+    """Missing fields use each filter's default and NaN passes every comparison"""
+    universities = _synthetic_universities(200, seed=1)
+    for university in universities[::7]:
+        university['acceptance_rate'] = float('nan')
+    _write_catalog(tmp_path, universities)
+    service = UniversityService(str(tmp_path))
+    
+    for filters in [{'min_acceptance_rate': 0.5}, {'max_acceptance_rate': 0.3, 'max_ranking': 100},
+                    {'min_tuition': float('nan')}, {'max_tuition': float('inf'), 'min_tuition': 59000}]:
+        # Compared by id: NaN fields make equal records compare unequal
+        expected = [u['id'] for u in universities if service._matches_filters(u, filters)]
+        assert [u['id'] for u in service.filter_universities(filters)] == expected, filters
+    
+    # The most selective predicate is resolved through its index, the others on its rows
+    catalog = service.get_catalog()
+    ranking = catalog.sorted_indexes['ranking']
+    assert ranking.values.tolist() == sorted(ranking.values.tolist())
+    assert len(ranking.missing_rows) == sum('ranking' not in u for u in universities)
+
+
+def test_irregular_values_fall_back_to_per_university_check(tmp_path):
+    """Non-numeric values are left to the per-university check"""
+    universities = _synthetic_universities(50)
+    universities[3]['tuition_fee'] = None
+    universities[4]['fields'] = 'Computer Science'
+    _write_catalog(tmp_path, universities)
+    service = UniversityService(str(tmp_path))
+    
+    assert service.get_catalog().filter_rows({'field': 'Computer'}) is None
+    expected = [u for u in universities if service._matches_filters(u, {'field': 'Computer'})]
+    assert service.filter_universities({'field': 'Computer'}) == expected
+    assert service.get_catalog().filter_rows({'min_tuition': 100}) is None
+
+
+def test_catalog_is_parsed_once_and_reloaded_on_change(tmp_path):
+    """Requests share one parse until the file's mtime or size changes"""
+    universities = _synthetic_universities(20)
+    _write_catalog(tmp_path, universities)
+    service = UniversityService(str(tmp_path))
+    
+    catalog = service.get_catalog()
+    service.load_universities()
+    service.filter_universities({'min_ranking': 10})
+    assert service.get_catalog() is catalog
+    assert service._catalog_cache.loads == 1
+    
+    search_index = catalog.search_index
+    universities[0]['name'] = 'Renamed Institute'
+    _write_catalog(tmp_path, universities[:5])
+    os.utime(os.path.join(tmp_path, 'universities.json'), ns=(0, 10 ** 9))
+    assert len(service.load_universities()) == 5
+    assert service._catalog_cache.loads == 2
+    
+    # The new index is a copy sharing unchanged postings; the old catalog keeps its own
+    new_index = service.get_catalog().search_index
+    assert new_index is not search_index and len(new_index) == 5 and len(search_index) == 20
+    assert new_index._postings['3'] is search_index._postings['3']
+    assert [u['id'] for u in service.search_universities('renamed')] == [1]
+    assert catalog.search_rows('renamed').tolist() == []
+    assert catalog.take(catalog.search_rows('university 0'))[0]['name'] == 'University 0'
+    
+    # Building a successor never changes the index of the published catalog
+    universities[1]['name'] = 'Unpublished College'
+    UniversityCatalog(universities[:5], previous=service.get_catalog())
+    assert service.search_universities('unpublished') == []
+    
+    # A malformed rewrite keeps serving the last good load
+    with open(os.path.join(tmp_path, 'universities.json'), 'w') as f:
+        f.write('[{"id": ')
+    assert len(service.load_universities()) == 5
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+    
+    print("🧪 TESTING UNIVERSITY CATALOG")
+    print("=" * 50)
+    for test in [test_filters_match_per_university_check, test_bitmap_backends_and_query_plans,
+                 test_range_indexes_handle_missing_and_nan_values,
+                 test_irregular_values_fall_back_to_per_university_check,
+                 test_catalog_is_parsed_once_and_reloaded_on_change]:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            test(pathlib.Path(tmp_dir))
+    print("✅ Columnar catalog matches the per-university filter")
@@ -0,0 +1,112 @@
+"""
+Train Admission Model
+Train the admission predictor once and save it for the API workers to load
+"""
+
+import argparse
+import os
+import numpy as np
+
+from ml.admission_predictor import AdmissionPredictor, load_universities_data
+from ml.model_store import (compute_catalog_version, get_model_path, get_probability_grid_path,
+                            get_universities_path, load_predictor, save_predictor)
+from ml.probability_grid import ProbabilityGrid
+
+
+def train_admission_model(num_samples: int = 1000, seed: int = 42, output_path: str = None,
+                          grow_trees: int = 0, build_grid: bool = False) -> bool:
+    """Train the admission model (or grow the saved one) and write the versioned artifact"""
+    universities_file = get_universities_path()
+    universities = load_universities_data(universities_file)
+    if not universities:
+        print(f"❌ No universities found in {universities_file}")
+        return False
+    
+    print(f"📁 Catalog: {len(universities)} universities")
+    print(f"🧪 Training on {num_samples} synthetic samples (seed {seed})...")
+    
+    rng = np.random.default_rng(seed)
+    if grow_trees > 0:
+        predictor = load_predictor(output_path)
+        if predictor is None or predictor.model is None:
+            print(f"❌ No saved scikit-learn model to grow at {output_path or get_model_path()}")
+            return False
+        print(f"🌲 Growing {len(predictor.model.estimators_)} trees by {grow_trees}...")
+        metrics = predictor.grow(universities, grow_trees, num_samples, rng)
+    else:
+        predictor = AdmissionPredictor()
+        metrics = predictor.train(universities, num_samples, rng)
+    
+    print(f"   MSE: {metrics['mse']:.4f}")
+    print(f"   R² Score: {metrics['r2_score']:.3f}")
+    print(f"   Trees: {metrics['total_trees']} ({metrics['training_seconds']:.2f}s)")
+    
+    # The compiled NumPy forest must reproduce scikit-learn before it is shipped
+    X_check, _ = predictor.generate_synthetic_data(universities, 500, rng)
+    deviation = predictor.compiled_forest.max_deviation(predictor.model, predictor.scaler, X_check)
+    print(f"   Compiled forest max deviation: {deviation:.2e}")
+    if deviation > 1e-9:
+        print("❌ Compiled forest does not match the trained model")
+        return False
+    
+    output_path = output_path or get_model_path()
+    metadata = save_predictor(predictor, compute_catalog_version(universities_file), metrics, output_path)
+    
+    print(f"\n💾 Saved model {metadata['model_version']}")
+    print(f"   Path: {output_path}")
+    print(f"   Catalog version: {metadata['catalog_version']}")
+    
+    if build_grid:
+        predictor.model_version = metadata['model_version']
+        return build_probability_grid(predictor, universities, output_path, rng)
+    return True
+
+
+def build_probability_grid(predictor: AdmissionPredictor, universities: list, model_path: str,
+                           rng: np.random.Generator) -> bool:
+    """Precompute the probability grid for the saved model and check it against the model"""
+    print("\n🧮 Building probability grid...")
+    grid = ProbabilityGrid.build(predictor, predictor.build_university_features(universities))
+    accuracy = grid.check_accuracy(predictor, 10000, rng)
+    print(f"   Shape: {grid.values.shape} ({grid.values.nbytes / 1e6:.1f} MB float16)")
+    print(f"   Mean error: {accuracy['mean_abs_error']:.4f}  "
+          f"p99: {accuracy['p99_abs_error']:.4f}  max: {accuracy['max_abs_error']:.4f}")
+    
+    tolerance = float(os.getenv('ML_PROBABILITY_GRID_TOLERANCE', '0.02'))
+    if accuracy['mean_abs_error'] > tolerance:
+        print(f"❌ Probability grid error exceeds tolerance {tolerance}")
+        return False
+    
+    grid_path = get_probability_grid_path(model_path)
+    grid.save(grid_path)
+    print(f"   Path: {grid_path}")
+    return True
+
+
+def main():
+    """Main function to train and save the admission model"""
+    parser = argparse.ArgumentParser(description='Train and save the admission prediction model')
+    parser.add_argument('--samples', type=int, default=1000, help='Number of synthetic training samples')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for synthetic data')
+    parser.add_argument('--output', default=None, help='Artifact path (defaults to ML_MODEL_PATH)')
+    parser.add_argument('--grow', type=int, default=0, metavar='TREES',
+                        help='Add trees to the saved model instead of training from scratch')
+    parser.add_argument('--grid', action='store_true',
+                        help='Also precompute the admission probability grid (ML_PROBABILITY_GRID)')
+    args = parser.parse_args()
+    
+    print("🚀 ADMISSION MODEL TRAINER")
+    print("=" * 50)
+    
+    success = train_admission_model(args.samples, args.seed, args.output, args.grow, args.grid)
+    
+    if success:
+        print("\n✅ Model training completed successfully!")
+    else:
+        print("\n❌ Model training failed!")
+    
+    return success
+
+
+if __name__ == "__main__":
+    main()